@@ -1,4 +1,5 @@
 from __future__ import print_function
+import contextlib
 import unittest
 # import shutil
 import os
@@ -47,6 +48,13 @@ class VCSBaseTest(unittest.TestCase):
         self.basedatadir = os.path.join("uvcdat-testdata", "data")
         self.clt = cdms2.open(os.path.join(cdat_info.get_sampledata_path(), "clt.nc"))
 
+    @contextlib.contextmanager
+    def assertRenders(self, count):
+        """Checks that the block renders the canvas count times"""
+        before = self.x.backend.numberOfRenders
+        yield
+        self.assertEqual(self.x.backend.numberOfRenders - before, count)
+
     def tearDown(self):
         os.chdir(self.orig_cwd)
         self.x.clear()
@@ -0,0 +1,55 @@
+import basevcstest
+import numpy
+import MV2
+import vcs
+from vcs.vcsvtk import pipeline1d
+
+
+class TestVCS1DDecimation(basevcstest.VCSBaseTest):
+    def testValidSegments(self):
+        x = numpy.ma.arange(10.)
+        y = numpy.ma.array(numpy.arange(10.), mask=[0, 0, 1, 0, 0, 0, 1, 1, 0, 0])
+        starts, stops = pipeline1d.validSegments(x, y)
+        self.assertEqual(starts.tolist(), [0, 3, 8])
+        self.assertEqual(stops.tolist(), [2, 6, 10])
+
+    def testDecimationKeepsExtremes(self):
+        x = numpy.linspace(0., 1., 100000)
+        y = numpy.sin(x * 50.)
+        y[12345] = 10.
+        y[54321] = -10.
+        for method in ["minmax", "lttb"]:
+            keep = pipeline1d.decimate(method, x, y, 0., 1., 200)
+            self.assertLessEqual(len(keep), 800)
+            self.assertEqual(keep[0], 0)
+            self.assertEqual(keep[-1], len(x) - 1)
+            self.assertIn(12345, keep)
+            self.assertIn(54321, keep)
+
+    def testDecimationAlongY(self):
+        y = numpy.linspace(0., 1., 100000)
+        x = numpy.sin(y * 50.)
+        x[12345] = 10.
+        for method in ["minmax", "lttb"]:
+            self.assertEqual(len(pipeline1d.decimate(method, x, y, -1., 1., 200)), len(x))
+            keep = pipeline1d.decimate(method, x, y, -1., 1., 200, 0., 1., 100)
+            self.assertLessEqual(len(keep), 400)
+            self.assertIn(12345, keep)
+
+    def testDecimationAttribute(self):
+        yx = vcs.create1d()
+        self.assertIsNone(yx.decimation)
+        self.check_values_setting(yx, "decimation", [None, "minmax", "lttb"], ["bad", 1])
+
+    def testPlotDecimated(self):
+        data = MV2.sin(MV2.arange(200000.) / 1000.)
+        data = MV2.masked_greater(data, .9)
+        yx = vcs.create1d()
+        yx.decimation = "minmax"
+        self.x.plot(data, yx, bg=self.bg)
+        yx.decimation = "lttb"
+        self.x.clear()
+        self.x.plot(data, yx, bg=self.bg)
+        self.x.clear()
+        yx.flip = True
+        self.x.plot(data, yx, bg=self.bg)
@@ -0,0 +1,52 @@
+import basevcstest
+import numpy
+import vcs
+from vcs.vcsvtk import pipeline1d
+
+
+class TestVCS1DDensity(basevcstest.VCSBaseTest):
+    def testDensityGrid(self):
+        x = numpy.array([.1, .1, .9, .5, 2.])
+        y = numpy.array([.1, .1, .9, .5, .5])
+        v = numpy.array([1., 3., 5., 7., 9.])
+        wc = [0., 1., 0., 1.]
+        count = pipeline1d.densityGrid(x, y, v, "count", wc, (2, 2))
+        self.assertEqual(count.tolist(), [[2., None], [None, 2.]])
+        mean = pipeline1d.densityGrid(x, y, v, "mean", wc, (2, 2))
+        self.assertEqual(mean.tolist(), [[2., None], [None, 6.]])
+        mx = pipeline1d.densityGrid(x, y, v, "max", wc, (2, 2))
+        self.assertEqual(mx.tolist(), [[3., None], [None, 7.]])
+
+    def testDensityPoints(self):
+        x = numpy.ma.masked_values([1., -999., 3., 4., 5.], -999.)
+        y = numpy.ma.masked_values([1., 2., 3., -999., 5.], -999.)
+        v = numpy.ma.masked_values([1., 2., -999., 4., 5.], -999.)
+        px, py, pv = pipeline1d.densityPoints(x, y)
+        self.assertEqual((px.tolist(), py.tolist(), pv), ([1., 3., 5.], [1., 3., 5.], None))
+        px, py, pv = pipeline1d.densityPoints(x, y, v)
+        self.assertEqual((px.tolist(), py.tolist(), pv.tolist()), ([1., 5.], [1., 5.], [1., 5.]))
+
+    def testDensityAttributes(self):
+        scatter = vcs.createscatter()
+        self.assertIsNone(scatter.density)
+        self.check_values_setting(scatter, "density", [None, "count", "mean", "max"], ["bad", 1])
+        self.check_values_setting(scatter, "density_threshold", [0, 10], [-1, "a"])
+
+    def testPlotDensity(self):
+        x = numpy.random.normal(size=200000)
+        y = numpy.random.normal(size=200000)
+        scatter = vcs.createscatter()
+        scatter.density = "count"
+        self.x.plot(x, y, scatter, bg=self.bg)
+        self.x.clear()
+        scatter.density = "mean"
+        self.x.plot(x, y, scatter, density_values=x * y, bg=self.bg)
+        self.x.clear()
+        scatter.density_threshold = 1000000
+        self.x.plot(x, y, scatter, bg=self.bg)
+
+        self.x.clear()
+        # masked points must not be binned
+        y = numpy.ma.masked_greater(y, 1.)
+        scatter.density_threshold = 1000
+        self.x.plot(x, y, scatter, bg=self.bg)
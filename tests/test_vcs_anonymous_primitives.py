@@ -0,0 +1,40 @@
+import basevcstest
+import numpy
+import vcs
+
+
+class TestVCSAnonymousPrimitives(basevcstest.VCSBaseTest):
+    def testNotRegistered(self):
+        counts = dict((k, len(vcs.elements[k])) for k in vcs.elements)
+        ln = vcs.primitives.line("default", _x=[.1, .9], _y=[.5, .5])
+        mrk = vcs.primitives.marker(_x=[.5], _y=[.5])
+        fa = vcs.primitives.fillarea()
+        txt = vcs.primitives.text("default", "default", string=["anonymous"])
+        self.assertTrue(vcs.isline(ln))
+        self.assertTrue(vcs.ismarker(mrk))
+        self.assertTrue(vcs.isfillarea(fa))
+        self.assertTrue(vcs.istext(txt))
+        self.assertEqual(txt.string, ["anonymous"])
+        for obj in [ln, mrk, txt]:
+            self.assertIsNone(vcs.primitives.plot(self.x, obj, bg=self.bg))
+        self.assertEqual(counts, dict((k, len(vcs.elements[k])) for k in vcs.elements))
+
+    def testCopiesSource(self):
+        src = vcs.createline(color="red", width=3)
+        ln = vcs.primitives.line(src)
+        self.assertEqual(ln.color, src.color)
+        self.assertEqual(ln.width, src.width)
+        ln.color.append(1)
+        self.assertNotEqual(ln.color, src.color)
+
+    def testTemplateDrawsNoTemporaries(self):
+        data = numpy.sin(numpy.arange(100))
+        data.shape = (10, 10)
+        self.x.plot(data, bg=self.bg)
+        counts = dict((k, len(vcs.elements[k])) for k in vcs.elements)
+        self.x.clear()
+        self.x.plot(data, bg=self.bg)
+        self.x.plot(data[0], bg=self.bg)
+        self.x.clear()
+        for k in ["line", "marker", "fillarea", "texttable", "textorientation", "textcombined"]:
+            self.assertEqual(counts[k], len(vcs.elements[k]))
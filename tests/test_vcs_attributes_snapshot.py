@@ -0,0 +1,49 @@
+import basevcstest
+import json
+import os
+import shutil
+import tempfile
+import vcs
+
+
+class TestVCSAttributesSnapshot(basevcstest.VCSBaseTest):
+    def setUp(self):
+        super(TestVCSAttributesSnapshot, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.script = os.path.join(self.tmpdir, "snapshot_test.json")
+        self.snapshot = os.path.join(self.tmpdir, "snapshot_test.snapshot")
+        self.writeScript(3)
+
+    def tearDown(self):
+        for typ, nm in [("boxfill", "snap_bfill"), ("line", "snap_line")]:
+            if nm in vcs.elements[typ]:
+                del(vcs.elements[typ][nm])
+        shutil.rmtree(self.tmpdir)
+        super(TestVCSAttributesSnapshot, self).tearDown()
+
+    def writeScript(self, width):
+        with open(self.script, "w") as f:
+            json.dump({"Tl": {"snap_line": {"width": width, "color": [[100., 0., 0., 100.]]}},
+                       "Gfb": {"snap_bfill": {"color_1": 20, "color_2": 200, "levels": [0, 10]}}}, f)
+
+    def testSnapshotRoundTrip(self):
+        vcs.scriptrun(self.script, snapshot=self.snapshot)
+        self.assertTrue(os.path.exists(self.snapshot))
+        self.assertEqual(vcs.getline("snap_line").width, 3)
+        self.assertEqual(vcs.getboxfill("snap_bfill").color_1, 20)
+        del(vcs.elements["boxfill"]["snap_bfill"])
+        line = vcs.getline("snap_line")
+        line.width = 1
+        self.assertTrue(vcs.utils.loadSnapshot(self.script, self.snapshot))
+        # existing elements are updated in place
+        self.assertEqual(line.width, 3)
+        self.assertEqual(vcs.getboxfill("snap_bfill").color_2, 200)
+        self.assertEqual(vcs.getboxfill("snap_bfill").levels, [0, 10])
+
+    def testSnapshotInvalidated(self):
+        vcs.scriptrun(self.script, snapshot=self.snapshot)
+        self.writeScript(5)
+        self.assertFalse(vcs.utils.loadSnapshot(self.script, self.snapshot))
+        vcs.scriptrun(self.script, snapshot=self.snapshot)
+        self.assertEqual(vcs.getline("snap_line").width, 5)
+        self.assertTrue(vcs.utils.loadSnapshot(self.script, self.snapshot))
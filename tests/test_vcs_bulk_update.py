@@ -0,0 +1,83 @@
+import copy
+import basevcstest
+import vcs
+
+
+class TestVCSBulkUpdate(basevcstest.VCSBaseTest):
+    def testUpdate(self):
+        b = vcs.createboxfill()
+        self.assertIs(b.update(level_1=10., level_2=20., color_1=16), b)
+        self.assertEqual((b.level_1, b.level_2, b.color_1), (10., 20., 16))
+
+    def testUpdateIsAllOrNothing(self):
+        b = vcs.createboxfill()
+        b.update(level_1=10., color_1=16)
+        with self.assertRaises(ValueError):
+            b.update(level_1=30., color_1=16, color_2="not a color")
+        self.assertEqual((b.level_1, b.color_1), (10., 16))
+        with self.assertRaises(AttributeError):
+            b.update(level_1=30., levle_2=40.)
+        self.assertEqual(b.level_1, 10.)
+
+    def testBulkUpdate(self):
+        b = vcs.createboxfill()
+        b.level_1 = 1.
+        with b.bulk_update():
+            b.level_1 = 5.
+            b.level_2 = 50.
+            # applied when the block exits
+            self.assertEqual(b.level_1, 1.)
+        self.assertEqual((b.level_1, b.level_2), (5., 50.))
+        with self.assertRaises(RuntimeError):
+            with b.bulk_update():
+                b.level_1 = 7.
+                raise RuntimeError("discarded")
+        self.assertEqual(b.level_1, 5.)
+        b.level_1 = 8.
+        self.assertEqual(b.level_1, 8.)
+
+    def testSourceCopies(self):
+        tt = vcs.createtexttable(source="default")
+        tt.x = [.1, .2]
+        tt2 = vcs.createtexttable(source=tt)
+        self.assertEqual(tt2.x, [.1, .2])
+        tt2.x[0] = .5
+        self.assertEqual(tt.x, [.1, .2])
+        fa = vcs.createfillarea(source="default")
+        fa.color = [4, 5]
+        fa2 = vcs.createfillarea(source=fa.name)
+        self.assertEqual(fa2.color, [4, 5])
+        t = vcs.createtemplate(source="default")
+        t.title.x = .3
+        t2 = vcs.createtemplate(source=t)
+        self.assertEqual(t2.title.x, .3)
+        t2.title.x = .4
+        self.assertEqual(t.title.x, .3)
+        c = copy.copy(t2.title)
+        self.assertEqual((c.x, c.y, c.member), (.4, t2.title.y, t2.title.member))
+
+    def testSourceCopiesStoreValidatedTypes(self):
+        tt = vcs.createtexttable(source="default")
+        self.assertEqual(tt._backgroundcolor, [100., 100., 100., 0.])
+        tt.color = "red"
+        tt.x = [(.1, .2), (.3, .4)]
+        tt2 = vcs.createtexttable(source=tt)
+        validated = vcs.createtexttable(source="default")
+        validated.color = tt.color
+        validated.x = tt.x
+        self.assertEqual(type(tt2._color), type(validated._color))
+        self.assertEqual(tt2._color, validated._color)
+        self.assertEqual(tt2._x, [[.1, .2], [.3, .4]])
+        self.assertIsNot(tt2._color, tt._color)
+
+    def testPlainNumbersChecks(self):
+        b = vcs.createboxfill()
+        b.update(level_1=1, color_1=16)
+        self.assertEqual((b.level_1, type(b.level_1)), (1., float))
+        with self.assertRaises(ValueError):
+            b.update(color_1=256)
+        with self.assertRaises(ValueError):
+            b.update(color_1=[0, 0, 101])
+        tt = vcs.createtexttable()
+        tt.viewport = (0, .5, 0, 1)
+        self.assertEqual(tt.viewport, [0, .5, 0, 1])
@@ -0,0 +1,55 @@
+import os
+import basevcstest
+import numpy
+import vcs
+
+
+class TestVCSCanvasBatch(basevcstest.VCSBaseTest):
+    def plotPanels(self, n=4):
+        data = numpy.arange(100.).reshape((10, 10))
+        for i in range(n):
+            t = self.x.createtemplate()
+            t.scale(.5)
+            t.move(.5 * (i % 2), "x")
+            t.move(.5 * (i // 2), "y")
+            self.x.plot(data, t, "isofill", bg=self.bg)
+
+    def testSingleRender(self):
+        line = vcs.primitives.line(x=[.1, .9], y=[.5, .5])
+        with self.assertRenders(1):
+            with self.x.batch():
+                self.plotPanels()
+                vcs.primitives.plot(self.x, line, bg=self.bg)
+                with self.x.batch():
+                    self.x.plot(line, bg=self.bg)
+                self.x.clear()
+                self.plotPanels()
+
+    def testIsolines(self):
+        data = numpy.arange(100.).reshape((10, 10))
+        isoline = self.x.createisoline()
+        with self.assertRenders(1):
+            with self.x.batch():
+                self.x.plot(data, isoline, bg=self.bg)
+                self.x.plot(data, isoline, bg=self.bg)
+        self.x.clear()
+        # labels need the render of each plot to be placed
+        isoline.label = "y"
+        with self.assertRenders(3):
+            with self.x.batch():
+                self.x.plot(data, isoline, bg=self.bg)
+                self.x.plot(data, isoline, bg=self.bg)
+
+    def testUnbatched(self):
+        before = self.x.backend.numberOfRenders
+        self.plotPanels()
+        self.assertGreaterEqual(self.x.backend.numberOfRenders - before, 4)
+
+    def testOutputRenders(self):
+        with self.assertRenders(1):
+            with self.x.batch():
+                self.plotPanels()
+                self.x.png(os.path.join(self.pngsdir, "test_vcs_canvas_batch"))
+        with self.assertRenders(0):
+            with self.x.batch():
+                pass
@@ -0,0 +1,63 @@
+import threading
+import unittest
+import numpy
+import vcs
+
+
+class TestVCSCanvasPool(unittest.TestCase):
+    def testCheckoutCheckin(self):
+        pool = vcs.CanvasPool(2, geometry=(400, 300), debug=True)
+        x = pool.checkout()
+        x.setcolormap("AMIP")
+        x.backgroundcolor = 0, 0, 0
+        x.plot(numpy.arange(100.).reshape((10, 10)), "default", "boxfill")
+        pool.checkin(x)
+        self.assertEqual(x.display_names, [])
+        self.assertIsNone(x.colormap)
+        self.assertEqual(x.backgroundcolor, (255, 255, 255))
+        self.assertRaises(ValueError, pool.checkin, x)
+        self.assertRaises(ValueError, pool.checkin, vcs.init(bg=True))
+        with pool.canvas() as y:
+            self.assertIs(y, x)
+            with pool.canvas() as z:
+                self.assertIsNot(z, x)
+                self.assertRaises(RuntimeError, pool.checkout, 0.01)
+        self.assertEqual(len(pool), 2)
+        pool.close()
+        self.assertEqual(len(pool), 0)
+        self.assertRaises(RuntimeError, pool.checkout)
+
+    def testFailedReset(self):
+        pool = vcs.CanvasPool(1, geometry=(400, 300), debug=True)
+        x = pool.checkout()
+        x.plot(numpy.arange(100.).reshape((10, 10)), "default", "boxfill")
+
+        def verify(canvas, state):
+            raise vcs.error.vcsError("not reset")
+        pool.verify = verify
+        self.assertRaises(vcs.error.vcsError, pool.checkin, x)
+        self.assertEqual(len(pool), 0)
+        del(pool.verify)
+        with pool.canvas(timeout=1) as y:
+            self.assertIsNot(y, x)
+        pool.close()
+
+    def testThreads(self):
+        pool = vcs.CanvasPool(2, geometry=(400, 300))
+        data = numpy.arange(100.).reshape((10, 10))
+        errors = []
+
+        def render():
+            try:
+                with pool.canvas() as x:
+                    x.plot(data, "default", "isofill")
+            except Exception as err:
+                errors.append(err)
+        threads = [threading.Thread(target=render) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(pool), 2)
+        pool.close()
@@ -0,0 +1,21 @@
+import basevcstest
+import numpy
+
+
+class TestVCSClearReuse(basevcstest.VCSBaseTest):
+    def testContextAreasReused(self):
+        data = numpy.arange(100.).reshape((10, 10))
+        pool = self.x.backend._contextAreaPool
+        self.x.plot(data, "default", "boxfill")
+        self.assertEqual(len(pool["vtkInteractiveArea"]), 0)
+        self.x.clear()
+        interactive = list(pool["vtkInteractiveArea"])
+        self.assertNotEqual(interactive, [])
+        self.assertNotEqual(pool["vtkContextArea"], [])
+        self.x.plot(data, "default", "boxfill")
+        self.assertEqual(len(pool["vtkInteractiveArea"]), len(interactive) - 1)
+        scene = self.x.backend.contextView.GetScene()
+        items = [scene.GetItem(i) for i in range(scene.GetNumberOfItems())]
+        self.assertTrue(any(item is interactive[-1] for item in items))
+        self.x.clear()
+        self.assertEqual(len(pool["vtkInteractiveArea"]), len(interactive))
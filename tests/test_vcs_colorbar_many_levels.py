@@ -0,0 +1,30 @@
+import basevcstest
+import numpy
+import vcs
+from vcs import vcs2vtk
+
+
+class TestVCSColorbarManyLevels(basevcstest.VCSBaseTest):
+    def testSolidPolygons(self):
+        fa = vcs.primitives.fillarea()
+        fa.x = [[0, 1, 1, 0], [0, .5, 1]]
+        fa.y = [[0, 0, 1, 1], [0, 1, 0]]
+        fa.color = [16, [100, 0, 0, 100]]
+        fa.opacity = [None, 50]
+        n = vcs2vtk.prepPrimitive(fa)
+        cmap = vcs.getcolormap("default")
+        poly = vcs2vtk._polygons(fa, range(n))
+        self.assertEqual(poly.GetNumberOfPoints(), 7)
+        self.assertEqual(poly.GetNumberOfCells(), 2)
+        self.assertEqual(poly.GetCell(1).GetNumberOfPoints(), 3)
+        colors = vcs2vtk._colorArray([vcs2vtk._fillareaColor(fa, cmap, i, fa.color[i]) for i in range(n)])
+        self.assertEqual(list(colors.GetTuple(0)), [int(c / 100. * 255) for c in cmap.index[16]])
+        self.assertEqual(list(colors.GetTuple(1)), [255, 0, 0, 127])
+
+    def testManyLevels(self):
+        data = numpy.arange(10000.).reshape((100, 100))
+        b = vcs.createboxfill()
+        b.boxfill_type = "custom"
+        b.levels = [-1e20] + list(numpy.linspace(0, 10000, 250)) + [1e20]
+        b.fillareacolors = vcs.getcolors(b.levels)
+        self.x.plot(data, b, bg=1)
@@ -0,0 +1,53 @@
+import numpy
+import basevcstest
+import vcs
+from vcs import VCS_validation_functions
+
+
+class TestVCSColormapArray(basevcstest.VCSBaseTest):
+    def testArray(self):
+        cmap = vcs.createcolormap(Cp_name_src="default")
+        array = cmap.index.array()
+        self.assertEqual(array.shape, (256, 4))
+        self.assertEqual(list(array[1]), [26., 0., 33., 100.])
+        self.assertIs(cmap.index.array(), array)
+        stamp = cmap.index.stamp
+        cmap.setcolorcell(1, 10, 20, 30)
+        self.assertNotEqual(cmap.index.stamp, stamp)
+        self.assertEqual(list(cmap.index.array()[1]), [10., 20., 30., 100.])
+        self.assertEqual(list(array[1]), [26., 0., 33., 100.])
+        self.assertRaises(ValueError, cmap.index.__getitem__, 256)
+        self.assertRaises(ValueError, cmap.index.__getitem__, "red")
+        self.assertEqual(cmap.index[numpy.int64(1)], [10, 20, 30, 100.])
+
+    def testInPlaceEdits(self):
+        cmap = vcs.createcolormap(Cp_name_src="default")
+        array = cmap.index.array()
+        stamp = cmap.index.stamp
+        cmap.index[1][0] = 50
+        self.assertNotEqual(cmap.index.stamp, stamp)
+        self.assertEqual(list(cmap.index.array()[1]), [50., 0., 33., 100.])
+        self.assertEqual(list(array[1]), [26., 0., 33., 100.])
+        stamp = cmap.index.stamp
+        cell = cmap.getcolorcell(2)
+        cell[:3] = [1, 2, 3]
+        self.assertNotEqual(cmap.index.stamp, stamp)
+        self.assertEqual(cmap.index.nearest(1, 2, 3), 2)
+        self.assertEqual(cmap.index[2], [1, 2, 3, 100])
+
+    def testNearest(self):
+        cmap = vcs.createcolormap(Cp_name_src="rainbow")
+        for r, g, b in [(0, 0, 100), (100, 0, 0), (50, 50, 50), (12.5, 80, 3)]:
+            expected = None
+            rmsmin = None
+            for i in range(256):
+                r2, g2, b2 = cmap.index[i][:3]
+                rms = numpy.sqrt((r2 - r) ** 2 + (g2 - g) ** 2 + (b2 - b) ** 2)
+                if rmsmin is None or rms < rmsmin:
+                    rmsmin = rms
+                    expected = i
+            self.assertEqual(cmap.index.nearest(r, g, b), expected)
+            self.assertEqual(VCS_validation_functions.matchVcsColor(r, g, b, cmap.name), expected)
+            self.assertEqual(vcs.match_color([r, g, b], cmap.name), expected)
+        cmap.setcolorcell(200, 1, 2, 3)
+        self.assertEqual(cmap.index.nearest(1, 2, 3), 200)
@@ -0,0 +1,35 @@
+import basevcstest
+import numpy
+import vcs
+from vcs import vcs2vtk
+
+
+class TestVCSContinentsLevels(basevcstest.VCSBaseTest):
+    def testSimplifyPolylines(self):
+        coords = numpy.zeros((8, 3))
+        coords[:5, 0] = [0, 1, 2, 3, 4]
+        coords[:5, 1] = [0, .01, 1, .01, 0]
+        coords[5:, 0] = [0, 1, 2]
+        counts = numpy.array([5, 0, 3])
+        keep = vcs2vtk._simplifyPolylines(coords, counts, .1)
+        self.assertEqual(keep.tolist(), [True, False, True, False, True, True, False, True])
+        self.assertTrue(vcs2vtk._simplifyPolylines(coords, counts, 0.)[:5].all())
+
+    def testLevels(self):
+        fnm = self.x._continentspath(1)
+        full = vcs2vtk.prepContinents(fnm)
+        self.assertEqual(full.GetNumberOfPoints(), vcs2vtk.prepContinents(fnm, tolerance=0.).GetNumberOfPoints())
+        coarse = vcs2vtk.prepContinents(fnm, tolerance=1.)
+        self.assertLess(coarse.GetNumberOfPoints(), full.GetNumberOfPoints())
+        self.assertEqual(coarse.GetNumberOfCells(), full.GetNumberOfCells())
+        key = [k for k in vcs2vtk._continents if k[0] == fnm][0]
+        self.assertIn(.64, vcs2vtk._continents[key].levels)
+
+    def testSmallPanels(self):
+        data = numpy.arange(180 * 360.).reshape((180, 360))
+        for i in range(16):
+            t = vcs.createtemplate()
+            t.scale(.25)
+            t.move(i % 4 / 4., "x")
+            t.move(i // 4 / 4., "y")
+            self.x.plot(data, t, bg=self.bg, continents=2)
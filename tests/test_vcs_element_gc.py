@@ -0,0 +1,87 @@
+import threading
+
+import basevcstest
+import vcs
+from vcs import journal
+
+
+class TestVCSElementGC(basevcstest.VCSBaseTest):
+    def tearDown(self):
+        vcs.set_element_gc(on_clear=False)
+        super(TestVCSElementGC, self).tearDown()
+
+    def testReport(self):
+        t = vcs.createtemplate()
+        report = vcs.element_report()
+        self.assertEqual(report["template"]["count"], len(vcs.elements["template"]))
+        self.assertGreaterEqual(report["template"]["auto"], 1)
+        self.assertGreater(report["template"]["bytes"], 0)
+        vcs.removeobject(t)
+
+    def testCollectUnreachable(self):
+        dropped = vcs.createtemplate().name
+        kept = vcs.createtemplate()
+        tt = vcs.createtexttable()
+        named = vcs.createtemplate("gc_test_template")
+        named.title.texttable = tt.name
+        ttname = tt.name
+        del(tt)
+        reclaimed = vcs.collect_elements()
+        self.assertGreaterEqual(reclaimed.get("template", 0), 1)
+        self.assertNotIn(dropped, vcs.elements["template"])
+        self.assertIn(kept.name, vcs.elements["template"])
+        self.assertIn(ttname, vcs.elements["texttable"])
+        vcs.removeobject(named)
+        vcs.removeobject(kept)
+
+    def testCollectOnClear(self):
+        vcs.set_element_gc(on_clear=True)
+        dn = self.x.plot(self.clt("clt", time=slice(0, 1)), bg=self.bg)
+        nm = dn.name
+        new = dn.newelements
+        del(dn)
+        self.x.remove_display_name(nm)
+        self.x.clear()
+        self.assertNotIn(nm, vcs.elements["display"])
+        for e in new:
+            for k in new[e]:
+                self.assertNotIn(k, vcs.elements[e])
+
+    def testMaxAuto(self):
+        self.assertRaises(ValueError, vcs.set_element_gc, -1)
+        vcs.set_element_gc(max_auto=0, on_clear=False)
+        nm = vcs.createtemplate().name
+        self.x.plot(self.clt("clt", time=slice(0, 1)), bg=self.bg)
+        self.assertNotIn(nm, vcs.elements["template"])
+        self.assertEqual(len(self.x.display_names), 1)
+        self.assertIn(self.x.display_names[0], vcs.elements["display"])
+
+    def testLookupWhileCollecting(self):
+        t = vcs.createtemplate()
+        vcs.elements["template"].unlist(t.name)
+        self.assertIn(t.name, vcs.elements["template"])
+        self.assertIs(vcs.gettemplate(t.name), t)
+        self.assertIs(vcs.elements["template"].relist(t.name), t)
+        self.assertIn(t.name, vcs.elements["template"])
+        vcs.removeobject(t)
+
+    def testNoCollectionWhilePlotting(self):
+        opened = threading.Event()
+        done = threading.Event()
+
+        def plotting():
+            opened_journal = journal.start()
+            opened.set()
+            done.wait()
+            journal.stop(opened_journal)
+
+        thread = threading.Thread(target=plotting)
+        thread.start()
+        opened.wait()
+        nm = vcs.createtemplate().name
+        self.assertEqual(vcs.collect_elements(), {})
+        self.assertIn(nm, vcs.elements["template"])
+        done.set()
+        thread.join()
+        self.assertGreaterEqual(vcs.collect_elements().get("template", 0), 1)
+        self.assertNotIn(nm, vcs.elements["template"])
@@ -0,0 +1,56 @@
+import threading
+import basevcstest
+import vcs
+from vcs import journal
+
+
+class TestVCSElementsJournal(basevcstest.VCSBaseTest):
+    def testJournalRecordsNewKeysOnly(self):
+        elements = {"line": journal.ElementsDict("line", {"old": 1})}
+        outer = journal.start()
+        elements["line"]["old"] = 2
+        elements["line"]["a"] = 1
+        inner = journal.start()
+        elements["line"]["b"] = 1
+        journal.stop(inner)
+        elements["line"]["c"] = 1
+        del(elements["line"]["a"])
+        journal.stop(outer)
+        elements["line"]["d"] = 1
+        self.assertEqual(journal.newElements(outer, elements), {"line": ["b", "c"]})
+        self.assertEqual(journal.newElements(inner, elements), {"line": ["b"]})
+
+    def testJournalsPerThread(self):
+        elements = {"line": journal.ElementsDict("line")}
+        mine = journal.start()
+        ready = threading.Event()
+        done = threading.Event()
+        theirs = []
+
+        def plot():
+            theirs.append(journal.start())
+            ready.set()
+            done.wait()
+            elements["line"]["b"] = 1
+            journal.stop(theirs[0])
+        thread = threading.Thread(target=plot)
+        thread.start()
+        ready.wait()
+        elements["line"]["a"] = 1
+        done.set()
+        thread.join()
+        self.assertTrue(journal.isOpen())
+        journal.stop(mine)
+        self.assertFalse(journal.isOpen())
+        self.assertEqual(journal.newElements(mine, elements), {"line": ["a"]})
+        self.assertEqual(journal.newElements(theirs[0], elements), {"line": ["b"]})
+
+    def testPlotCleansUpNewElements(self):
+        self.x.plot(self.clt("clt", time=slice(0, 1)), bg=self.bg)
+        dn = vcs.elements["display"][self.x.display_names[0]]
+        self.assertIn(dn.name, dn.newelements["display"])
+        new = dn.newelements
+        self.x.clear()
+        for k in new:
+            for nm in new[k]:
+                self.assertNotIn(nm, vcs.elements[k])
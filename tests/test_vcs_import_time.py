@@ -0,0 +1,48 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+DEFERRED = ["vtk", "cdutil", "genutil", "IPython", "ipywidgets", "sidecar", "vcs.VTKPlots"]
+
+
+class TestVCSImportTime(unittest.TestCase):
+    def setUp(self):
+        # the initial.attributes snapshot goes there instead of ~/.uvcdat
+        self.dotdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dotdir)
+
+    def importVCS(self, code):
+        env = dict(os.environ, UVCDAT_DIR=self.dotdir)
+        P = subprocess.Popen([sys.executable, "-X", "importtime", "-c", "import vcs\n" + code],
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE,
+                             universal_newlines=True,
+                             env=env)
+        out, err = P.communicate()
+        self.assertEqual(P.returncode, 0, err)
+        return out, err
+
+    def importTime(self):
+        out, err = self.importVCS("")
+        for line in err.splitlines():
+            # import time: self [us] | cumulative | imported package
+            sp = line.split("|")
+            if len(sp) == 3 and sp[2].strip() == "vcs":
+                return int(sp[1])
+        self.fail("vcs import time not reported")
+
+    def testSnapshotSpeedsUpImport(self):
+        # First run parses initial.attributes and writes the snapshot
+        cold = self.importTime()
+        self.assertTrue(os.path.exists(os.path.join(self.dotdir, "initial.attributes.snapshot")))
+        warm = min(self.importTime() for i in range(3))
+        self.assertLess(warm, cold)
+
+    def testHeavyModulesDeferred(self):
+        out, err = self.importVCS("import sys\nprint(' '.join(m for m in %s if m in sys.modules))" % repr(DEFERRED))
+        self.assertEqual(out.strip(), "")
@@ -0,0 +1,41 @@
+import basevcstest
+import vcs
+from vcs import journal
+
+
+class TestVCSLazyElements(basevcstest.VCSBaseTest):
+    def testLazyEntries(self):
+        elts = journal.ElementsDict("boxfill", {"default": 0})
+        created = []
+
+        def factory():
+            created.append("lazy")
+            elts["lazy"] = 1
+
+        elts.addLazy("lazy", factory)
+        self.assertIn("lazy", elts)
+        self.assertEqual(len(elts), 2)
+        self.assertEqual(elts.names(), ["default", "lazy"])
+        self.assertEqual(created, [])
+        self.assertEqual(elts["lazy"], 1)
+        self.assertEqual(created, ["lazy"])
+        elts.addLazy("other", lambda: elts.__setitem__("other", 2))
+        self.assertEqual(sorted(elts.keys()), ["default", "lazy", "other"])
+        self.assertEqual(elts.lazy, {})
+        self.assertRaises(KeyError, elts.addLazy, "other", factory)
+
+    def testMaterializationIsNotJournaled(self):
+        elts = journal.ElementsDict("boxfill")
+        elts.addLazy("lazy", lambda: elts.__setitem__("lazy", 1))
+        j = journal.start()
+        elts["lazy"]
+        elts["new"] = 2
+        journal.stop(j)
+        self.assertEqual(j, [("boxfill", "new")])
+
+    def testBuiltinsAvailable(self):
+        self.assertIn("a_boxfill", vcs.listelements("boxfill"))
+        self.assertEqual(vcs.getboxfill("a_boxfill").name, "a_boxfill")
+        self.assertIn("a_boxfill", vcs._protected_elements["boxfill"])
+        self.assertIn("viridis", vcs.elements["colormap"])
+        self.assertEqual(vcs.getcolormap("viridis").name, "viridis")
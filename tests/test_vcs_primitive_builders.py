@@ -0,0 +1,64 @@
+import basevcstest
+import vcs
+from vcs import vcs2vtk
+
+
+class TestVCSPrimitiveBuilders(basevcstest.VCSBaseTest):
+    def testRaggedCoordinates(self):
+        coords, counts = vcs2vtk._raggedCoordinates([[0, 1, 2], [5], [7, 8]], [[0, 1], [5, 6], [7, 8]])
+        self.assertEqual(list(counts), [3, 2, 2])
+        self.assertEqual(coords[:, 0].tolist(), [0, 1, 2, 5, 5, 7, 8])
+        self.assertEqual(coords[:, 1].tolist(), [0, 1, 1, 5, 6, 7, 8])
+        self.assertEqual(vcs2vtk._segmentStarts(counts).tolist(), [0, 1, 3, 5])
+
+    def testDensify(self):
+        wc = [-180, 180, -90, 90]
+        geo = vcs2vtk.geoTransform("polar", wc)
+        # a parallel curves on a polar projection, a meridian does not
+        coords, counts = vcs2vtk._raggedCoordinates([[-180, 0, 180], [10, 10]], [[45, 45, 45], [-80, 80]])
+        points, newCounts = vcs2vtk._densifySegments(coords, counts, geo, .01)
+        self.assertGreater(newCounts[0], 3)
+        self.assertEqual(newCounts[1], 2)
+        self.assertEqual(len(points), newCounts.sum())
+        self.assertEqual(points[-2:, 1].tolist(), [-80, 80])
+        self.assertEqual(sorted(points[:newCounts[0], 0].tolist()), points[:newCounts[0], 0].tolist())
+        fewer, fewerCounts = vcs2vtk._densifySegments(coords, counts, geo, 1.)
+        self.assertLess(fewerCounts[0], newCounts[0])
+
+    def testLines(self):
+        line = vcs.primitives.line()
+        line.x = [[i, i + 1, i + 2] for i in range(500)]
+        line.y = [[0, 1, 0]] * 500
+        line.color = [16] * 250 + [[100, 0, 0, 100]] * 250
+        line.worldcoordinate = [0, 502, 0, 1]
+        vcs2vtk.prepPrimitive(line)
+        line_data = {}
+        vcs2vtk._collectLine(line, None, line_data, .01)
+        self.assertEqual(list(line_data.keys()), [("solid", 1)])
+        coords, counts, colors = line_data[("solid", 1)][0]
+        self.assertEqual(len(coords), 1500)
+        self.assertEqual(colors.shape, (1000, 4))
+        self.assertEqual(colors[-1].tolist(), [100, 0, 0, 100])
+
+    def testPlotMany(self):
+        fa = vcs.createfillarea()
+        fa.x = [[i / 100., i / 100. + .01, i / 100.] for i in range(100)]
+        fa.y = [[.2, .2, .3]] * 100
+        fa.style = ["solid", "hatch"] * 50
+        fa.index = [3]
+        fa.color = list(range(16, 116))
+        m = vcs.createmarker()
+        m.x = [[i / 100. for i in range(100)]] * 3
+        m.y = [[.5] * 100, [.6] * 100, [.7] * 100]
+        m.type = ["dot", "cross", "circle"]
+        ln = vcs.createline()
+        ln.x = [[i / 100., i / 100.] for i in range(100)]
+        ln.y = [[.8, .9]] * 100
+        for p in [fa, m, ln]:
+            self.x.plot(p, bg=self.bg)
+        ln2 = vcs.createline()
+        ln2.projection = "polar"
+        ln2.worldcoordinate = [-180, 180, 0, 90]
+        ln2.x = [[-180, 180]] * 5
+        ln2.y = [[10], [30], [50], [70], [85]]
+        self.x.plot(ln2, bg=self.bg)
@@ -0,0 +1,45 @@
+import basevcstest
+import numpy
+import vcs
+from vcs import vcs2vtk
+
+
+class TestVCSResizeReplot(basevcstest.VCSBaseTest):
+    def testGridReused(self):
+        calls = []
+        genGrid = vcs2vtk.genGrid
+
+        def countingGenGrid(*args, **kargs):
+            calls.append(args[2].g_name)
+            return genGrid(*args, **kargs)
+        vcs2vtk.genGrid = countingGenGrid
+        try:
+            data = numpy.arange(400.).reshape((20, 20))
+            self.x.plot(data, "default", "isofill", bg=self.bg)
+            self.assertEqual(len(calls), 1)
+            self.x.backend.setsize(600, 545)
+            self.x.backend.setsize(800, 700)
+            self.x.backend.setsize(1200, 1090)
+            # computed once more for the first resize, reused by the next ones
+            self.assertEqual(len(calls), 2)
+            self.x.update()
+            self.assertEqual(len(calls), 3)
+            self.x.backend.setsize(600, 545)
+            self.assertEqual(len(calls), 4)
+            # new arrays of the display are never mistaken for the cached ones
+            display = vcs.elements["display"][self.x.display_names[0]]
+            display.array = [display.array[0] * 2., None]
+            self.x.backend.setsize(800, 700)
+            self.assertEqual(len(calls), 5)
+        finally:
+            vcs2vtk.genGrid = genGrid
+
+    def testBackgroundResizeIsImmediate(self):
+        if not self.bg:
+            self.skipTest("on screen resizes are debounced")
+        data = numpy.arange(400.).reshape((20, 20))
+        self.x.plot(data, "default", "boxfill", bg=self.bg)
+        self.x.backend.renWin.SetSize(700, 600)
+        self.x.backend.configureEvent(self.x.backend.renWin, "ConfigureEvent")
+        self.assertIsNone(self.x.backend._resizeTimer)
+        self.assertEqual(self.x.backend._lastSize, (700, 600))
@@ -0,0 +1,56 @@
+import contextlib
+import basevcstest
+import numpy
+import vcs
+
+
+class TestVCSTemplateBatch(basevcstest.VCSBaseTest):
+    def countItems(self):
+        scene = self.x.backend.contextView.GetScene()
+        areas = [scene.GetItem(i) for i in range(scene.GetNumberOfItems())]
+        items = 0
+        for area in areas:
+            if hasattr(area, "GetDrawAreaItem"):
+                items += area.GetDrawAreaItem().GetNumberOfItems()
+        return len(areas), items
+
+    def plotPanels(self):
+        data = numpy.arange(400.).reshape((20, 20))
+        for i in range(4):
+            t = self.x.createtemplate()
+            t.scale(.5)
+            t.move(.5 * (i % 2), "x")
+            t.move(.5 * (i // 2), "y")
+            self.x.plot(data, t, "boxfill", bg=1)
+        return self.countItems()
+
+    def testFewerItems(self):
+        batchedAreas, batchedItems = self.plotPanels()
+        self.x.clear()
+
+        @contextlib.contextmanager
+        def unbatched():
+            yield None
+        self.x.backend.primitiveBatch = unbatched
+        areas, items = self.plotPanels()
+        self.assertLess(batchedAreas, areas)
+        self.assertLess(batchedItems, items)
+
+    def testSharedAreas(self):
+        self.x.backend.createRenWin()
+        fills = []
+        for i in range(10):
+            fa = vcs.primitives.fillarea()
+            fa.x = [i / 10., i / 10. + .05, i / 10.]
+            fa.y = [.1, .1, .2]
+            fills.append(fa)
+        top = vcs.primitives.fillarea()
+        top.x = [.1, .2, .2]
+        top.y = [.5, .5, .6]
+        top.priority = 2
+        before = self.countItems()[0]
+        with self.x.backend.primitiveBatch():
+            for fa in fills + [top]:
+                vcs.primitives.plot(self.x, fa, bg=1)
+        # one area per priority
+        self.assertEqual(self.countItems()[0], before + 2)
@@ -0,0 +1,81 @@
+import copy
+import basevcstest
+import vcs
+from vcs import copyonwrite
+
+
+class TestVCSTemplateCopyOnWrite(basevcstest.VCSBaseTest):
+    def testMembersCopiedOnWrite(self):
+        src = vcs.createtemplate()
+        src.title.x = .25
+        src.legend.x1 = .1
+        cow = vcs.template.P("__cow_test", src.name, copy_on_write=True)
+        self.assertTrue(copyonwrite.isShared(cow, "_title"))
+        self.assertIsInstance(cow.title, vcs.template.Pt)
+        self.assertEqual(cow.title.x, .25)
+
+        cow.title.x = .5
+        self.assertFalse(copyonwrite.isShared(cow, "_title"))
+        self.assertEqual(cow.title.x, .5)
+        self.assertEqual(src.title.x, .25)
+        self.assertTrue(copyonwrite.isShared(cow, "_data"))
+
+        # reference taken before writing follows the private copy
+        ylabel = cow.ylabel1
+        ylabel.priority = 0
+        ylabel.x = .3
+        self.assertEqual((cow.ylabel1.priority, cow.ylabel1.x), (0, .3))
+        self.assertNotEqual(src.ylabel1.x, .3)
+
+    def testSourceUntouched(self):
+        src = vcs.createtemplate()
+        title = src.title
+        cow = vcs.template.P("__cow_test3", src.name, copy_on_write=True)
+        for member in ["_title", "_legend", "_data"]:
+            self.assertIsNot(type(getattr(src, member)), copyonwrite.SharedMember)
+        self.assertIs(src.title, title)
+        cow.title.x = .6
+        src.title.x = .2
+        self.assertIs(src.title, title)
+        self.assertEqual(title.x, .2)
+        self.assertEqual(cow.title.x, .6)
+        default = vcs.gettemplate("default")
+        vcs.template.P("__cow_test4", "default", copy_on_write=True)
+        self.assertIsNot(type(default.title), copyonwrite.SharedMember)
+
+    def testSourceEditsNotShared(self):
+        src = vcs.createtemplate()
+        src.xlabel1.y = .1
+        src.xlabel1.priority = 1
+        xlabel = src.xlabel1
+        cow = vcs.template.P("__cow_test5", src.name, copy_on_write=True)
+        cow2 = vcs.template.P("__cow_test6", cow.name, copy_on_write=True)
+        src.xlabel1.y = .42
+        self.assertEqual(cow.xlabel1.y, .1)
+        self.assertEqual(cow2.xlabel1.y, .1)
+        self.assertFalse(copyonwrite.isShared(cow, "_xlabel1"))
+        xlabel.priority = 0
+        self.assertEqual(src.xlabel1.priority, 0)
+        self.assertIs(src.xlabel1, xlabel)
+        for t in (cow, cow2):
+            self.assertEqual(t.xlabel1.priority, 1)
+        # through update too
+        legend = cow.legend.x1
+        src.legend.update(x1=legend + .1)
+        self.assertEqual(cow.legend.x1, legend)
+
+    def testCopies(self):
+        src = vcs.createtemplate()
+        cow = vcs.template.P("__cow_test2", src.name, copy_on_write=True)
+        dumped = vcs.utils.dumpToDict(cow)[0]
+        expected = vcs.utils.dumpToDict(src)[0]
+        del(dumped["name"], expected["name"])
+        self.assertEqual(dumped, expected)
+        deep = copy.deepcopy(cow.title)
+        self.assertIs(type(deep), vcs.template.Pt)
+        shallow = copy.copy(cow.legend)
+        self.assertIs(type(shallow), vcs.template.Pls)
+        full = vcs.createtemplate(source=cow)
+        full.title.x = .7
+        self.assertNotEqual(cow.title.x, .7)
+        self.assertNotEqual(src.title.x, .7)
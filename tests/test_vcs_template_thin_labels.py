@@ -0,0 +1,38 @@
+import basevcstest
+import vcs
+
+
+class TestVCSTemplateThinLabels(basevcstest.VCSBaseTest):
+    def testThinAttribute(self):
+        t = vcs.createtemplate()
+        self.assertFalse(t.xlabel1.thin)
+        t.xlabel1.thin = True
+        self.assertTrue(t.xlabel1.thin)
+        with self.assertRaises(ValueError):
+            t.ylabel1.thin = "some"
+        t2 = vcs.createtemplate(source=t)
+        self.assertTrue(t2.xlabel1.thin)
+        self.assertFalse(t2.ylabel1.thin)
+
+    def testThinLabels(self):
+        self.x.backend.createRenWin()
+        tt = vcs.primitives.text()
+        tt.string = ["%d" % (1000 * i) for i in range(41)]
+        tt.x = [.1 + .02 * i for i in range(41)]
+        tt.y = [.1] * 41
+        keep = vcs.template.thinLabels(self.x, tt, "x")
+        # both ends are always kept, labels are spread evenly
+        self.assertEqual(keep[0], 0)
+        self.assertEqual(keep[-1], 40)
+        self.assertLess(len(keep), 41)
+        self.assertEqual(keep, vcs.template.thinLabels(self.x, tt, "x"))
+        boxes = [self.x.gettextextent(tt)[i] for i in keep]
+        for b1, b2 in zip(boxes[:-1], boxes[1:]):
+            self.assertLessEqual(b1[1], b2[0])
+
+    def testPlotThinned(self):
+        t = vcs.createtemplate()
+        t.xlabel1.thin = True
+        b = vcs.createboxfill()
+        b.xticlabels1 = dict((i, "label %d" % i) for i in range(0, 100, 2))
+        self.x.plot([range(100) for _ in range(10)], t, b, bg=self.bg)
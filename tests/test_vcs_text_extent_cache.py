@@ -0,0 +1,37 @@
+import basevcstest
+import vcs
+from vcs.vtk_ui import text as vtk_ui_text
+
+
+class TestVCSTextExtentCache(basevcstest.VCSBaseTest):
+    def testBatchExtents(self):
+        t = self.x.createtext()
+        t.x = [.5]
+        t.y = [.5]
+        t.string = ["Hello World"]
+        t2 = self.x.createtext()
+        t2.x = [.2, .8]
+        t2.y = [.5]
+        t2.string = ["0", "30N"]
+        extents = self.x.gettextextent([t, t2])
+        self.assertEqual(extents, [self.x.gettextextent(t), self.x.gettextextent(t2)])
+        self.assertEqual(len(extents[1]), 2)
+        anonymous = vcs.primitives.text(t.Tt, t.To)
+        self.assertEqual(self.x.gettextextent(anonymous), extents[0])
+        self.assertRaises(vcs.error.vcsError, self.x.gettextextent, [t, "not a text"])
+
+    def testCachedBoxes(self):
+        t = self.x.createtext()
+        t.x = [.5]
+        t.y = [.5]
+        t.string = ["60E"]
+        vtk_ui_text._text_boxes.clear()
+        first = self.x.gettextextent(t)
+        self.assertEqual(len(vtk_ui_text._text_boxes), 1)
+        # callers modify what they get back, the cache must not change
+        first[0][0] = -1000.
+        self.assertNotEqual(self.x.gettextextent(t), first)
+        self.assertEqual(len(vtk_ui_text._text_boxes), 1)
+        t.height = t.height * 2
+        self.x.gettextextent(t)
+        self.assertEqual(len(vtk_ui_text._text_boxes), 2)
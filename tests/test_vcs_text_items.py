@@ -0,0 +1,15 @@
+import basevcstest
+
+
+class TestVCSTextItems(basevcstest.VCSBaseTest):
+    def testOneItemPerText(self):
+        t = self.x.createtext()
+        t.x = [.2, .5, .8]
+        t.y = [.5]
+        t.string = ["0", "30N", "60N"]
+        dp = self.x.text(t)
+        actors = dp.backend["vtk_backend_text_actors"]
+        self.assertEqual(len(actors), 3)
+        scene = self.x.backend.contextView.GetScene()
+        area = scene.GetItem(scene.GetNumberOfItems() - 1)
+        self.assertEqual(area.GetDrawAreaItem().GetNumberOfItems(), 1)
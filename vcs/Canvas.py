@@ -16,9 +16,10 @@
     .. _long: https://docs.python.org/2/library/functions.html?highlight=float#long
     .. _file: https://docs.python.org/2/library/functions.html?highlight=open#file
 """
+import contextlib
 import warnings
 import numpy.ma
-import MV2
+from .lazyimport import available, cdms2, MV2, vtk
 import numpy
 import cdat_info
 from .queries import *  # noqa
@@ -34,16 +35,9 @@ from . import textorientation
 from . import textcombined
 from . import template
 from . import displayplot
-try:
-    import vtk
-    from .VTKPlots import VTKVCSBackend
-    HAS_VTK = True
-except Exception:
-    HAS_VTK = False
 from weakref import WeakSet, WeakKeyDictionary
 
 from .error import vcsError
-import cdms2
 import copy
 import cdtime
 import vcs
@@ -51,13 +45,14 @@ import os
 import re
 import sys
 import random
-from cdms2.grid import AbstractRectGrid
 import shutil
 import subprocess
 import inspect
 from . import VCS_validation_functions
 from .xmldocs import plot_keywords_doc, graphics_method_core, axesconvert, xaxisconvert, \
     plot_1D_input, plot_2D_input, plot_output, plot_2_1D_input, plot_2_1D_options
+# VTK and the backend are only imported when the first canvas is created
+HAS_VTK = available("vtk")
 gui_canvas_closed = 0
 canvas_closed = 0
 import vcs.manageElements  # noqa
@@ -72,12 +67,6 @@ try:
     basestring
 except Exception:
     basestring = str
-try:
-    from IPython import get_ipython
-except Exception:
-    # Only needed if we are in IPython
-    # in which case we force bg=True
-    pass
 
 
 def rotate(x, y, xorigin, yorigin, angle):
@@ -346,6 +335,35 @@ def _process_keyword(obj, target, source, keyargs, default=None):
     return arg
 
 
+def _inJupyter():
+    """Is the code running in a Jupyter kernel"""
+    # if IPython was never imported we cannot be in Jupyter
+    try:
+        cfg = sys.modules["IPython"].get_ipython().config
+        return 'IPKernelApp' in cfg
+    except (AttributeError, NameError, KeyError):
+        return False
+
+
+def _createBackend(canvas, backend, bg):
+    """Backend of canvas, backend is "vtk", a vtkRenderWindow or used as is"""
+    VTKVCSBackend = None
+    if HAS_VTK:
+        try:
+            from .VTKPlots import VTKVCSBackend
+        except Exception:
+            pass
+    if VTKVCSBackend is not None and backend == "vtk":
+        return VTKVCSBackend(canvas, bg=bg)
+    elif VTKVCSBackend is not None and isinstance(backend, vtk.vtkRenderWindow):
+        return VTKVCSBackend(canvas, renWin=backend, bg=bg)
+    warnings.warn(
+        "Unknown backend type: '%s'\nAssiging 'as is' to "
+        "backend, no warranty about anything working from this point on" %
+        backend)
+    return backend
+
+
 class Canvas(vcs.bestMatch):
     """Usually created using :py:func:`vcs.init`, this object provides easy access
     to the functionality of the entire VCS module:
@@ -731,7 +749,7 @@ class Canvas(vcs.bestMatch):
                     arglist[GRAPHICS_METHOD] = 'yxvsx'
                 else:
                     arglist[GRAPHICS_METHOD] = 'boxfill'
-            elif isinstance(grid, AbstractRectGrid):
+            elif isinstance(grid, cdms2.grid.AbstractRectGrid):
                 arglist[GRAPHICS_METHOD] = 'boxfill'
             else:
                 latbounds, lonbounds = grid.getBounds()
@@ -936,22 +954,9 @@ class Canvas(vcs.bestMatch):
             self.height = h
 
         # When in IpythonJupyter we should set bg to True no matter what the user snet us
-        try:
-            cfg = get_ipython().config
-            if 'IPKernelApp' in cfg:
-                bg = True
-        except (AttributeError, NameError):
-            pass
-        if HAS_VTK and backend == "vtk":
-            self.backend = VTKVCSBackend(self, bg=bg)
-        elif HAS_VTK and isinstance(backend, vtk.vtkRenderWindow):
-            self.backend = VTKVCSBackend(self, renWin=backend, bg=bg)
-        else:
-            warnings.warn(
-                "Unknown backend type: '%s'\nAssiging 'as is' to "
-                "backend, no warranty about anything working from this point on" %
-                backend)
-            self.backend = backend
+        if _inJupyter():
+            bg = True
+        self.backend = _createBackend(self, backend, bg)
 
         self._animate = self.backend.Animate(self)
 
@@ -2384,20 +2389,30 @@ class Canvas(vcs.bestMatch):
                 >>> t.string=['Hello World']
                 >>> a.gettextextent(t)
                 [[...]]
-
-        :param textobject: A VCS text object
+                >>> t2=a.createtext()
+                >>> t2.x=[.2, .8]
+                >>> t2.y=[.5]
+                >>> t2.string=['0', '30N']
+                >>> a.gettextextent([t, t2]) # one list of boxes per text object
+                [[[...]], [[...], [...]]]
+
+        :param textobject: A VCS text object, or a list of them
         :param angle: If not None overwrites the textobject's angle (in degrees)
-        :type textobject: vcs.textcombined.Tc
+        :type textobject: vcs.textcombined.Tc or `list`_
 
         :returns: list of floats containing the coordinates of the text object's bounding box.
-        coordinates are appropriate within the same viewport and worldcoordinate as the input textobject
+        coordinates are appropriate within the same viewport and worldcoordinate as the input textobject.
+        For a list of text objects, the list of their results.
         :rtype: `list`_
         """
+        if isinstance(textobject, (list, tuple)):
+            for t in textobject:
+                if not vcs.istext(t):
+                    raise vcsError('You must pass text objects')
+            return [self.backend.gettextextent(t.To, t.Tt, angle) for t in textobject]
         if not vcs.istext(textobject):
             raise vcsError('You must pass a text object')
-        To = textobject.To_name
-        Tt = textobject.Tt_name
-        return self.backend.gettextextent(To, Tt, angle)
+        return self.backend.gettextextent(textobject.To, textobject.Tt, angle)
 
     def gettextbox(self, textobject):
         """Returns the coordinate of the exact and rotated box surrounding a text object once printed
@@ -2834,27 +2849,33 @@ class Canvas(vcs.bestMatch):
                                    plot_2_1D_input,
                                    plot_output)
 
-    def __new_elts(self, original, new):
-        for e in list(vcs.elements.keys()):
-            for k in list(vcs.elements[e].keys()):
-                if k not in original[e]:
-                    new[e].append(k)
-        return new
+    def __new_elts(self, journal):
+        return vcs.journal.newElements(journal)
+
+    def __copy_template(self, source):
+        """Copy of template source for plot to adjust, its members are only
+        copied when modified"""
+        name, source = vcs.check_name_source(None, source, 'template')
+        return vcs.template.P(name, source, copy_on_write=True)
 
     def __plot(self, arglist, keyargs):
+        # Journal the elements created while plotting
+        # so that anything added (temp objects) can be removed at clear
+        # time
+        journal = vcs.journal.start()
+        try:
+            result = self.__plot_journaled(arglist, keyargs, journal)
+        finally:
+            vcs.journal.stop(journal)
+        vcs.elementgc.autoCollect()
+        return result
+
+    def __plot_journaled(self, arglist, keyargs, journal):
 
         # This routine has five arguments in arglist from _determine_arg_list
         # It adds one for bg and passes those on to Canvas.plot as its sixth
         # arguments.
 
-        # First of all let's remember which elements we have before coming in here
-        # so that anything added (temp objects) can be removed at clear
-        # time
-        original_elts = {}
-        new_elts = {}
-        for k in list(vcs.elements.keys()):
-            original_elts[k] = list(vcs.elements[k].keys())
-            new_elts[k] = []
         # First of all try some cleanup
         assert len(arglist) == 6
         xtrakw = arglist.pop(5)
@@ -2938,10 +2959,11 @@ class Canvas(vcs.bestMatch):
                         check_mthd = copy_mthd
                         m = self.getmeshfill(arglist[4])
                         md = self.getmeshfill()
+                        atts = {}
                         if md.levels != m.levels:
-                            copy_mthd.boxfill_type = 'custom'
-                            copy_mthd.levels = m.levels
-                            copy_mthd.fillareacolors = m.fillareacolors
+                            atts["boxfill_type"] = 'custom'
+                            atts["levels"] = m.levels
+                            atts["fillareacolors"] = m.fillareacolors
                         for att in ['projection',
                                     'xticlabels1',
                                     'xticlabels2',
@@ -2961,7 +2983,8 @@ class Canvas(vcs.bestMatch):
                                     'ext_1',
                                     'ext_2',
                                     'missing']:
-                            setattr(copy_mthd, att, getattr(m, att))
+                            atts[att] = getattr(m, att)
+                        copy_mthd.update(**atts)
         elif arglist[0] is not None \
                 and arglist[0].rank() < 2 \
                 and arglist[3] in ['boxfill', 'default'] \
@@ -3147,7 +3170,7 @@ class Canvas(vcs.bestMatch):
                 'viewport',
             ]:
                 if copy_tmpl is None:
-                    copy_tmpl = vcs.createtemplate(source=arglist[2])
+                    copy_tmpl = self.__copy_template(arglist[2])
                     check_tmpl = copy_tmpl
                 copy_tmpl.reset(
                     'x',
@@ -3168,7 +3191,7 @@ class Canvas(vcs.bestMatch):
                 'label2',
             ]:
                 if copy_tmpl is None:
-                    copy_tmpl = vcs.createtemplate(source=arglist[2])
+                    copy_tmpl = self.__copy_template(arglist[2])
                     check_tmpl = copy_tmpl
                 k = keyargs[p]
                 # not a list means only priority set
@@ -3196,7 +3219,7 @@ class Canvas(vcs.bestMatch):
                 'tic2',
             ]:
                 if copy_tmpl is None:
-                    copy_tmpl = vcs.createtemplate(source=arglist[2])
+                    copy_tmpl = self.__copy_template(arglist[2])
                     check_tmpl = copy_tmpl
 
                 k = keyargs[p]
@@ -3226,7 +3249,7 @@ class Canvas(vcs.bestMatch):
                 'data', 'legend',
             ]:
                 if copy_tmpl is None:
-                    copy_tmpl = vcs.createtemplate(source=arglist[2])
+                    copy_tmpl = self.__copy_template(arglist[2])
                     check_tmpl = copy_tmpl
                 k = keyargs[p]
                 # not a list means only priority set
@@ -3267,7 +3290,7 @@ class Canvas(vcs.bestMatch):
             ]:
                 k = keyargs[p]
                 if copy_tmpl is None:
-                    copy_tmpl = vcs.createtemplate(source=arglist[2])
+                    copy_tmpl = self.__copy_template(arglist[2])
                     check_tmpl = copy_tmpl
                 if p == "id":
                     pname = "dataname"
@@ -3350,8 +3373,7 @@ class Canvas(vcs.bestMatch):
                                 if i not in axes_changed2:
                                     axes_changed2[i] = ax
                 if copy_tmpl is None:
-                    check_tmpl = copy_tmpl = vcs.createtemplate(
-                        source=arglist[2])
+                    check_tmpl = copy_tmpl = self.__copy_template(arglist[2])
                 k = keyargs[p]
                 if getattr(getattr(copy_tmpl, p), 'priority') == 0:
                     setattr(getattr(copy_tmpl, p), 'priority', 1)
@@ -3807,7 +3829,7 @@ class Canvas(vcs.bestMatch):
                     delattr(arglist[0], p)
                 else:
                     setattr(arglist[0], p, tmp)
-            dn.newelements = self.__new_elts(original_elts, new_elts)
+            dn.newelements = self.__new_elts(journal)
             dn._parent = self
 
             """
@@ -3974,8 +3996,7 @@ class Canvas(vcs.bestMatch):
                             if gm.datawc_y2 < 9.99E19:
                                 lat2 = gm.datawc_y2
                             if copy_tmpl is None:
-                                copy_tmpl = vcs.createtemplate(
-                                    source=arglist[2])
+                                copy_tmpl = self.__copy_template(arglist[2])
                                 arglist[2] = copy_tmpl.name
                             copy_tmpl.ratio_linear_projection(
                                 lon1,
@@ -3986,7 +4007,7 @@ class Canvas(vcs.bestMatch):
                                 box_and_ticks=box_and_ticks)
                     elif arglist[0].getAxis(-1).isLongitude() and arglist[0].getAxis(-2).isLatitude():
                         if copy_tmpl is None:
-                            copy_tmpl = vcs.createtemplate(source=arglist[2])
+                            copy_tmpl = self.__copy_template(arglist[2])
                         if gm.datawc_x1 < 9.99E19:
                             lon1 = gm.datawc_x1
                         else:
@@ -4025,7 +4046,7 @@ class Canvas(vcs.bestMatch):
                 except Exception:
                     Ratio = doratio
                 if copy_tmpl is None:
-                    copy_tmpl = vcs.createtemplate(source=arglist[2])
+                    copy_tmpl = self.__copy_template(arglist[2])
                     arglist[2] = copy_tmpl.name
                 copy_tmpl.ratio(Ratio, box_and_ticks=box_and_ticks, x=self)
 
@@ -4093,7 +4114,7 @@ class Canvas(vcs.bestMatch):
                     dn._template_origin = template_origin
                     dn.ratio = keyargs.get("ratio", None)
                     dn.continents_line = self.getcontinentsline()
-                    dn.newelements = self.__new_elts(original_elts, new_elts)
+                    dn.newelements = self.__new_elts(journal)
 
             if self.mode != 0:
                 # self.update()
@@ -4243,25 +4264,28 @@ class Canvas(vcs.bestMatch):
         if "preserve_display" in kargs:
             del kargs["preserve_display"]
         self.backend.clear(*args, **kargs)
+        render = kargs.get("render", True)
         for nm in self.display_names:
             # Lets look at elements created by dispaly production
             # Apparently when updating we shouldn't be clearing these elemnts
             # yet
-            if kargs.get("render", True):
+            if render:
                 dn = vcs.elements["display"][nm]
                 new_elts = getattr(dn, "newelements", {})
-                for e in list(new_elts.keys()):
-                    if e == "display":
+                for e, names in new_elts.items():
+                    if not names or e == "display":
                         continue
-                    for k in new_elts[e]:
-                        if k in list(vcs.elements[e].keys()):
-                            del(vcs.elements[e][k])
+                    elements = vcs.elements[e]
+                    for k in names:
+                        if k in elements:
+                            del(elements[k])
             if not preserve_display:
                 del(vcs.elements["display"][nm])
         self.display_names = []
         if self._display_target is not None and \
                 not isinstance(self._display_target, basestring):
             self._display_target.clear_output()
+        vcs.elementgc.autoCollect(cleared=True)
         return
 
     def close(self, *args, **kargs):
@@ -4375,6 +4399,30 @@ class Canvas(vcs.bestMatch):
         """
         return self.backend.flush(*args)
 
+    @contextlib.contextmanager
+    def batch(self):
+        """Within the block, plots, clears and updates do not render the
+        canvas, it is rendered once when the (outermost) block exits.
+        Outputs (png, pdf, ...) and flush still render what was plotted so far.
+
+        :Example:
+
+            .. doctest:: canvas_batch
+
+                >>> a=vcs.init(bg=True)
+                >>> array = [range(1, 11) for _ in range(1, 11)]
+                >>> with a.batch():
+                ...     for i in range(4):
+                ...         t = a.createtemplate()
+                ...         t.scale(.5)
+                ...         t.move(i % 2 * .5, "x")
+                ...         t.move(i // 2 * .5, "y")
+                ...         d = a.plot(array, t, 'isofill')
+                ...     a.png("page")
+        """
+        with self.backend.deferRender():
+            yield self
+
     def geometry(self, *args):
         """The geometry command is used to set the size and position of the VCS canvas.
 
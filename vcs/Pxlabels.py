@@ -113,7 +113,8 @@ class Pxl(vcs.bestMatch):
         "_priority",
         "_y",
         "_texttable",
-        "_textorientation"]
+        "_textorientation",
+        "_thin"]
 
     def __init__(self, member):
         #    def __init__(self, template, member=None):
@@ -128,6 +129,7 @@ class Pxl(vcs.bestMatch):
         self.member = member
         self.priority = 1
         self.texttable = "default"
+        self.thin = False
         self.textorientation = "defcenter"
         if member == "xlabel1":
             self.y = 0.234999999404
@@ -144,6 +146,7 @@ class Pxl(vcs.bestMatch):
     y = VCS_validation_functions.y
     texttable = VCS_validation_functions.texttable
     textorientation = VCS_validation_functions.textorientation
+    thin = VCS_validation_functions.thin
 
     ##########################################################################
     #                                                                           #
@@ -156,6 +159,7 @@ class Pxl(vcs.bestMatch):
         print("     y =", self.y)
         print("     texttable =", self.texttable)
         print("     textorientation =", self.textorientation)
+        print("     thin =", self.thin)
 
 
 ##########################################################################
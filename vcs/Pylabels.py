@@ -113,7 +113,8 @@ class Pyl(vcs.bestMatch):
         "_priority",
         "_x",
         "_texttable",
-        "_textorientation"]
+        "_textorientation",
+        "_thin"]
 
     def __init__(self, member):
         #    def __init__(self, template, member=None):
@@ -128,6 +129,7 @@ class Pyl(vcs.bestMatch):
         self.member = member
         self.priority = 1
         self.texttable = "default"
+        self.thin = False
         self.textorientation = "defright"
         if member == "ylabel1":
             self.x = 0.0399999991059
@@ -145,6 +147,7 @@ class Pyl(vcs.bestMatch):
     x = VCS_validation_functions.x
     texttable = VCS_validation_functions.texttable
     textorientation = VCS_validation_functions.textorientation
+    thin = VCS_validation_functions.thin
 
     ##########################################################################
     #                                                                           #
@@ -157,6 +160,7 @@ class Pyl(vcs.bestMatch):
         print("     x =", self.x)
         print("     texttable =", self.texttable)
         print("     textorientation =", self.textorientation)
+        print("     thin =", self.thin)
 
 
 ##########################################################################
@@ -2,7 +2,7 @@
 import vcs
 import cdtime
 import numpy
-import genutil
+from .lazyimport import genutil
 
 try:
     basestring
@@ -15,6 +15,10 @@ except Exception:
     long = int
 
 
+# Value types checked by type alone, without the numpy conversions
+_plainNumbers = frozenset((int, float))
+
+
 class PPE(Exception):
 
     def __init__(self, parameter, type):
@@ -50,16 +54,8 @@ def color2vcs(col):
 
 
 def matchVcsColor(r, g, b, colormap="default"):
-    rmsmin = 100000000.
-    color = None
     cmap = vcs.elements["colormap"][colormap]
-    for i in range(256):
-        r2, g2, b2 = cmap.index[i][:3]
-        rms = numpy.sqrt((r2 - r) ** 2 + (g2 - g) ** 2 + (b2 - b) ** 2)
-        if rms < rmsmin:
-            rmsmin = rms
-            color = i
-    return color
+    return cmap.index.nearest(r, g, b)
 
 
 def checkedRaise(self, value, ex, err):
@@ -158,7 +154,7 @@ def checkLine(self, name, value):
             name +
             ' must be an line primitive or the name of an exiting one.')
     if isinstance(value, basestring):
-        if value not in vcs.listelements('line'):
+        if value not in vcs.elements['line']:
             checkedRaise(
                 self,
                 value,
@@ -184,6 +180,9 @@ def isNumber(value, min=None, max=None):
 
 def checkNumber(self, name, value, minvalue=None, maxvalue=None):
     checkName(self, name, value)
+    if type(value) in _plainNumbers and (minvalue is None or value >= minvalue) and \
+            (maxvalue is None or value <= maxvalue):
+        return value
     if isinstance(value, numpy.ndarray) and value.ndim == 0 and not numpy.ma.is_masked(value):
         try:
             value = float(value)
@@ -249,7 +248,10 @@ def checkListOfNumbers(self, name, value, minvalue=None,
             str(maxelements) +
             ' elements')
     value = list(value)
+    plain = (int,) if ints else _plainNumbers
     for i, v in enumerate(value):
+        if type(v) in plain and (minvalue is None or v >= minvalue) and (maxvalue is None or v <= maxvalue):
+            continue
         if ints:
             checkInt(self, name, v, minvalue=minvalue, maxvalue=maxvalue)
         else:
@@ -538,6 +540,8 @@ def checkBoxfillType(self, name, value):
 
 
 def checkIntFloat(self, name, value):
+    if type(value) in _plainNumbers:
+        return float(value)
     try:
         value = value.tolist()  # converts MA/MV/numpy
     except Exception:
@@ -757,6 +761,8 @@ def checkColor(self, name, value, NoneOk=False):
         return r / 2.55, g / 2.55, b / 2.55, 100.
     if value is None and NoneOk:
         return value
+    if type(value) is int and 0 <= value < 256:
+        return value
     if isinstance(value, (int, long)) and value in range(0, 256):
         return value
     elif isinstance(value, (list, tuple)):  # for r,g,b,a tuples
@@ -942,7 +948,7 @@ def checkTextTable(self, name, value):
     if isinstance(value, basestring):
         value = str(value)
     if isinstance(value, basestring):
-        if value not in vcs.listelements("texttable"):
+        if value not in vcs.elements["texttable"]:
             checkedRaise(
                 self,
                 value,
@@ -964,7 +970,7 @@ def checkTextOrientation(self, name, value):
     if isinstance(value, basestring):
         value = str(value)
     if isinstance(value, basestring):
-        if value not in vcs.listelements("textorientation"):
+        if value not in vcs.elements["textorientation"]:
             checkedRaise(
                 self,
                 value,
@@ -999,17 +1005,17 @@ def checkTextsList(self, name, value, storeName=False):
         elif queries.istextcombined(v):
             hvalue.append(v)
         elif isinstance(v, basestring):
-            if v in vcs.listelements("textcombined"):
+            if v in vcs.elements["textcombined"]:
                 if storeName:
                     hvalue.append(vcs.gettextcombined(v).name)
                 else:
                     hvalue.append(vcs.gettextcombined(v))
-            elif v in vcs.listelements("texttable"):
+            elif v in vcs.elements["texttable"]:
                 if storeName:
                     hvalue.append(vcs.gettexttable(v).name)
                 else:
                     hvalue.append(vcs.gettexttable(v))
-            elif v in vcs.listelements("textorientation"):
+            elif v in vcs.elements["textorientation"]:
                 if storeName:
                     hvalue.append(vcs.gettextorientation(v).name)
                 else:
@@ -1101,7 +1107,7 @@ def checkProjection(self, name, value):
         return value.name
     elif isinstance(value, basestring):
         value = str(value)
-        if value not in list(vcs.elements["projection"].keys()):
+        if value not in vcs.elements["projection"]:
             checkedRaise(
                 self,
                 value,
@@ -1712,6 +1718,17 @@ def _setpriority(self, value):
 priority = property(_getpriority, _setpriority)  # noqa
 
 
+@property
+def thin(self):
+    """only draw the labels that do not overlap (ends first, then evenly spread ones)"""
+    return self._thin
+
+
+@thin.setter
+def thin(self, value):
+    self._thin = checkTrueFalse(self, "thin", value)
+
+
 @property
 def arrow(self):
     """length of extension arrows"""
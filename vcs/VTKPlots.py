@@ -1,4 +1,4 @@
-import cdutil
+from .lazyimport import cdutil
 import warnings
 import vtk
 from vtk.util import numpy_support as VN
@@ -7,6 +7,7 @@ from . import vcs2vtk
 import numpy
 import math
 import os
+import contextlib
 import traceback
 import sys
 import cdms2
@@ -222,6 +223,21 @@ class VTKVCSBackend(object):
         self.logoContextItemPython = None
         self.renderer = None
         self._renderers = {}
+        # context areas detached by clear, reused by the next plots
+        self._contextAreaPool = {"vtkContextArea": [], "vtkInteractiveArea": []}
+        # vcs2vtk.PrimitiveBatch while in a primitiveBatch() block
+        self._primitiveBatch = None
+        # interactive resizes are replotted once no resize happened for resizeDelay ms
+        self.resizeDelay = 100
+        self._resizeTimer = None
+        self._resizeTimerInteractor = None
+        # display name -> grid cache (see Pipeline2D._updateVTKDataSet)
+        self._gridCaches = {}
+        # renWin.Render() calls made by render()
+        self.numberOfRenders = 0
+        # depth of deferRender() blocks, and whether a render was requested in them
+        self._deferRender = 0
+        self._renderPending = False
         self._plot_keywords = [
             'cdmsfile',
             'cell_coordinates',
@@ -248,6 +264,10 @@ class VTKVCSBackend(object):
             # "vtk_backend_pipeline_context_area",
             "vtk_backend_viewport_scale",
             "vtk_backend_draw_area_bounds",
+            # values aggregated by the 1d density (mean/max) mode
+            "density_values",
+            # dict keeping the grid of a display across the replots of configureEvent
+            "vtk_backend_grid_cache",
         ]
         self.numberOfPlotCalls = 0
         self.renderWindowSize = None
@@ -456,19 +476,33 @@ class VTKVCSBackend(object):
         if self.get3DPlot() is not None:
             return
 
-        sz = self.renWin.GetSize()
-        if self._lastSize == sz:
-            # We really only care about resize event
-            # this is mainly to avoid segfault vwith Vistraisl which does
-            # not catch configure Events but only modifiedEvents....
+        interactor = self.renWin.GetInteractor()
+        if ev == "ConfigureEvent" and self.resizeDelay and not self.bg and \
+                interactor is not None and interactor.GetInitialized():
+            # coalesce the events sent while a window edge is dragged
+            if self._resizeTimerInteractor is not interactor:
+                interactor.AddObserver("TimerEvent", self.resizeTimerEvent)
+                self._resizeTimerInteractor = interactor
+            elif self._resizeTimer is not None:
+                interactor.DestroyTimer(self._resizeTimer)
+            self._resizeTimer = interactor.CreateOneShotTimer(self.resizeDelay)
             return
+        self.replotForSize()
 
-        self._lastSize = sz
+    def resizeTimerEvent(self, obj, ev):
+        if self._resizeTimer is None or obj.GetTimerEventId() != self._resizeTimer:
+            return
+        self._resizeTimer = None
+        if self.renWin is not None and self._lastSize != self.renWin.GetSize():
+            self.replotForSize()
+            self.render()
+
+    def _replotArguments(self):
+        """Arguments and keywords to replot the displays of the canvas, and
+        the elements they created internally"""
         plots_args = []
         key_args = []
-
         new = {}
-        original_displays = list(self.canvas.display_names)
         for dnm in self.canvas.display_names:
             d = vcs.elements["display"][dnm]
             # displays keep a reference of objects that were internally created
@@ -496,7 +530,54 @@ class VTKVCSBackend(object):
                 key["ratio"] = d.ratio
             key["continents"] = d.continents
             key["continents_line"] = d.continents_line
+            # the cache holds the arrays themselves, ids could be reused by new arrays
+            cached = self._gridCaches.get(dnm, {}).get("arrays", ())
+            if len(cached) != len(d.array) or any(a is not c for a, c in zip(d.array, cached)):
+                self._gridCaches[dnm] = {"arrays": tuple(d.array)}
+            key["vtk_backend_grid_cache"] = self._gridCaches[dnm]
             key_args.append(key)
+        return plots_args, key_args, new
+
+    def _removeUnusedElements(self, new):
+        """Removes the elements of new (created internally by plots) that no
+        display uses anymore"""
+        for e in new:
+            if e == "display":
+                continue
+            # Loop for all types
+            for k in new[e]:
+                # Loop through all elements created internally for that type
+                if k in vcs.elements[e]:
+                    found = False
+                    # Loop through all existing displays
+                    for d in list(vcs.elements["display"].values()):
+                        if d.g_type == e and d.g_name == k:
+                            # Ok this is still in use on some display
+                            found = True
+                    # object is no longer associated with any display
+                    # and it was created internally
+                    # we can safely remove it
+                    if not found:
+                        del(vcs.elements[e][k])
+
+    def replotForSize(self):
+        """Replots the displays if the window size changed since last time.
+        The grids of the displays are reused, only what depends on the
+        size of the window is recomputed"""
+        sz = self.renWin.GetSize()
+        if self._lastSize == sz:
+            # We really only care about resize event
+            # this is mainly to avoid segfault vwith Vistraisl which does
+            # not catch configure Events but only modifiedEvents....
+            return
+
+        self._lastSize = sz
+        original_displays = list(self.canvas.display_names)
+        plots_args, key_args, new = self._replotArguments()
+        # forget the grids of the displays gone since the last resize
+        for dnm in list(self._gridCaches.keys()):
+            if dnm not in original_displays:
+                del(self._gridCaches[dnm])
 
         # Have to pull out the UI layer so it doesn't get borked by the z
         self.hideGUI()
@@ -519,26 +600,7 @@ class VTKVCSBackend(object):
             d = vcs.elements["display"][dnm]
             new = updateNewElementsDict(d, new)
 
-        # Now clean the object created internally that are no longer
-        # in use
-        for e in new:
-            if e == "display":
-                continue
-            # Loop for all types
-            for k in new[e]:
-                # Loop through all elements created internally for that type
-                if k in vcs.elements[e]:
-                    found = False
-                    # Loop through all existing displays
-                    for d in list(vcs.elements["display"].values()):
-                        if d.g_type == e and d.g_name == k:
-                            # Ok this is still in use on some display
-                            found = True
-                    # object is no longer associated with any display
-                    # and it was created internally
-                    # we can safely remove it
-                    if not found:
-                        del(vcs.elements[e][k])
+        self._removeUnusedElements(new)
 
         # Only keep original displays since we replotted on them
         for dnm in self.canvas.display_names:
@@ -580,6 +642,7 @@ class VTKVCSBackend(object):
                 self.contextView.GetScene().RemoveItem(self.popupInfoContextArea)
                 self.popupInfoContextArea = None
 
+            self.recycleContextAreas()
             self.contextView.GetScene().ClearItems()
             r, g, b = [c / 255. for c in self.canvas.backgroundcolor]
             self.contextView.GetRenderer().SetBackground(r, g, b)
@@ -596,12 +659,41 @@ class VTKVCSBackend(object):
         self.showGUI(render=False)
 
         if hasValidRenderer and self.renWin.IsDrawable() and render:
-            self.renWin.Render()
+            self.render()
         self.numberOfPlotCalls = 0
         self.logoRenderer = None
         self.createLogo()
         self._renderers = {}
 
+    def newContextArea(self, interactive=False):
+        """Adds a context area (vtkInteractiveArea if interactive) to the
+        scene and returns it, reusing one detached by clear if possible.
+
+        Callers must configure it (see vcs2vtk.configureContextArea).
+        """
+        pool = self._contextAreaPool["vtkInteractiveArea" if interactive else "vtkContextArea"]
+        if pool:
+            area = pool.pop()
+        elif interactive:
+            area = vtk.vtkInteractiveArea()
+        else:
+            area = vtk.vtkContextArea()
+        self.contextView.GetScene().AddItem(area)
+        return area
+
+    def recycleContextAreas(self, maxPooled=64):
+        """Empties the context areas of the scene and keeps (at most maxPooled
+        of each kind) for newContextArea, before the scene is cleared"""
+        scene = self.contextView.GetScene()
+        for i in range(scene.GetNumberOfItems()):
+            item = scene.GetItem(i)
+            if item is self.logoContextArea or item is self.popupInfoContextArea:
+                continue
+            pool = self._contextAreaPool.get(item.GetClassName())
+            if pool is not None and len(pool) < maxPooled:
+                item.GetDrawAreaItem().ClearItems()
+                pool.append(item)
+
     def createDefaultInteractor(self, ren=None):
         # defaultInteractor = self.renWin.GetInteractor()
         defaultInteractor = self.contextView.GetInteractor()
@@ -654,7 +746,7 @@ class VTKVCSBackend(object):
             self.renWin.SetOffScreenRendering(True)
 
         if "open" in kargs and kargs["open"]:
-            self.renWin.Render()
+            self.render()
 
     def createRenderer(self, *args, **kargs):
         if not self.renderer:
@@ -663,6 +755,8 @@ class VTKVCSBackend(object):
 
     def update(self, *args, **kargs):
         self._lastSize = None
+        # data may have changed in place, recompute the grids
+        self._gridCaches = {}
         if self.renWin:
             if self.get3DPlot():
                 plots_args = []
@@ -825,7 +919,29 @@ class VTKVCSBackend(object):
 
     def flush(self):
         if self.renWin is not None:
-            self.renWin.Render()
+            self.render(force=True)
+
+    def render(self, force=False):
+        """Renders the window, unless in a deferRender block (and not forced)
+        where it is only rendered when the block exits"""
+        if self._deferRender and not force:
+            self._renderPending = True
+            return
+        self._renderPending = False
+        self.numberOfRenders += 1
+        self.renWin.Render()
+
+    @contextlib.contextmanager
+    def deferRender(self):
+        """Within the block, render() only records that the window needs
+        rendering, the outermost block renders it once when exiting"""
+        self._deferRender += 1
+        try:
+            yield
+        finally:
+            self._deferRender -= 1
+            if not self._deferRender and self._renderPending and self.renWin is not None:
+                self.render()
 
     def plot(self, data1, data2, template, gtype, gname, bg, *args, **kargs):
         self.numberOfPlotCalls += 1
@@ -841,6 +957,7 @@ class VTKVCSBackend(object):
             self.renWin.SetOffScreenRendering(True)
         self.cell_coordinates = kargs.get('cell_coordinates', None)
         self.canvas.initLogoDrawing()
+        to = None
         if gtype == "text":
             tt, to = gname.split(":::")
             tt = vcs.elements["texttable"][tt]
@@ -879,7 +996,69 @@ class VTKVCSBackend(object):
                 gm.addPlotAttribute('filename', cdms_file)
                 gm.addPlotAttribute('url', cdms_file)
             returned.update(self.plot3D(data1, data2, tpl, gm, ren, **kargs))
-        elif gtype in ["text"]:
+        elif gtype in ["text", "line", "marker", "fillarea"]:
+            returned.update(self._renderPrimitive(gtype, gm, to, bounds, vtk_backend_geo, **kargs))
+        else:
+            raise Exception(
+                "Graphic type: '%s' not re-implemented yet" %
+                gtype)
+        self.scaleLogo()
+
+        if not kargs.get("donotstoredisplay", False) and kargs.get(
+                "render", True):
+            self.render()
+
+        return returned
+
+    def plotPrimitive(self, primitive, bg=False, **kargs):
+        """Renders a line, marker, fillarea or text object straight away.
+
+        Unlike plot() this does not look the object up in vcs.elements, so
+        it accepts the anonymous primitives from vcs.primitives, and it
+        never creates a display.
+        """
+        self.numberOfPlotCalls += 1
+        if self.bg is None:
+            self.bg = bool(bg)
+        self.createRenWin(**kargs)
+        if self.bg:
+            self.renWin.SetOffScreenRendering(True)
+        to = None
+        if vcs.istext(primitive):
+            gtype = "text"
+            to = primitive.To
+            primitive = primitive.Tt
+        elif vcs.isline(primitive):
+            gtype = "line"
+        elif vcs.ismarker(primitive):
+            gtype = "marker"
+        else:
+            gtype = "fillarea"
+        bounds = kargs.get("vtk_dataset_bounds_no_mask", None) or None
+        return self._renderPrimitive(gtype, primitive, to, bounds,
+                                     kargs.get("vtk_backend_geo", None),
+                                     batch=self._primitiveBatch, **kargs)
+
+    @contextlib.contextmanager
+    def primitiveBatch(self):
+        """Within the block, the primitives drawn by plotPrimitive share
+        context areas, and lines and texts are merged into a few context
+        items (see vcs2vtk.PrimitiveBatch), the lines are added when the
+        outermost block exits"""
+        if self._primitiveBatch is not None:
+            yield self._primitiveBatch
+            return
+        batch = self._primitiveBatch = vcs2vtk.PrimitiveBatch(self)
+        try:
+            yield batch
+        finally:
+            self._primitiveBatch = None
+            batch.flush()
+
+    def _renderPrimitive(self, gtype, gm, to, bounds, vtk_backend_geo, batch=None, **kargs):
+        returned = {}
+        tt = gm
+        if gtype == "text":
             if tt.priority != 0:
                 # FIXME: May eventually want to use this key to store the context
                 # FIXME: area we create so that we don't have to recompute the projected
@@ -898,44 +1077,42 @@ class VTKVCSBackend(object):
                         if all([not math.isinf(b) for b in newbounds]):
                             bounds = newbounds
 
-                view = self.contextView
-
-                area = vtk.vtkContextArea()
-                view.GetScene().AddItem(area)
-
                 vp = self.canvas._viewport
-                wc = self.canvas._worldcoordinate
+                textItem = None
+                if batch is not None:
+                    area, textItem = batch.textArea(vp)
+                else:
+                    area = self.newContextArea()
 
-                [renWinWidth, renWinHeight] = self.renWin.GetSize()
-                geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
-                                    int(round(vp[2] * renWinHeight)),
-                                    int(round((vp[1] - vp[0]) * renWinWidth)),
-                                    int(round((vp[3] - vp[2]) * renWinHeight)))
+                    [renWinWidth, renWinHeight] = self.renWin.GetSize()
+                    geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
+                                        int(round(vp[2] * renWinHeight)),
+                                        int(round((vp[1] - vp[0]) * renWinWidth)),
+                                        int(round((vp[3] - vp[2]) * renWinHeight)))
 
-                rect = vtk.vtkRectd(0.0, 0.0, float(
-                    renWinWidth), float(renWinHeight))
+                    rect = vtk.vtkRectd(0.0, 0.0, float(
+                        renWinWidth), float(renWinHeight))
 
-                vcs2vtk.configureContextArea(area, rect, geom)
+                    vcs2vtk.configureContextArea(area, rect, geom)
 
                 returned["vtk_backend_text_actors"] = vcs2vtk.genTextActor(
                     area,
                     to=to,
                     tt=tt,
-                    cmap=self.canvas.colormap, geoBounds=bounds, geo=vtk_backend_geo)
+                    cmap=self.canvas.colormap, geoBounds=bounds, geo=vtk_backend_geo,
+                    textItem=textItem)
         elif gtype == "line":
             if gm.priority != 0:
-                vcs2vtk.prepLine(self, gm, geoBounds=bounds,
-                                 cmap=self.canvas.colormap)
+                if batch is not None:
+                    batch.line(gm, cmap=self.canvas.colormap)
+                else:
+                    vcs2vtk.prepLine(self, gm, geoBounds=bounds,
+                                     cmap=self.canvas.colormap)
                 # FIXME: we may need to keeep track of the context items generated here
                 # returned["vtk_backend_line_actors"] = actors
 
         elif gtype == "marker":
             if gm.priority != 0:
-                view = self.contextView
-
-                area = vtk.vtkContextArea()
-                view.GetScene().AddItem(area)
-
                 vp = gm.viewport
                 wc = gm.worldcoordinate
 
@@ -956,7 +1133,7 @@ class VTKVCSBackend(object):
 
                 rect = vtk.vtkRectd(
                     newWc[0], newWc[2], newWc[1] - newWc[0], newWc[3] - newWc[2])
-                vcs2vtk.configureContextArea(area, rect, geom)
+                area = vcs2vtk.contextArea(self, rect, geom, batch, gm.priority)
 
                 actors = vcs2vtk.prepMarker(gm, [geom[2], geom[3]], scale=[
                                             xScale, yScale], cmap=self.canvas.colormap)
@@ -975,18 +1152,8 @@ class VTKVCSBackend(object):
         elif gtype == "fillarea":
             if gm.priority != 0:
                 actors = vcs2vtk.prepFillarea(self, self.renWin, gm,
-                                              cmap=self.canvas.colormap)
+                                              cmap=self.canvas.colormap, batch=batch)
                 returned["vtk_backend_fillarea_actors"] = actors
-        else:
-            raise Exception(
-                "Graphic type: '%s' not re-implemented yet" %
-                gtype)
-        self.scaleLogo()
-
-        if not kargs.get("donotstoredisplay", False) and kargs.get(
-                "render", True):
-            self.renWin.Render()
-
         return returned
 
     def setLayer(self, renderer, priority):
@@ -1043,7 +1210,16 @@ class VTKVCSBackend(object):
             'xaxisconvert', 'linear')]['forward']
         yforward = vcs.utils.axisConvertFunctions[kargs.get(
             'yaxisconvert', 'linear')]['forward']
-        contData = vcs2vtk.prepContinents(continents_path, xforward, yforward)
+        [renWinWidth, renWinHeight] = self.renWin.GetSize()
+        geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
+                            int(round(vp[2] * renWinHeight)),
+                            int(round((vp[1] - vp[0]) * renWinWidth)),
+                            int(round((vp[3] - vp[2]) * renWinHeight)))
+        # simplify outlines by less than a pixel, small panels need a fraction of the points
+        pixel = min(abs(wc[1] - wc[0]) / max(geom.GetWidth(), 1),
+                    abs(wc[3] - wc[2]) / max(geom.GetHeight(), 1))
+        contData = vcs2vtk.prepContinents(continents_path, xforward, yforward,
+                                          tolerance=vcs2vtk.CONTINENTS_TOLERANCE * pixel)
         contData = vcs2vtk.doWrapData(contData, wc, fastClip=False)
 
         if projection.type != "linear":
@@ -1070,18 +1246,9 @@ class VTKVCSBackend(object):
         color = [int((c / 100.0) * 255) for c in color]
 
         # view and interactive area
-        view = self.contextView
         contBounds = kargs.get("vtk_backend_draw_area_bounds", None)
 
-        area = vtk.vtkContextArea()
-        view.GetScene().AddItem(area)
-
-        [renWinWidth, renWinHeight] = self.renWin.GetSize()
-        geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
-                            int(round(vp[2] * renWinHeight)),
-                            int(round((vp[1] - vp[0]) * renWinWidth)),
-                            int(round((vp[3] - vp[2]) * renWinHeight)))
-
+        area = self.newContextArea()
         vcs2vtk.configureContextArea(area, contBounds, geom)
 
         color_arr = vtk.vtkUnsignedCharArray()
@@ -1119,10 +1286,7 @@ class VTKVCSBackend(object):
     def renderTemplate(self, tmpl, data, gm, taxis,
                        zaxis, X=None, Y=None, **kargs):
         # view and interactive area
-        view = self.contextView
-
-        area = vtk.vtkContextArea()
-        view.GetScene().AddItem(area)
+        area = self.newContextArea()
 
         vp = self.canvas._viewport
 
@@ -1140,14 +1304,15 @@ class VTKVCSBackend(object):
         # because we need to return actors for min/max/mean
         kargs["taxis"] = taxis
         kargs["zaxis"] = zaxis
-        displays = tmpl.plot(
-            self.canvas,
-            data,
-            gm,
-            bg=self.bg,
-            X=X,
-            Y=Y,
-            **kargs)
+        with self.primitiveBatch():
+            displays = tmpl.plot(
+                self.canvas,
+                data,
+                gm,
+                bg=self.bg,
+                X=X,
+                Y=Y,
+                **kargs)
         returned = {}
         for d in displays:
             if d is None:
@@ -1251,17 +1416,18 @@ class VTKVCSBackend(object):
                        style=['solid'], index=[1], opacity=[],
                        pixelspacing=[15, 15], pixelscale=12):
         if tmpl.legend.priority > 0:
-            tmpl.drawColorBar(
-                colors,
-                levels,
-                x=self.canvas,
-                legend=legend,
-                cmap=cmap,
-                style=style,
-                index=index,
-                opacity=opacity,
-                pixelspacing=pixelspacing,
-                pixelscale=pixelscale)
+            with self.primitiveBatch():
+                tmpl.drawColorBar(
+                    colors,
+                    levels,
+                    x=self.canvas,
+                    legend=legend,
+                    cmap=cmap,
+                    style=style,
+                    index=index,
+                    opacity=opacity,
+                    pixelspacing=pixelspacing,
+                    pixelscale=pixelscale)
         return {}
 
     def put_png_on_canvas(
@@ -1326,10 +1492,7 @@ class VTKVCSBackend(object):
         ctx2dxOff = (canCx - imgCx) + (xoff * ctx2dScale)
         ctx2dyOff = (canCy - imgCy) + (yoff * ctx2dScale)
 
-        view = self.contextView
-
-        area = vtk.vtkContextArea()
-        view.GetScene().AddItem(area)
+        area = self.newContextArea()
 
         screenGeom = vtk.vtkRecti(0, 0, winSize[0], winSize[1])
         dataBounds = vtk.vtkRectd(0.0, 0.0, winSize[0], winSize[1])
@@ -1342,7 +1505,7 @@ class VTKVCSBackend(object):
         area.GetDrawAreaItem().AddItem(item)
 
         self.showGUI(render=False)
-        self.renWin.Render()
+        self.render()
         return
 
     def hideGUI(self):
@@ -1373,7 +1536,7 @@ class VTKVCSBackend(object):
                 # Bring the manager's renderer to the top of the stack
                 manager.elevate()
             if render:
-                self.renWin.Render()
+                self.render()
 
     def get3DPlot(self):
         from .dv3d import Gfdv3d
@@ -1497,7 +1660,7 @@ x.geometry(1200,800)
             imgfiltr.SetInputBufferTypeToRGBA()
 
         self.hideGUI()
-        self.renWin.Render()
+        self.render(force=True)
         self.showGUI(render=False)
 
         writer = vtk.vtkPNGWriter()
@@ -1513,7 +1676,7 @@ x.geometry(1200,800)
         if user_dims is not None:
             self.canvas.width, self.canvas.height = user_dims
             self.setsize(self.canvas.width, self.canvas.height)
-            self.renWin.Render()
+            self.render()
 
     def cgm(self, file):
         if self.renWin is None:
@@ -1876,7 +2039,7 @@ x.geometry(1200,800)
                             t.SetInput("%g" % tmp_l[0])
 
         if update:
-            self.renWin.Render()
+            self.render()
 
     def png_dimensions(self, path):
         reader = vtk.vtkPNGReader()
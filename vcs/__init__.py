@@ -48,12 +48,24 @@ model for defining a plot, that is decomposed into three parts:
 """
 import warnings
 import difflib
-import pkg_resources
-vcs_egg_path = pkg_resources.resource_filename(pkg_resources.Requirement.parse("vcs"), "share/vcs")
+import os
+import sys
+from . import bulkupdate
+from . import copyonwrite
+# data_files install to <prefix>/share/vcs, importing pkg_resources is slow so only ask it otherwise
+vcs_egg_path = os.path.join(sys.prefix, "share", "vcs")
+if not os.path.exists(os.path.join(vcs_egg_path, "initial.attributes")):
+    import pkg_resources
+    vcs_egg_path = pkg_resources.resource_filename(pkg_resources.Requirement.parse("vcs"), "share/vcs")
 
 
 class bestMatch(object):
     def __setattr__(self, a, v):
+        if copyonwrite._sharers and id(self) in copyonwrite._sharers:
+            # copies sharing this object keep its current state
+            copyonwrite.detach(self)
+        if bulkupdate._pending and a[:1] != "_" and bulkupdate.queue(self, a, v):
+            return
         try:
             prop = getattr(self.__class__, a)
             isprop = isinstance(prop, property)
@@ -86,6 +98,43 @@ class bestMatch(object):
                     (self.__class__.__name__, a, repr(
                         self.__slots__)))
 
+    def update(self, **attributes):
+        """Sets all attributes at once.
+
+        Values identical to the current ones are not validated again,
+        if any value is invalid none of them is set.
+
+        :Example:
+
+            .. doctest:: bestMatch_update
+
+                >>> b = vcs.createboxfill()
+                >>> b = b.update(level_1=0., level_2=100., color_1=16, color_2=239)
+
+        :returns: The object itself
+        """
+        return bulkupdate.update(self, attributes)
+
+    def bulk_update(self):
+        """Context manager queuing the attributes set in its block and
+        setting them at once (see :py:meth:`update`) when it exits.
+
+        Inside the block, reading an attribute still returns its previous value.
+
+        :Example:
+
+            .. doctest:: bestMatch_bulk_update
+
+                >>> b = vcs.createboxfill()
+                >>> with b.bulk_update():
+                ...     b.level_1 = 0.
+                ...     b.level_2 = 100.
+        """
+        return bulkupdate.bulk(self)
+
+    def __copy__(self):
+        return bulkupdate.shallowCopy(self)
+
 
 class VCSDeprecationWarning(DeprecationWarning):
     pass
@@ -111,6 +160,11 @@ from .queries import *  # noqa
 from . import install_vcs  # noqa
 import os  # noqa
 from .manageElements import *  # noqa
+from . import primitives  # noqa
+from . import journal  # noqa
+from . import elementgc  # noqa
+from .elementgc import set_element_gc, collect_elements, element_report  # noqa
+from .canvaspool import CanvasPool  # noqa
 import collections  # noqa
 
 _colorMap = "viridis"
@@ -132,35 +186,35 @@ install_vcs._files()
 #
 
 elements = collections.OrderedDict()
-elements["list"] = {}
-elements["projection"] = {}
-elements["texttable"] = {}
-elements["textorientation"] = {}
-elements["textcombined"] = {}
-elements["line"] = {}
-elements["marker"] = {}
-elements["fillarea"] = {}
-elements["font"] = {}
-elements["fontNumber"] = {}
-elements["boxfill"] = {}
-elements["isofill"] = {}
-elements["isoline"] = {}
-elements["meshfill"] = {}
-elements["3d_scalar"] = {}
-elements["3d_dual_scalar"] = {}
-elements["3d_vector"] = {}
-elements["template"] = {}
-elements["taylordiagram"] = {}
-elements["1d"] = {}
-elements["vector"] = {}
-elements["streamline"] = {}
-elements["yxvsx"] = {}
-elements["xyvsy"] = {}
-elements["xvsy"] = {}
-elements["scatter"] = {}
-elements["colormap"] = {}
-elements["display"] = {}
-elements["format"] = {}
+elements["list"] = journal.ElementsDict("list")
+elements["projection"] = journal.ElementsDict("projection")
+elements["texttable"] = journal.ElementsDict("texttable")
+elements["textorientation"] = journal.ElementsDict("textorientation")
+elements["textcombined"] = journal.ElementsDict("textcombined")
+elements["line"] = journal.ElementsDict("line")
+elements["marker"] = journal.ElementsDict("marker")
+elements["fillarea"] = journal.ElementsDict("fillarea")
+elements["font"] = journal.ElementsDict("font")
+elements["fontNumber"] = journal.ElementsDict("fontNumber")
+elements["boxfill"] = journal.ElementsDict("boxfill")
+elements["isofill"] = journal.ElementsDict("isofill")
+elements["isoline"] = journal.ElementsDict("isoline")
+elements["meshfill"] = journal.ElementsDict("meshfill")
+elements["3d_scalar"] = journal.ElementsDict("3d_scalar")
+elements["3d_dual_scalar"] = journal.ElementsDict("3d_dual_scalar")
+elements["3d_vector"] = journal.ElementsDict("3d_vector")
+elements["template"] = journal.ElementsDict("template")
+elements["taylordiagram"] = journal.ElementsDict("taylordiagram")
+elements["1d"] = journal.ElementsDict("1d")
+elements["vector"] = journal.ElementsDict("vector")
+elements["streamline"] = journal.ElementsDict("streamline")
+elements["yxvsx"] = journal.ElementsDict("yxvsx")
+elements["xyvsy"] = journal.ElementsDict("xyvsy")
+elements["xvsy"] = journal.ElementsDict("xvsy")
+elements["scatter"] = journal.ElementsDict("scatter")
+elements["colormap"] = journal.ElementsDict("colormap")
+elements["display"] = journal.ElementsDict("display")
+elements["format"] = journal.ElementsDict("format")
 
 _protected_elements = {}
 for k in list(elements.keys()):
@@ -320,17 +374,22 @@ t = taylor.Gtd("default")
 
 
 pth = [vcs_egg_path, 'initial.attributes']
+_dotdir, _dotdirenv = vcs.getdotdirectory()
+# Binary snapshot of the built-in attributes, skips parsing/validating on next import
+_snapshot = os.path.join(
+    os.environ.get(_dotdirenv, os.path.join(os.path.expanduser("~"), _dotdir)),
+    'initial.attributes.snapshot')
 try:
-    vcs.scriptrun(os.path.join(*pth))
+    # built-in elements are created on first use
+    vcs.scriptrun(os.path.join(*pth), snapshot=_snapshot, lazy=True)
 except BaseException:
     pass
 
 for typ in list(elements.keys()):
     elts = elements[typ]
-    for k in vcs.listelements(typ):  # let's save which elements should be saved and untouched
-        _protected_elements[typ].add(k)
+    # let's save which elements should be saved and untouched (without materializing lazy ones)
+    _protected_elements[typ].update(elts.names())
 
-_dotdir, _dotdirenv = vcs.getdotdirectory()
 user_init = os.path.join(
     os.path.expanduser("~"),
     _dotdir,
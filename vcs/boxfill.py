@@ -400,7 +400,7 @@ class Gfb(vcs.bestMatch):
         if newname == "default":
             raise Exception(
                 "You cannot overwrite the default boxfill graphic method")
-        if newname in list(vcs.elements["boxfill"].keys()):
+        if newname in vcs.elements["boxfill"]:
             raise Exception(
                 "Sorry %s boxfill graphic method already exists" %
                 newname)
@@ -466,7 +466,7 @@ class Gfb(vcs.bestMatch):
             Gfb_name_src = Gfb_name_src.name
         if Gfb_name == "default" and Gfb_name_src != "default":
             raise Exception("You can not alter the 'default' boxfill method")
-        if Gfb_name in list(vcs.elements["boxfill"].keys()):
+        if Gfb_name in vcs.elements["boxfill"]:
             raise Exception(
                 "Error boxfill method '%s' already exists" %
                 Gfb_name)
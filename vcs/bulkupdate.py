@@ -0,0 +1,177 @@
+"""
+Bulk attribute updates
+
+Every attribute assignment on a vcs object goes through its validating
+property. Setting many attributes one at a time validates (and possibly
+fails) one at a time, and copying an object attribute by attribute validates
+values that are known to be valid already.
+
+:py:func:`update` (``obj.update(**attributes)``) and :py:func:`bulk`
+(``with obj.bulk_update():``) set a whole set of attributes in one step:
+values identical to the current ones are not validated again, the others go
+through the setters, whose number and color checks accept plain
+``int``/``float`` values by type before trying any conversion. If any value
+is invalid none of them is applied. :py:func:`copyAttributes` and
+:py:func:`shallowCopy` are the trusted, validation free, paths used to copy
+objects (``createX(source=...)``, ``copy.copy``).
+"""
+import contextlib
+
+# id(obj) -> attributes queued while obj is in a bulk_update() block
+_pending = {}
+
+_SCALARS = (bool, int, float, str, type(None))
+
+
+def _slots(cls):
+    slots = []
+    for klass in cls.__mro__:
+        s = getattr(klass, "__slots__", ())
+        if isinstance(s, str):
+            s = (s,)
+        slots.extend(s)
+    return slots
+
+
+def _same(current, value):
+    """Is value identical to current, compared by type first"""
+    if current is value:
+        return True
+    t = type(value)
+    if t is not type(current):
+        return False
+    if t in _SCALARS:
+        return current == value
+    if t is list or t is tuple:
+        if len(current) != len(value):
+            return False
+        for c, v in zip(current, value):
+            if not _same(c, v):
+                return False
+        return True
+    return False
+
+
+def _unchanged(obj, name, value):
+    """Is setting name to value a no op (stored value is the same)"""
+    try:
+        current = getattr(obj, "_" + name)
+    except AttributeError:
+        return False
+    return _same(current, value)
+
+
+def _state(obj):
+    state = {}
+    for slot in _slots(type(obj)):
+        try:
+            state[slot] = getattr(obj, slot)
+        except AttributeError:
+            pass
+    return state, dict(getattr(obj, "__dict__", {}))
+
+
+def _restore(obj, state):
+    slots, dct = state
+    for slot, value in slots.items():
+        object.__setattr__(obj, slot, value)
+    if hasattr(obj, "__dict__"):
+        obj.__dict__.clear()
+        obj.__dict__.update(dct)
+
+
+def update(obj, attributes):
+    """Validates and sets attributes on obj, all of them or none"""
+    todo = [(k, v) for k, v in attributes.items() if not _unchanged(obj, k, v)]
+    if not todo:
+        return obj
+    state = _state(obj)
+    try:
+        for k, v in todo:
+            setattr(obj, k, v)
+    except Exception:
+        _restore(obj, state)
+        raise
+    return obj
+
+
+@contextlib.contextmanager
+def bulk(obj):
+    """Queues the public attributes set on obj in the block, applies them
+    with :py:func:`update` when the block exits without error"""
+    key = id(obj)
+    if key in _pending:
+        # nested block, the outermost one applies
+        yield obj
+        return
+    _pending[key] = {}
+    try:
+        yield obj
+    finally:
+        queued = _pending.pop(key)
+    update(obj, queued)
+
+
+def queue(obj, name, value):
+    """Queues name if obj is in a bulk_update() block, returns True if it did"""
+    queued = _pending.get(id(obj))
+    if queued is None:
+        return False
+    queued[name] = value
+    return True
+
+
+def _copyValue(value):
+    if isinstance(value, list):
+        return [_copyValue(v) for v in value]
+    elif isinstance(value, dict):
+        return dict((k, _copyValue(v)) for k, v in value.items())
+    return value
+
+
+def _hasTuple(value):
+    """Does value hold a tuple, which the attributes setters store as a list"""
+    t = type(value)
+    if t is tuple:
+        return True
+    if t is list:
+        for v in value:
+            if _hasTuple(v):
+                return True
+    return False
+
+
+def copyAttributes(obj, src, names, copy_function=None):
+    """Copies the stored value of names from src to obj without validation.
+
+    src values are valid already, lists and dictionaries are copied so that
+    obj and src do not share them, copy_function (if given) is used instead.
+    Values holding tuples (e.g. colors given by name) go through the attribute
+    setter, so that obj stores the same lists a validated copy would.
+    """
+    if copy_function is None:
+        copy_function = _copyValue
+    cls = type(obj)
+    for name in names:
+        value = getattr(src, "_" + name)
+        if _hasTuple(value):
+            getattr(cls, name).fset(obj, value)
+        else:
+            object.__setattr__(obj, "_" + name, copy_function(value))
+    return obj
+
+
+def shallowCopy(obj):
+    """Same as copy.copy(obj) without going through the attribute checks"""
+    cls = type(obj)
+    new = cls.__new__(cls)
+    for slot in _slots(cls):
+        if slot in ("__dict__", "__weakref__"):
+            continue
+        try:
+            object.__setattr__(new, slot, getattr(obj, slot))
+        except AttributeError:
+            pass
+    if hasattr(obj, "__dict__"):
+        new.__dict__.update(obj.__dict__)
+    return new
@@ -0,0 +1,175 @@
+"""
+Pool of reusable canvases
+
+Creating a canvas sets up a backend, a render window and its context view,
+which is costly for services rendering one image per request.
+:py:class:`CanvasPool` keeps up to ``size`` canvases around: a thread checks
+one out, renders with it and checks it back in, the pool then resets it
+(displays, animation, colormap, background color, ...) for the next user.
+
+A checked out canvas belongs to the thread that checked it out until it is
+checked in, rendering with a canvas is never shared between threads.
+
+:Example:
+
+    .. doctest:: canvaspool
+
+        >>> pool = vcs.CanvasPool(2, geometry=(800, 600))
+        >>> with pool.canvas() as x:
+        ...     x.plot([range(10) for _ in range(10)], "default", "boxfill")
+        ...     x.png("image")
+        <vcs.displayplot.Dp ...>
+        >>> pool.close()
+"""
+import contextlib
+import copy
+import threading
+import vcs
+from .error import vcsError
+
+# Canvas attributes restored on checkin, to their value when the pool created the canvas
+_STATE = ("colormap", "backgroundcolor", "logo_transparentcolor", "drawLogo", "enableLogo",
+          "viewport", "worldcoordinate", "ratio", "mode")
+
+
+class CanvasPool(object):
+    """Pool of at most size canvases, created on demand by vcs.init.
+
+    :param size: Maximum number of canvases in the pool
+    :param geometry: Size (in pixels) of the canvases
+    :param bg: Render in background mode (without displaying windows)
+    :param debug: Verify that canvases are reset when checked in
+    :type size: int
+    :type geometry: dict or tuple
+    :type bg: bool
+    :type debug: bool
+    """
+
+    def __init__(self, size, geometry=None, bg=True, debug=False, **kargs):
+        if not isinstance(size, int) or size < 1:
+            raise ValueError("CanvasPool size must be a positive integer, got %s" % repr(size))
+        self.size = size
+        self.debug = debug
+        self._init_args = dict(kargs, geometry=geometry, bg=bg)
+        self._condition = threading.Condition()
+        self._idle = []
+        # id(canvas) -> [canvas, state when created, checked out]
+        self._canvases = {}
+        self._creating = 0
+        self._closed = False
+
+    def _new(self):
+        canvas = vcs.init(**self._init_args)
+        state = dict((a, copy.deepcopy(getattr(canvas, a))) for a in _STATE)
+        return canvas, state
+
+    def checkout(self, timeout=None):
+        """Returns an idle canvas, creating it if the pool is not full yet.
+
+        Waits for another thread to check one in if all of them are in use.
+
+        :param timeout: Maximum number of seconds to wait, None waits forever
+        :type timeout: float
+        :raises RuntimeError: If no canvas was available before timeout
+        :rtype: vcs.Canvas.Canvas
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("CanvasPool is closed")
+                if self._idle:
+                    canvas = self._idle.pop()
+                    self._canvases[id(canvas)][2] = True
+                    return canvas
+                if len(self._canvases) + self._creating < self.size:
+                    self._creating += 1
+                    break
+                if not self._condition.wait(timeout):
+                    raise RuntimeError("No canvas checked in within %s seconds" % timeout)
+        # slow, let other threads check canvases in and out meanwhile
+        try:
+            canvas, state = self._new()
+        finally:
+            with self._condition:
+                self._creating -= 1
+                self._condition.notify()
+        with self._condition:
+            self._canvases[id(canvas)] = [canvas, state, True]
+        return canvas
+
+    def checkin(self, canvas):
+        """Resets canvas and makes it available to checkout again
+
+        If resetting (or verifying, in debug mode) fails the canvas is closed
+        and removed from the pool, then the error is raised.
+
+        :param canvas: A canvas obtained from checkout
+        :type canvas: vcs.Canvas.Canvas
+        """
+        with self._condition:
+            entry = self._canvases.get(id(canvas))
+            if entry is None or entry[0] is not canvas:
+                raise ValueError("Canvas does not belong to this CanvasPool")
+            if not entry[2]:
+                raise ValueError("Canvas is already checked in")
+        reset = False
+        try:
+            self.reset(canvas, entry[1])
+            reset = True
+        finally:
+            with self._condition:
+                entry[2] = False
+                # a canvas that failed to reset is dropped, its slot is freed
+                drop = self._closed or not reset
+                if drop:
+                    del(self._canvases[id(canvas)])
+                else:
+                    self._idle.append(canvas)
+                self._condition.notify()
+            if drop:
+                canvas.close()
+
+    @contextlib.contextmanager
+    def canvas(self, timeout=None):
+        """Context manager checking a canvas out, and back in when its block exits"""
+        canvas = self.checkout(timeout)
+        try:
+            yield canvas
+        finally:
+            self.checkin(canvas)
+
+    def reset(self, canvas, state):
+        """Clears canvas and restores the attributes in state"""
+        for a, v in state.items():
+            setattr(canvas, a, copy.deepcopy(v))
+        # after the attributes, clear paints the background with the restored color
+        canvas.clear()
+        if self.debug:
+            self.verify(canvas, state)
+
+    def verify(self, canvas, state):
+        """Raises vcsError if canvas was not reset to state"""
+        problems = []
+        if canvas.display_names:
+            problems.append("displays %s" % canvas.display_names)
+        if canvas.animate_info or canvas.animate.created():
+            problems.append("animation")
+        for a, v in state.items():
+            if getattr(canvas, a) != v:
+                problems.append("%s=%s (expected %s)" % (a, repr(getattr(canvas, a)), repr(v)))
+        if problems:
+            raise vcsError("Canvas %s was not reset: %s" % (canvas.canvasid(), ", ".join(problems)))
+
+    def close(self):
+        """Closes the idle canvases, the ones in use are closed when checked in"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for canvas in idle:
+                del(self._canvases[id(canvas)])
+            self._condition.notify_all()
+        for canvas in idle:
+            canvas.close()
+
+    def __len__(self):
+        return len(self._canvases)
@@ -37,10 +37,16 @@ try:
     from collections import UserDict
 except Exception:
     from UserDict import UserDict
+import itertools
+import numpy
 import vcs
 import copy
 from . import xmldocs
 
+# Every modification of a colormap gets a new stamp, caches built from a
+# colormap (RGBA array, VTK lookup tables) are keyed on it
+_stamps = itertools.count(1)
+
 
 def process_src(nm, code):
     numbers = eval(code)
@@ -53,8 +59,99 @@ def process_src(nm, code):
     cp.index.data.update(d)
 
 
+def _isCellIndex(key):
+    try:
+        return 0 <= key <= 255 and key == int(key)
+    except (TypeError, ValueError):
+        return False
+
+
+class ColorCell(list):
+    """A cell of ColorCells, modifying it in place stamps the ColorCells"""
+    __slots__ = ("_cells",)
+
+    def __init__(self, cells, value=()):
+        super(ColorCell, self).__init__(value)
+        self._cells = cells
+
+
+def _stamping(name):
+    method = getattr(list, name)
+
+    def modify(self, *args, **kargs):
+        result = method(self, *args, **kargs)
+        # not set yet while unpickling
+        cells = getattr(self, "_cells", None)
+        if cells is not None:
+            cells._modified()
+        return result
+    modify.__name__ = name
+    return modify
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "reverse", "sort"):
+    setattr(ColorCell, _name, _stamping(_name))
+
+
+class ColorCells(dict):
+    """dict of the colormap cells, stamped every time it or one of its cells
+    is modified"""
+
+    def __init__(self, *args, **kargs):
+        super(ColorCells, self).__init__(*args, **kargs)
+        self._wrap()
+        self.stamp = next(_stamps)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # stamps are only unique within a session
+        self._modified()
+
+    def _modified(self):
+        self.stamp = next(_stamps)
+
+    def _cell(self, value):
+        if isinstance(value, (list, tuple)) and getattr(value, "_cells", None) is not self:
+            value = ColorCell(self, value)
+        return value
+
+    def _wrap(self):
+        for key, value in dict.items(self):
+            dict.__setitem__(self, key, self._cell(value))
+
+    def __setitem__(self, key, value):
+        super(ColorCells, self).__setitem__(key, self._cell(value))
+        self._modified()
+
+    def __delitem__(self, key):
+        super(ColorCells, self).__delitem__(key)
+        self._modified()
+
+    def update(self, *args, **kargs):
+        super(ColorCells, self).update(*args, **kargs)
+        self._wrap()
+        self._modified()
+
+    def pop(self, *args):
+        self._modified()
+        return super(ColorCells, self).pop(*args)
+
+    def popitem(self):
+        self._modified()
+        return super(ColorCells, self).popitem()
+
+    def setdefault(self, key, default=None):
+        self._modified()
+        return super(ColorCells, self).setdefault(key, self._cell(default))
+
+    def clear(self):
+        super(ColorCells, self).clear()
+        self._modified()
+
+
 class RGB_Table(UserDict):
-    __slots__ = ["data", ]
+    __slots__ = ["data", "_array"]
 
     def __init__(self, name, dict=None):
         self.data = {
@@ -144,7 +241,8 @@ class RGB_Table(UserDict):
                 249: [93, 89, 10, 100], 250: [94, 89, 11, 100], 251: [95, 90, 11, 100],
                 252: [96, 90, 12, 100], 253: [97, 90, 13, 100], 254: [98, 90, 13, 100],
                 255: [99, 90, 14, 100]}
-
+        self.data = ColorCells(self.data)
+        self._array = None
         self.name = name
         if dict is not None:
             self.update(dict)
@@ -152,7 +250,7 @@ class RGB_Table(UserDict):
     def __setitem__(self, key, value):
         if (self.name == 'default'):
             raise ValueError('You cannot modify the default colormap.')
-        if (key not in list(range(0, 256))):
+        if not _isCellIndex(key):
             raise ValueError('Cell index must be in the range 0 to 255.')
         if isinstance(value, (list, tuple)):
             value = list(value)
@@ -170,9 +268,40 @@ class RGB_Table(UserDict):
         self.data[key] = value
 
     def __getitem__(self, key):
-        if (key not in list(range(0, 256))):
+        if not _isCellIndex(key):
             raise ValueError('Cell index must be in the range 0 to 255.')
         return self.data[key]
+
+    @property
+    def stamp(self):
+        """Changes every time a cell is modified"""
+        return self.data.stamp
+
+    def array(self):
+        """The cells as a read only (256, 4) float array of 0-100 RGBA values.
+
+        Missing cells are NaN. Built once per modification of the colormap,
+        cells modified in place (``cmap.index[i][0] = 50``) included.
+        """
+        cached = getattr(self, "_array", None)
+        if cached is None or cached[0] != self.data.stamp:
+            array = numpy.empty((256, 4))
+            array.fill(numpy.nan)
+            for i, v in self.data.items():
+                array[int(i), :len(v)] = v
+                if len(v) == 3:
+                    array[int(i), 3] = 100.
+            array.flags.writeable = False
+            self._array = (self.data.stamp, array)
+        return self._array[1]
+
+    def nearest(self, r, g, b):
+        """Index of the cell closest to the (0-100) r, g, b color"""
+        rgb = self.array()[:, :3]
+        distances = ((rgb - (r, g, b)) ** 2).sum(axis=1)
+        if numpy.isnan(distances).all():
+            return None
+        return int(numpy.nanargmin(distances))
 #
 #
 #############################################################################
@@ -1,4 +1,4 @@
-from genutil.colors import rgb2str, str2rgb  # noqa
+from .lazyimport import genutil
 
 try:
     basestring
@@ -6,6 +6,16 @@ except NameError:
     basestring = str
 
 
+def rgb2str(*args, **kargs):
+    """Color name closest to an rgb value, see genutil.colors.rgb2str"""
+    return genutil.colors.rgb2str(*args, **kargs)
+
+
+def str2rgb(*args, **kargs):
+    """rgb value of a color name, see genutil.colors.str2rgb"""
+    return genutil.colors.str2rgb(*args, **kargs)
+
+
 def matplotlib2vcs(cmap, vcs_name=None):
     """
     Convert a matplotlib colormap to a vcs colormap
@@ -34,7 +44,7 @@ def matplotlib2vcs(cmap, vcs_name=None):
         vcs_name = cmap.name
     i = 0
     vcs_name_final = vcs_name
-    while vcs_name_final in vcs.listelements("colormap"):
+    while vcs_name_final in vcs.elements["colormap"]:
         vcs_name_final = vcs_name + "_mpl_%.3i" % i
         i += 1
     if vcs_name_final != vcs_name:
@@ -0,0 +1,137 @@
+"""
+Copy on write template members
+
+Canvas.plot copies the template it is given to adjust it to the data (ratio,
+labels, ticks, ...). A full copy creates every member (title, legend, data,
+tick marks, ...) while a plot usually modifies a handful of them.
+
+:py:func:`share` lets a template use a member of another template: it holds
+a :py:class:`SharedMember` standing for it, reads go to the shared object and
+the first write through the copy gives it a private copy of the member.
+Only the copy holds a :py:class:`SharedMember`, the source template keeps its
+members. The first write to a shared member through the source (or through
+any reference to it) first gives the copies sharing it a private copy of its
+current state (see :py:func:`detach`), so copies never see later edits of
+their source.
+"""
+import copy
+import functools
+import weakref
+
+# id(shared object) -> [shared object, weak references to the SharedMembers standing for it]
+_sharers = {}
+
+
+class SharedMember(object):
+    """Stands for the slot of a template while it shares it with other
+    templates
+
+    Attributes are read from the shared object. Setting one replaces the
+    slot of the owner by a private copy of the shared object, then sets the
+    attribute on that copy. ``isinstance`` sees the class of the shared
+    object.
+    """
+    __slots__ = ("_cow_owner", "_cow_slot", "_cow_shared", "__weakref__")
+
+    def __init__(self, owner, slot, shared):
+        object.__setattr__(self, "_cow_owner", owner)
+        object.__setattr__(self, "_cow_slot", slot)
+        object.__setattr__(self, "_cow_shared", shared)
+
+    def __getattribute__(self, a):
+        if a[:5] == "_cow_":
+            return object.__getattribute__(self, a)
+        return getattr(_target(self), a)
+
+    def __setattr__(self, a, v):
+        setattr(materialize(self), a, v)
+
+    def __delattr__(self, a):
+        delattr(materialize(self), a)
+
+    def __copy__(self):
+        return copy.copy(_target(self))
+
+    def __dir__(self):
+        return dir(_target(self))
+
+    def __repr__(self):
+        return repr(_target(self))
+
+
+def _target(proxy):
+    """What proxy currently stands for"""
+    owner = object.__getattribute__(proxy, "_cow_owner")
+    current = getattr(owner, object.__getattribute__(proxy, "_cow_slot"))
+    if current is proxy:
+        return object.__getattribute__(proxy, "_cow_shared")
+    # owner got a private copy (or was given another object) since
+    return current
+
+
+def unwrap(obj):
+    """The object obj stands for if it is a SharedMember, obj otherwise"""
+    while type(obj) is SharedMember:
+        obj = _target(obj)
+    return obj
+
+
+def materialize(proxy):
+    """Gives the owner of proxy a private copy of the shared object, if it
+    does not have one yet, and returns it"""
+    owner = object.__getattribute__(proxy, "_cow_owner")
+    slot = object.__getattribute__(proxy, "_cow_slot")
+    current = getattr(owner, slot)
+    if current is proxy:
+        shared = object.__getattribute__(proxy, "_cow_shared")
+        current = copy.copy(shared)
+        object.__setattr__(owner, slot, current)
+        _forget(id(shared), proxy)
+    return current
+
+
+def _forget(key, proxy):
+    """Unregisters proxy (or a dead weak reference) from the sharers of key"""
+    entry = _sharers.get(key)
+    if entry is None:
+        return
+    alive = []
+    for ref in entry[1]:
+        target = ref()
+        if ref is not proxy and target is not None and target is not proxy:
+            alive.append(ref)
+    entry[1] = alive
+    if not entry[1]:
+        del(_sharers[key])
+
+
+def detach(obj):
+    """Gives every SharedMember standing for obj a private copy of it, called
+    before obj is modified"""
+    entry = _sharers.pop(id(obj), None)
+    if entry is None or entry[0] is not obj:
+        return
+    for ref in entry[1]:
+        proxy = ref()
+        if proxy is not None:
+            materialize(proxy)
+
+
+def isShared(obj, slot):
+    """Is slot of obj still shared, i.e. obj did not get its private copy yet"""
+    value = getattr(obj, slot)
+    return type(value) is SharedMember and \
+        object.__getattribute__(value, "_cow_owner") is obj
+
+
+def share(source, target, slot):
+    """Makes target use the value of slot of source until an attribute is set
+    on it through target, source itself is left untouched"""
+    shared = unwrap(getattr(source, slot))
+    proxy = SharedMember(target, slot, shared)
+    object.__setattr__(target, slot, proxy)
+    key = id(shared)
+    entry = _sharers.get(key)
+    if entry is None or entry[0] is not shared:
+        entry = _sharers[key] = [shared, []]
+    entry[1].append(weakref.ref(proxy, functools.partial(_forget, key)))
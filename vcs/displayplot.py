@@ -28,6 +28,7 @@ import vcs
 import tempfile
 from .xmldocs import listdoc  # noqa
 from functools import partial
+from .lazyimport import available, IPython, ipywidgets, sidecar
 
 
 # Will attempt to import module, returns module and true if successful
@@ -38,10 +39,10 @@ def try_import_module(module, sub_modules=None):
         return None, False
 
 
-# Save whether modules were successfully imported
-IPython, HAVE_IPY = try_import_module("IPython", ["display"])
-ipywidgets, HAVE_IPYWIDGETS = try_import_module("ipywidgets")
-sidecar, HAVE_SIDECAR = try_import_module("sidecar")
+# Save whether modules can be imported, they are only imported when used
+HAVE_IPY = available("IPython")
+HAVE_IPYWIDGETS = available("ipywidgets")
+HAVE_SIDECAR = available("sidecar")
 
 
 try:
@@ -134,7 +134,7 @@ class Gfdv3d(object):
             return
         if not isinstance(Gfdv3d_name, str):
             raise ValueError("DV3D name must be a string")
-        if Gfdv3d_name in list(vcs.elements[self.g_name].keys()):
+        if Gfdv3d_name in vcs.elements[self.g_name]:
             raise ValueError(
                 "DV3D graphic method '%s' already exists" %
                 Gfdv3d_name)
@@ -0,0 +1,247 @@
+"""
+Reclamation of auto generated elements
+
+Every plot creates auto named (``__<type>_<number>``) templates, graphics
+methods, texts, colormaps and displays in ``vcs.elements``. Canvas.clear
+removes most of them, but long running processes still accumulate the ones
+that escape (displays removed from a canvas without clearing it, objects
+created by user code and dropped, etc.).
+
+:py:func:`set_element_gc` turns on an opt-in policy reclaiming the auto
+generated elements that are no longer reachable, :py:func:`collect_elements`
+runs one reclamation pass and :py:func:`element_report` summarizes what
+``vcs.elements`` currently holds.
+
+An auto generated element is kept if any of the following refers to it:
+
+- a display currently on a canvas (its template, graphics method and the
+  elements created while plotting it)
+- by name, a non auto generated element, a canvas, or an auto generated
+  element that is kept
+- a python reference held outside ``vcs.elements`` (checked with weak
+  references)
+
+A pass takes the candidates out of ``vcs.elements``, runs a full
+``gc.collect()`` and puts back the ones still alive. Meanwhile they are still
+found by name, and no plot starts in another thread (see
+:py:func:`vcs.journal.startCollection`).
+"""
+import gc
+import sys
+import weakref
+import vcs
+from . import journal
+from . import copyonwrite
+
+_policy = {"max_auto": None, "on_clear": False, "threshold": None}
+
+
+def set_element_gc(max_auto=None, on_clear=True):
+    """Sets the reclamation policy for auto generated elements.
+
+    :Example:
+
+        .. doctest:: elementgc_set_element_gc
+
+            >>> vcs.set_element_gc(max_auto=5000) # reclaim when above 5000
+            >>> vcs.set_element_gc(on_clear=False) # back to default: never
+
+    :param max_auto: Reclaim after a plot or clear when more than max_auto
+        auto generated elements exist. None means no limit.
+    :type max_auto: `int`_ or None
+
+    :param on_clear: Reclaim every time a canvas is cleared.
+        Each pass looks at every element and runs a full ``gc.collect()``,
+        use max_auto for very large sessions.
+    :type on_clear: `bool`_
+    """
+    if max_auto is not None:
+        max_auto = int(max_auto)
+        if max_auto < 0:
+            raise ValueError("max_auto must be None or a positive integer")
+    _policy["max_auto"] = max_auto
+    _policy["on_clear"] = bool(on_clear)
+    _policy["threshold"] = max_auto
+
+
+def countAuto():
+    """Number of auto generated elements currently in vcs.elements"""
+    n = 0
+    for e in vcs.elements.values():
+        n += getattr(e, "nauto", 0)
+    return n
+
+
+def autoCollect(cleared=False):
+    """Reclaims if the policy asks for it, called by the canvas after plot/clear"""
+    if journal.isOpen():
+        # Never while plotting, temporaries are not referenced yet
+        return None
+    if not (cleared and _policy["on_clear"]):
+        threshold = _policy["threshold"]
+        if threshold is None or countAuto() <= threshold:
+            return None
+    reclaimed = collect_elements()
+    if _policy["max_auto"] is not None:
+        # Do not run again right away if most elements are in use
+        _policy["threshold"] = max(_policy["max_auto"], 2 * countAuto())
+    return reclaimed
+
+
+def _attributes(obj):
+    obj = copyonwrite.unwrap(obj)
+    names = set()
+    for cls in type(obj).__mro__:
+        names.update(getattr(cls, "__slots__", ()))
+    names.update(getattr(obj, "__dict__", {}).keys())
+    for nm in names:
+        try:
+            yield getattr(obj, nm)
+        except Exception:
+            pass
+
+
+def _referencedNames(obj, depth=1):
+    """Auto generated names obj refers to, one level into sub objects
+    (e.g. template members)"""
+    names = set()
+    for value in _attributes(obj):
+        if journal.isAuto(value):
+            names.add(value)
+        elif isinstance(value, (list, tuple)):
+            names.update(v for v in value if journal.isAuto(v))
+        elif depth > 0 and isinstance(value, vcs.bestMatch):
+            names.update(_referencedNames(value, depth - 1))
+    return names
+
+
+def _liveDisplayNames():
+    names = set()
+    for canvas in vcs.canvaslist:
+        for dname in getattr(canvas, "display_names", []):
+            dn = vcs.elements["display"].get(dname)
+            if dn is None:
+                continue
+            names.add(dname)
+            names.add(dn.template)
+            names.add(getattr(dn, "_template_origin", None))
+            names.add(dn.g_name)
+            for elts in (dn.newelements or {}).values():
+                names.update(elts)
+    return names
+
+
+def _candidates():
+    """Auto generated elements not referenced by name by anything in use"""
+    used = _liveDisplayNames()
+    for canvas in vcs.canvaslist:
+        used.update(_referencedNames(canvas, depth=0))
+    auto = {}
+    for e, elts in vcs.elements.items():
+        # lazy (not yet created) elements are built-ins, not auto generated
+        for nm, obj in dict.items(elts):
+            if journal.isAuto(nm):
+                if nm not in vcs._protected_elements.get(e, ()):
+                    auto.setdefault(nm, []).append((e, obj))
+            elif e != "display":
+                used.update(_referencedNames(obj))
+    # Names reachable from what is used
+    todo = [nm for nm in used if nm in auto]
+    while todo:
+        nm = todo.pop()
+        for e, obj in auto.pop(nm):
+            for ref in _referencedNames(obj):
+                if ref in auto and ref not in used:
+                    used.add(ref)
+                    todo.append(ref)
+    return auto
+
+
+def _unregister(auto):
+    """Unlists auto from vcs.elements, returns weak references to the objects
+    and the links keeping referenced candidates alive while the referring one is"""
+    refs = {}
+    links = weakref.WeakKeyDictionary()
+    for nm, entries in auto.items():
+        for e, obj in entries:
+            try:
+                weakref.ref(obj)
+            except TypeError:
+                # Not a vcs object, leave it alone
+                continue
+            linked = []
+            for ref in _referencedNames(obj):
+                if ref != nm and ref in auto:
+                    linked.extend(o for _, o in auto[ref])
+            if linked:
+                links[obj] = linked
+            refs[(e, nm)] = vcs.elements[e].unlist(nm)
+    return refs, links
+
+
+def collect_elements():
+    """Removes unreachable auto generated elements from vcs.elements.
+
+    :Example:
+
+        .. doctest:: elementgc_collect_elements
+
+            >>> reclaimed = vcs.collect_elements()
+
+    :returns: Number of elements removed per element type
+    :rtype: `dict`_
+    """
+    if not journal.startCollection():
+        # Never while plotting, temporaries are not referenced yet
+        return {}
+    try:
+        # Unregister candidates and see which ones are still alive
+        refs, links = _unregister(_candidates())
+        gc.collect()
+
+        reclaimed = {}
+        for (e, nm), ref in refs.items():
+            if ref() is None:
+                reclaimed[e] = reclaimed.get(e, 0) + 1
+            vcs.elements[e].relist(nm)
+    finally:
+        journal.stopCollection()
+    return reclaimed
+
+
+def _sizeof(obj):
+    size = sys.getsizeof(obj)
+    for value in _attributes(obj):
+        size += sys.getsizeof(value)
+        if isinstance(value, (list, tuple)):
+            size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+def element_report():
+    """Counts and estimated memory of vcs.elements per element type.
+
+    :Example:
+
+        .. doctest:: elementgc_element_report
+
+            >>> report = vcs.element_report()
+            >>> sorted(report["boxfill"].keys())
+            ['auto', 'bytes', 'count']
+
+    :returns: Dictionary of element type to a dictionary with the number of
+        elements (count), of auto generated elements (auto) and an estimate of
+        their memory footprint in bytes (bytes). The estimate is shallow, it
+        does not account for VTK objects held by displays nor for built-in
+        elements that were not created yet.
+    :rtype: `dict`_
+    """
+    report = {}
+    for e, elts in vcs.elements.items():
+        size = 0
+        for obj in dict.values(elts):
+            size += _sizeof(obj)
+        report[e] = {"count": len(elts),
+                     "auto": getattr(elts, "nauto", 0),
+                     "bytes": size}
+    return report
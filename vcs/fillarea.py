@@ -25,7 +25,7 @@
 from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
-import genutil
+from .lazyimport import genutil
 from .xmldocs import scriptdocs, listdoc
 
 
@@ -403,7 +403,7 @@ class Tf(vcs.bestMatch):
         if (Tf_name is None):
             raise ValueError('Must provide a fillarea name.')
         else:
-            if Tf_name in list(vcs.elements["fillarea"].keys()):
+            if Tf_name in vcs.elements["fillarea"]:
                 raise ValueError(
                     "The fillarea '%s' already exists, use getfillarea instead" %
                     Tf_name)
@@ -426,19 +426,9 @@ class Tf(vcs.bestMatch):
             self._colormap = None
         else:
             src = vcs.elements["fillarea"][Tf_name_src]
-            self.style = src.style
-            self.index = src.index
-            self.color = src.color
-            self.opacity = src.opacity
-            self.pixelspacing = src.pixelspacing
-            self.pixelscale = src.pixelscale
-            self.priority = src.priority
-            self.viewport = src.viewport
-            self.worldcoordinate = src.worldcoordinate
-            self.x = src.x
-            self.y = src.y
-            self.projection = src.projection
-            self.colormap = src.colormap
+            vcs.bulkupdate.copyAttributes(self, src, ['style', 'index', 'color', 'opacity', 'pixelspacing',
+                                                      'pixelscale', 'priority', 'viewport', 'worldcoordinate',
+                                                      'x', 'y', 'projection', 'colormap'])
 
         vcs.elements["fillarea"][Tf_name] = self
 
@@ -584,7 +584,7 @@ class Gfi(vcs.bestMatch):
         #
         if not isinstance(Gfi_name, str):
             raise ValueError("Isofill name must be a string")
-        if Gfi_name in list(vcs.elements["isofill"].keys()):
+        if Gfi_name in vcs.elements["isofill"]:
             raise ValueError(
                 "isofill graphic method '%s' already exists" %
                 Gfi_name)
@@ -624,7 +624,7 @@ class Gfi(vcs.bestMatch):
         else:
             if isinstance(Gfi_name_src, Gfi):
                 Gfi_name_src = Gfi_name_src.name
-            if Gfi_name_src not in list(vcs.elements["isofill"].keys()):
+            if Gfi_name_src not in vcs.elements["isofill"]:
                 raise ValueError(
                     "Isofill method '%s' does not exists" %
                     Gfi_name_src)
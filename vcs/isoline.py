@@ -31,7 +31,7 @@ import vcs
 from . import VCS_validation_functions
 import cdtime
 from . import xmldocs
-import genutil
+from .lazyimport import genutil
 
 
 def load(nm, json_dict={}):
@@ -896,7 +896,7 @@ class Gi(vcs.bestMatch):
         #                                                         #
         if not isinstance(Gi_name, str):
             raise ValueError("Isoline name must be a string")
-        if Gi_name in list(vcs.elements["isoline"].keys()):
+        if Gi_name in vcs.elements["isoline"]:
             raise ValueError(
                 "isoline graphic method '%s' already exists" %
                 Gi_name)
@@ -938,7 +938,7 @@ class Gi(vcs.bestMatch):
         else:
             if isinstance(Gi_name_src, Gi):
                 Gi_name_src = Gi_name_src.name
-            if Gi_name_src not in list(vcs.elements["isoline"].keys()):
+            if Gi_name_src not in vcs.elements["isoline"]:
                 raise ValueError(
                     "Isoline method '%s' does not exists" %
                     Gi_name_src)
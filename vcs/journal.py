@@ -0,0 +1,255 @@
+"""
+Elements journal
+
+Canvas.plot needs to know which elements were created while it was plotting
+so that they can be removed when the canvas is cleared. Instead of
+snapshotting every key of every ``vcs.elements`` dictionary before plotting
+(which gets slower as a session accumulates elements), the ``vcs.elements``
+dictionaries record each new key in the journals that are currently open.
+
+Elements materialized from lazy entries (e.g. built-in defaults) are not
+journaled, they are not temporaries of the plot that happened to use them.
+
+Journals are per thread: a plot only records the elements created by the
+thread running it (see :py:class:`vcs.CanvasPool`). Plots and element
+collection (see :py:mod:`vcs.elementgc`) exclude each other: collection only
+starts when no journal is open and journals wait for it to end.
+"""
+import threading
+import weakref
+
+
+class _State(threading.local):
+    def __init__(self):
+        # open journals of the current thread
+        self.journals = []
+        # journaling is suspended while lazy elements are materialized
+        self.suspended = 0
+
+
+_state = _State()
+# number of journals open in all threads
+_open = [0]
+# thread collecting elements, if any
+_collector = [None]
+_condition = threading.Condition()
+# (type, name) -> weak reference, elements taken out of their dictionary while
+# they are collected, still found by name while something else holds them
+_unlisted = {}
+
+
+def isAuto(name):
+    """Is name one that vcs generated (see vcs.check_name_source)"""
+    return isinstance(name, str) and name[:2] == "__"
+
+
+class ElementsDict(dict):
+    """dict that records newly added keys in the open journals
+
+    It also counts the auto generated names it holds (see :py:func:`isAuto`)
+    and can hold lazy entries: a name and a factory creating the element,
+    called the first time the name is accessed or the dictionary enumerated.
+    """
+    __slots__ = ("type", "nauto", "lazy")
+
+    def __init__(self, typ, *args, **kargs):
+        super(ElementsDict, self).__init__(*args, **kargs)
+        self.type = typ
+        self.nauto = len([k for k in dict.__iter__(self) if isAuto(k)])
+        self.lazy = {}
+
+    def __setitem__(self, key, value):
+        if not dict.__contains__(self, key):
+            if self.lazy.pop(key, None) is None:
+                journals = _state.journals
+                if journals and not _state.suspended:
+                    entry = (self.type, key)
+                    for journal in journals:
+                        journal.append(entry)
+                if isAuto(key):
+                    self.nauto += 1
+        super(ElementsDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        if key in self.lazy:
+            del(self.lazy[key])
+        elif not dict.__contains__(self, key) and _unlisted.pop((self.type, key), None) is not None:
+            # deleted while collected (already uncounted), relist will not put it back
+            return
+        else:
+            super(ElementsDict, self).__delitem__(key)
+        if isAuto(key):
+            self.nauto -= 1
+
+    def pop(self, key, *args):
+        if key in self.lazy:
+            self.materialize(key)
+        present = dict.__contains__(self, key)
+        if not present and (self.type, key) in _unlisted:
+            value = _unlisted.pop((self.type, key))()
+            if value is not None:
+                return value
+        value = super(ElementsDict, self).pop(key, *args)
+        if present and isAuto(key):
+            self.nauto -= 1
+        return value
+
+    def addLazy(self, key, factory):
+        """Registers key, factory() is called on first access and must
+        register the element under key"""
+        if dict.__contains__(self, key) or key in self.lazy:
+            raise KeyError("%s %s already exists" % (self.type, key))
+        self.lazy[key] = factory
+        if isAuto(key):
+            self.nauto += 1
+
+    def materialize(self, key):
+        """Creates lazy element key, returns it"""
+        factory = self.lazy.pop(key)
+        if isAuto(key):
+            # counted again when the factory registers it
+            self.nauto -= 1
+        _state.suspended += 1
+        try:
+            factory()
+        finally:
+            _state.suspended -= 1
+        return dict.__getitem__(self, key)
+
+    def materializeAll(self):
+        for key in list(self.lazy.keys()):
+            try:
+                self.materialize(key)
+            except KeyError:
+                pass
+
+    def names(self):
+        """All names, lazy ones included, without materializing them"""
+        return list(dict.keys(self)) + list(self.lazy.keys())
+
+    def __missing__(self, key):
+        if key in self.lazy:
+            return self.materialize(key)
+        ref = _unlisted.get((self.type, key))
+        if ref is not None:
+            obj = ref()
+            if obj is not None:
+                return obj
+        raise KeyError(key)
+
+    def unlist(self, key):
+        """Removes key, it is still found by name while its element is alive
+        (until relist), returns a weak reference to the element"""
+        ref = weakref.ref(dict.__getitem__(self, key))
+        _unlisted[(self.type, key)] = ref
+        del(self[key])
+        return ref
+
+    def relist(self, key):
+        """Puts unlisted key back if its element is still alive, returns it"""
+        ref = _unlisted.pop((self.type, key), None)
+        obj = None if ref is None else ref()
+        if obj is not None and not dict.__contains__(self, key):
+            self[key] = obj
+        return obj
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key) or key in self.lazy:
+            return True
+        ref = _unlisted.get((self.type, key))
+        return ref is not None and ref() is not None
+
+    def __len__(self):
+        return dict.__len__(self) + len(self.lazy)
+
+    def __iter__(self):
+        self.materializeAll()
+        return super(ElementsDict, self).__iter__()
+
+    def keys(self):
+        self.materializeAll()
+        return super(ElementsDict, self).keys()
+
+    def values(self):
+        self.materializeAll()
+        return super(ElementsDict, self).values()
+
+    def items(self):
+        self.materializeAll()
+        return super(ElementsDict, self).items()
+
+
+def isOpen():
+    """Is any journal open (i.e. is a plot in progress) in any thread"""
+    return _open[0] > 0
+
+
+def start():
+    """Opens a journal in the current thread, returns it
+
+    Waits for the elements collection running in another thread to end.
+    """
+    journal = []
+    with _condition:
+        while _collector[0] not in (None, threading.current_thread()):
+            _condition.wait()
+        _open[0] += 1
+    _state.journals.append(journal)
+    return journal
+
+
+def stop(journal):
+    """Closes journal, nested journals are closed in any order"""
+    journals = _state.journals
+    for i in range(len(journals) - 1, -1, -1):
+        if journals[i] is journal:
+            del(journals[i])
+            with _condition:
+                _open[0] -= 1
+            return
+
+
+def startCollection():
+    """Makes the current thread the one collecting elements, returns False
+    (and does nothing) if a journal is open or another thread collects"""
+    with _condition:
+        if _open[0] > 0 or _collector[0] is not None:
+            return False
+        _collector[0] = threading.current_thread()
+        return True
+
+
+def stopCollection():
+    """Ends the collection started by startCollection, journals can open again"""
+    with _condition:
+        _collector[0] = None
+        _condition.notify_all()
+
+
+def newElements(journal, elements=None):
+    """Names recorded in journal that still exist in elements
+
+    Returns a dictionary with one (possibly empty) list of names per
+    elements type, in creation order
+    """
+    if elements is None:
+        import vcs
+        elements = vcs.elements
+    new = {}
+    for e in elements:
+        new[e] = []
+    seen = set()
+    for entry in journal:
+        if entry in seen:
+            continue
+        seen.add(entry)
+        e, k = entry
+        if e in elements and k in elements[e]:
+            new[e].append(k)
+    return new
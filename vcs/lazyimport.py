@@ -0,0 +1,80 @@
+"""
+Deferred imports
+
+VTK, cdms2, cdutil, genutil and the Jupyter helpers take a large share of
+``import vcs`` but many scripts (templates, colormaps, scripts manipulation)
+never use them. Modules import :py:class:`LazyModule` proxies for them
+from here, the real module is imported the first time one of its attributes
+is accessed.
+
+.. code-block:: python
+
+    from .lazyimport import cdutil
+"""
+import importlib
+import sys
+import types
+
+try:
+    from importlib.util import find_spec
+except ImportError:
+    find_spec = None
+
+
+def available(name):
+    """Can module name be imported, without importing it if possible"""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    if find_spec is None:
+        try:
+            importlib.import_module(name)
+            return True
+        except ImportError:
+            return False
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy importing module name (and its submodules) on first
+    attribute access"""
+
+    def __init__(self, name, submodules=()):
+        super(LazyModule, self).__init__(name)
+        self.__dict__["_lazy_submodules"] = tuple(submodules)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            for sub in self.__dict__["_lazy_submodules"]:
+                importlib.import_module("%s.%s" % (self.__name__, sub))
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        # next accesses do not go through __getattr__
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        if self.__dict__["_lazy_module"] is None:
+            return "<lazy module '%s'>" % self.__name__
+        return repr(self.__dict__["_lazy_module"])
+
+
+cdms2 = LazyModule("cdms2")
+MV2 = LazyModule("MV2")
+cdutil = LazyModule("cdutil")
+genutil = LazyModule("genutil")
+vtk = LazyModule("vtk")
+IPython = LazyModule("IPython", ["display"])
+ipywidgets = LazyModule("ipywidgets")
+sidecar = LazyModule("sidecar")
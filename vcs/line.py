@@ -25,7 +25,7 @@
 from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
-import genutil
+from .lazyimport import genutil
 from .xmldocs import scriptdocs, listdoc
 
 
@@ -323,7 +323,7 @@ class Tl(vcs.bestMatch):
         # appropriate Python Object.                              #
         ###########################################################
         #                                                         #
-        if Tl_name in list(vcs.elements["line"].keys()):
+        if Tl_name in vcs.elements["line"]:
             raise ValueError("lineobject '{n}' already exists".format(n=Tl_name))
         self._name = Tl_name
         if isinstance(Tl_name_src, Tl):
@@ -341,7 +341,7 @@ class Tl(vcs.bestMatch):
             self._y = None
             self._colormap = None
         else:
-            if Tl_name_src not in list(vcs.elements["line"].keys()):
+            if Tl_name_src not in vcs.elements["line"]:
                 raise ValueError(
                     "The line source '%s' does not exists" %
                     Tl_name_src)
@@ -123,7 +123,11 @@ def check_name_source(name, source, typ):
         already exists, an error is raised.
     :rtype: `tuple`_
     """
-    elts = vcs.listelements(typ)
+    if typ in ("xvsy", "yxvsx", "scatter", "xyvsy") or typ not in vcs.elements:
+        elts = vcs.listelements(typ)
+    else:
+        # membership only, do not list (and materialize) every element
+        elts = vcs.elements[typ]
     if name is None:
         rnd = random.randint(0, 1000000000000000)
         name = '__%s_%i' % (typ, rnd)
@@ -192,7 +196,7 @@ def gettemplate(Pt_name_src='default'):
     if not isinstance(Pt_name_src, basestring):
         raise vcsError('The argument must be a string.')
 
-    if Pt_name_src not in list(vcs.elements["template"].keys()):
+    if Pt_name_src not in vcs.elements["template"]:
         raise ValueError("template '%s' does not exists" % Pt_name_src)
     return vcs.elements["template"][Pt_name_src]
 gettemplate.__doc__ = gettemplate.__doc__ % xmldocs.get_docs['template']  # noqa
@@ -269,7 +273,7 @@ def getboxfill(Gfb_name_src='default'):
     if not isinstance(Gfb_name_src, basestring):
         raise vcsError('The argument must be a string.')
 
-    if Gfb_name_src not in list(vcs.elements["boxfill"].keys()):
+    if Gfb_name_src not in vcs.elements["boxfill"]:
         raise Exception("The boxfill method: '%s' does not seem to exist")
     return vcs.elements["boxfill"][Gfb_name_src]
 getboxfill.__doc__ = getboxfill.__doc__ % xmldocs.get_docs['boxfill']  # noqa
@@ -290,12 +294,12 @@ def createtaylordiagram(name=None, source='default'):
     """
 
     name, source = check_name_source(name, source, 'taylordiagram')
-    if name in list(vcs.elements["taylordiagram"].keys()):
+    if name in vcs.elements["taylordiagram"]:
         raise vcsError(
             'Error creating taylordiagram graphic method: ' +
             name +
             ' already exist')
-    if source not in list(vcs.elements["taylordiagram"].keys()):
+    if source not in vcs.elements["taylordiagram"]:
         raise vcsError(
             'Error creating taylordiagram graphic method ' +
             source +
@@ -319,7 +323,7 @@ def gettaylordiagram(Gtd_name_src='default'):
     if not isinstance(Gtd_name_src, basestring):
         raise vcsError('The argument must be a string.')
 
-    if Gtd_name_src not in list(vcs.elements["taylordiagram"].keys()):
+    if Gtd_name_src not in vcs.elements["taylordiagram"]:
         raise vcsError(
             "The taylordiagram graphic method %s does not exists" %
             Gtd_name_src)
@@ -1180,7 +1184,7 @@ def getfillarea(name='default', style=None,
     # Check to make sure the argument passed in is a STRING
     if not isinstance(name, basestring):
         raise vcsError('The argument must be a string.')
-    if name not in list(vcs.elements["fillarea"].keys()):
+    if name not in vcs.elements["fillarea"]:
         raise vcsError("Fillarea '%s' does not exist" % (name))
 
     fa = vcs.elements["fillarea"][name]
@@ -1756,7 +1760,7 @@ getcolormap.__doc__ = getcolormap.__doc__ % xmldocs.get_docs['colormap']  # noqa
 def removeG(obj, gtype="boxfill"):
     if isinstance(obj, basestring):
         name = obj
-        if obj not in list(vcs.elements[gtype].keys()):
+        if obj not in vcs.elements[gtype]:
             raise RuntimeError("Cannot remove inexisting %s %s" % (gtype, obj))
     else:
         name = obj.name
@@ -1870,7 +1874,7 @@ def removeP(obj):
     # If so we need to remove the textorientation objects
     # associated with this
     if not vcs.istemplate(obj):
-        if obj not in list(vcs.elements["template"].keys()):
+        if obj not in vcs.elements["template"]:
             raise RuntimeError("Cannot remove inexisting template %s" % obj)
     if isinstance(obj, basestring):
         obj = vcs.gettemplate(obj)
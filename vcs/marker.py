@@ -24,7 +24,7 @@
 from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
-import genutil
+from .lazyimport import genutil
 from .xmldocs import scriptdocs, listdoc
 
 
@@ -417,9 +417,9 @@ class Tm(vcs.bestMatch):
                     "The marker object '%s' does not exists" %
                     Tm_name_src)
             src = vcs.elements["marker"][Tm_name_src]
-            for att in ['colormap', 'projection', 'color', 'size',
-                        'type', 'viewport', 'worldcoordinate', 'priority', 'x', 'y']:
-                setattr(self, att, getattr(src, att))
+            vcs.bulkupdate.copyAttributes(self, src, ['colormap', 'projection', 'color', 'size',
+                                                      'type', 'viewport', 'worldcoordinate', 'priority',
+                                                      'x', 'y'])
         # Ok now we need to stick in the elements
         vcs.elements["marker"][Tm_name] = self
 
@@ -0,0 +1,153 @@
+"""
+Anonymous primitives
+
+Templates, legends and the 1D pipeline draw lots of short lived lines,
+markers, fillareas and texts. Going through ``vcs.createline`` and friends
+registers each of them in ``vcs.elements`` (and validates every attribute)
+only to delete them right after drawing.
+
+The functions in this module return line/marker/fillarea/text objects that
+are copies of a source object but are never registered, and :py:func:`plot`
+hands them straight to the canvas backend. They are meant for internal
+drawing code that passes ``donotstoredisplay=True``.
+"""
+import copy
+import vcs
+from .projection import no_deformation_projections
+from . import line as _line
+from . import marker as _marker
+from . import fillarea as _fillarea
+from . import texttable as _texttable
+from . import textorientation as _textorientation
+from . import textcombined as _textcombined
+
+ANONYMOUS_NAME = "__anonymous__"
+
+
+def _copy(cls, source, elements_type):
+    if isinstance(source, str):
+        source = vcs.elements[elements_type][source]
+    obj = cls.__new__(cls)
+    for slot in cls.__slots__:
+        try:
+            value = getattr(source, slot)
+        except AttributeError:
+            continue
+        if isinstance(value, list):
+            value = copy.copy(value)
+        object.__setattr__(obj, slot, value)
+    object.__setattr__(obj, "_name", ANONYMOUS_NAME)
+    return obj
+
+
+def _apply(obj, attributes):
+    for k, v in attributes.items():
+        if k[0] == "_":
+            # trusted value, no validation
+            object.__setattr__(obj, k, v)
+        else:
+            setattr(obj, k, v)
+    return obj
+
+
+def line(source="default", **attributes):
+    """Unregistered copy of line source (name or object), with attributes set"""
+    return _apply(_copy(_line.Tl, source, "line"), attributes)
+
+
+def marker(source="default", **attributes):
+    """Unregistered copy of marker source (name or object), with attributes set"""
+    return _apply(_copy(_marker.Tm, source, "marker"), attributes)
+
+
+def fillarea(source="default", **attributes):
+    """Unregistered copy of fillarea source (name or object), with attributes set"""
+    return _apply(_copy(_fillarea.Tf, source, "fillarea"), attributes)
+
+
+def text(Tt_source="default", To_source="default", **attributes):
+    """Unregistered text combining copies of texttable Tt_source and
+    textorientation To_source (names or objects), with attributes set"""
+    tc = _textcombined.Tc.__new__(_textcombined.Tc)
+    object.__setattr__(tc, "Tt", _copy(_texttable.Tt, Tt_source, "texttable"))
+    object.__setattr__(tc, "To", _copy(_textorientation.To, To_source, "textorientation"))
+    object.__setattr__(tc, "name", "%s:::%s" % (ANONYMOUS_NAME, ANONYMOUS_NAME))
+    object.__setattr__(tc, "s_name", "Tc")
+    for k, v in attributes.items():
+        setattr(tc, k, v)
+    return tc
+
+
+def _needsRatio(canvas, primitive, ratio):
+    """Mirrors the ratio logic Canvas.plot applies to primitives"""
+    doratio = str(canvas.ratio if ratio is None else ratio).strip().lower()
+    if doratio[-1] == 't' and doratio[0] == '0':
+        if float(doratio[:-1]) == 0.:
+            doratio = '0'
+    proj = vcs.elements["projection"][primitive.projection]
+    if proj.type in no_deformation_projections and (
+            doratio == "0" or doratio[:4] == "auto"):
+        return True
+    if proj.type == "linear" and doratio[:4] == "auto":
+        return True
+    return doratio not in ['0', 'off', 'none', 'auto', 'autot']
+
+
+def _register(primitive):
+    if vcs.istext(primitive):
+        nm = vcs.check_name_source(None, "default", "texttable")[0]
+        while nm in vcs.elements["textorientation"]:
+            nm = vcs.check_name_source(None, "default", "texttable")[0]
+        object.__setattr__(primitive.Tt, "_name", nm)
+        object.__setattr__(primitive.To, "_name", nm)
+        object.__setattr__(primitive, "name", "%s:::%s" % (nm, nm))
+        vcs.elements["texttable"][nm] = primitive.Tt
+        vcs.elements["textorientation"][nm] = primitive.To
+        vcs.elements["textcombined"][primitive.name] = primitive
+    else:
+        nm = vcs.check_name_source(None, "default", _elementsType(primitive))[0]
+        object.__setattr__(primitive, "_name", nm)
+        vcs.elements[_elementsType(primitive)][nm] = primitive
+
+
+def _unregister(primitive):
+    if vcs.istext(primitive):
+        del(vcs.elements["texttable"][primitive.Tt_name])
+        del(vcs.elements["textorientation"][primitive.To_name])
+        del(vcs.elements["textcombined"][primitive.name])
+        object.__setattr__(primitive.Tt, "_name", ANONYMOUS_NAME)
+        object.__setattr__(primitive.To, "_name", ANONYMOUS_NAME)
+        object.__setattr__(primitive, "name", "%s:::%s" % (ANONYMOUS_NAME, ANONYMOUS_NAME))
+    else:
+        del(vcs.elements[_elementsType(primitive)][primitive.name])
+        object.__setattr__(primitive, "_name", ANONYMOUS_NAME)
+
+
+def _elementsType(primitive):
+    if vcs.isline(primitive):
+        return "line"
+    elif vcs.ismarker(primitive):
+        return "marker"
+    return "fillarea"
+
+
+def plot(canvas, primitive, ratio=None, bg=False, **kargs):
+    """Draws primitive on canvas without storing a display.
+
+    Same output as ``canvas.plot(primitive, donotstoredisplay=True)``.
+    Returns None, like that call.
+    """
+    if primitive.priority == 0:
+        return None
+    kargs.pop("donotstoredisplay", None)
+    if _needsRatio(canvas, primitive, ratio):
+        # Rare case, let Canvas.plot fit the viewport to the ratio
+        _register(primitive)
+        try:
+            canvas.plot(primitive, ratio=ratio if ratio is not None else canvas.ratio,
+                        bg=bg, donotstoredisplay=True, **kargs)
+        finally:
+            _unregister(primitive)
+        return None
+    canvas.backend.plotPrimitive(primitive, bg=bg, **kargs)
+    return None
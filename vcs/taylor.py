@@ -3,9 +3,9 @@ from __future__ import print_function
 import vcs
 import numpy.ma
 import numpy
-import cdms2
+from .lazyimport import cdms2
 from . import VCS_validation_functions
-import MV2
+from .lazyimport import MV2
 import copy
 import warnings
 from .xmldocs import scriptdocs
@@ -640,7 +640,7 @@ class Gtd(vcs.bestMatch):
             self._standard_deviation_label = "Standard Deviation"
             self.displays = []
         else:
-            if source not in list(vcs.elements["taylordiagram"].keys()):
+            if source not in vcs.elements["taylordiagram"]:
                 raise Exception(
                     "the source taylordiagram %s doe not exist" %
                     source)
@@ -2043,7 +2043,7 @@ class Gtd(vcs.bestMatch):
         if newname == "default":
             raise Exception(
                 "You cannot overwrite the default taylordiagram graphic method")
-        if newname in list(vcs.elements["taylordiagram"].keys()):
+        if newname in vcs.elements["taylordiagram"]:
             raise Exception(
                 "Sorry %s taylordiagram graphic method already exists" %
                 newname)
@@ -47,7 +47,8 @@ from .Pboxeslines import *  # noqa
 from .Plegend import *  # noqa
 from .Pdata import *  # noqa
 import inspect
-import cdutil
+from .lazyimport import cdutil
+from . import copyonwrite
 from .projection import round_projections
 from .projection import elliptical_projections
 from .xmldocs import scriptdocs, listdoc
@@ -108,6 +109,16 @@ def _setgen(self, name, cls, value):
     setattr(self, "_%s" % name, value)
 
 
+_members = ['file', 'function', 'logicalmask', 'transformation', 'source', 'dataname', 'title',
+            'units', 'crdate', 'crtime', 'comment1', 'comment2', 'comment3', 'comment4',
+            'xname', 'yname', 'zname', 'tname', 'xunits', 'yunits', 'zunits', 'tunits',
+            'xvalue', 'yvalue', 'zvalue', 'tvalue', 'mean', 'min', 'max',
+            'xtic1', 'xtic2', 'xmintic1', 'xmintic2', 'ytic1', 'ytic2', 'ymintic1', 'ymintic2',
+            'xlabel1', 'xlabel2', 'ylabel1', 'ylabel2',
+            'box1', 'box2', 'box3', 'box4', 'line1', 'line2', 'line3', 'line4',
+            'legend', 'data']
+
+
 def epsilon_gte(a, b):
     """a >= b, using floating point epsilon value."""
     float_epsilon = numpy.finfo(numpy.float32).eps
@@ -120,6 +131,55 @@ def epsilon_lte(a, b):
     return float_epsilon > a - b
 
 
+def _labelOrder(n):
+    """Indices 0..n-1, ends first then successive midpoints (coarse to fine)"""
+    if n <= 2:
+        return list(range(n))
+    order = [0, n - 1]
+    intervals = [(0, n - 1)]
+    while intervals:
+        following = []
+        for lo, hi in intervals:
+            mid = (lo + hi) // 2
+            if lo < mid < hi:
+                order.append(mid)
+                following += [(lo, mid), (mid, hi)]
+        intervals = following
+    return order
+
+
+def thinLabels(canvas, text, axis):
+    """Indices (sorted) of the strings of text to draw so that no two
+    labels overlap.
+
+    All the labels are measured at once (extents are cached), then kept
+    greedily: the labels at both ends of the axis first, then the middle
+    one, then the middle of each half, and so on. The result only depends
+    on the labels and their positions, so images are reproducible.
+    """
+    strings = text.string
+    n = len(strings)
+    extents = canvas.gettextextent(text)
+    positions = text.x if axis == 'x' else text.y
+    if len(positions) < n:
+        positions = positions + [positions[-1]] * (n - len(positions))
+    byPosition = sorted(range(n), key=lambda i: (positions[i], i))
+    kept = []
+    boxes = []
+    for rank in _labelOrder(n):
+        i = byPosition[rank]
+        if strings[i] == '':
+            continue
+        x1, x2, y1, y2 = extents[i]
+        for k1, k2, l1, l2 in boxes:
+            if x1 < k2 and k1 < x2 and y1 < l2 and l1 < y2:
+                break
+        else:
+            kept.append(i)
+            boxes.append(extents[i])
+    return sorted(kept)
+
+
 # read .scr file
 def process_src(nm, code):
 
@@ -274,7 +334,7 @@ class P(vcs.bestMatch):
         "The orientation attribute must be an integer (i.e., 0 = landscape, 1 = portrait).")
 
     # Initialize the template attributes.                                     #
-    def __init__(self, Pic_name=None, Pic_name_src='default'):
+    def __init__(self, Pic_name=None, Pic_name_src='default', copy_on_write=False):
         #                                                         #
         ###########################################################
         # Initialize the template class and its members           #
@@ -291,7 +351,7 @@ class P(vcs.bestMatch):
             raise "Invalid source template: %s" % Pic_name_src
         if isinstance(Pic_name_src, P):
             Pic_name_src = Pic_name_src.name
-        if Pic_name in list(vcs.elements["template"].keys()):
+        if Pic_name in vcs.elements["template"]:
             raise ValueError("Template %s already exists" % Pic_name)
 
         self._name = Pic_name
@@ -483,87 +543,20 @@ class P(vcs.bestMatch):
         else:
             if isinstance(Pic_name_src, P):
                 Pic_name_src = P.name
-            if Pic_name_src not in list(vcs.elements["template"].keys()):
+            if Pic_name_src not in vcs.elements["template"]:
                 raise ValueError(
                     "The source template '%s' does not seem to exists" %
                     Pic_name_src)
             src = vcs.elements["template"][Pic_name_src]
-            self.orientation = src.orientation
-            self.file = copy.copy(src.file)
-            self.function = copy.copy(src.function)
-            self.logicalmask = copy.copy(src.logicalmask)
-            self.transformation = copy.copy(src.transformation)
-            self.source = copy.copy(src.source)
-            self.dataname = copy.copy(src.dataname)
-            self.title = copy.copy(src.title)
-            self.units = copy.copy(src.units)
-            self.crdate = copy.copy(src.crdate)
-            self.crtime = copy.copy(src.crtime)
-            self.comment1 = copy.copy(src.comment1)
-            self.comment2 = copy.copy(src.comment2)
-            self.comment3 = copy.copy(src.comment3)
-            self.comment4 = copy.copy(src.comment4)
-            self.xname = copy.copy(src.xname)
-            self.yname = copy.copy(src.yname)
-            self.zname = copy.copy(src.zname)
-            self.tname = copy.copy(src.tname)
-            self.xunits = copy.copy(src.xunits)
-            self.yunits = copy.copy(src.yunits)
-            self.zunits = copy.copy(src.zunits)
-            self.tunits = copy.copy(src.tunits)
-            ###################################################
-        # The following initializes the template's FORMATS #
-            ####################################################
-            self.xvalue = copy.copy(src.xvalue)
-            self.yvalue = copy.copy(src.yvalue)
-            self.zvalue = copy.copy(src.zvalue)
-            self.tvalue = copy.copy(src.tvalue)
-            self.mean = copy.copy(src.mean)
-            self.min = copy.copy(src.min)
-            self.max = copy.copy(src.max)
-            ########################################################
-        # The folowing initializes the template's X-TICK MARKS #
-            ########################################################
-            self.xtic1 = copy.copy(src.xtic1)
-            self.xtic2 = copy.copy(src.xtic2)
-            self.xmintic1 = copy.copy(src.xmintic1)
-            self.xmintic2 = copy.copy(src.xmintic2)
-            ########################################################
-        # The folowing initializes the template's Y-TICK MARKS #
-            ########################################################
-            self.ytic1 = copy.copy(src.ytic1)
-            self.ytic2 = copy.copy(src.ytic2)
-            self.ymintic1 = copy.copy(src.ymintic1)
-            self.ymintic2 = copy.copy(src.ymintic2)
-            ####################################################
-        # The folowing initializes the template's X-LABELS #
-            ####################################################
-            self.xlabel1 = copy.copy(src.xlabel1)
-            self.xlabel2 = copy.copy(src.xlabel2)
-            ####################################################
-        # The folowing initializes the template's Y-LABELS #
-            ####################################################
-            self.ylabel1 = copy.copy(src.ylabel1)
-            self.ylabel2 = copy.copy(src.ylabel2)
-            ###########################################################
-        # The folowing initializes the template's BOXES and LINES #
-            ###########################################################
-            self.box1 = copy.copy(src.box1)
-            self.box2 = copy.copy(src.box2)
-            self.box3 = copy.copy(src.box3)
-            self.box4 = copy.copy(src.box4)
-            self.line1 = copy.copy(src.line1)
-            self.line2 = copy.copy(src.line2)
-            self.line3 = copy.copy(src.line3)
-            self.line4 = copy.copy(src.line4)
-            ########################################################
-        # The folowing initializes the template's LEGEND SPACE #
-            ########################################################
-            self.legend = copy.copy(src.legend)
-            ######################################################
-        # The folowing initializes the template's DATA SPACE #
-            #######################################################
-            self.data = copy.copy(src.data)
+            self._orientation = src.orientation
+            # src members are valid already, copy them without going through
+            # the checks of the attributes setters
+            if copy_on_write:
+                # members are copied when modified through self or through src
+                for member in _members:
+                    copyonwrite.share(src, self, "_" + member)
+            else:
+                vcs.bulkupdate.copyAttributes(self, src, _members, copy.copy)
 
         vcs.elements["template"][Pic_name] = self
 
@@ -968,6 +961,7 @@ class P(vcs.bestMatch):
                 fp.write(
                     "%s.%s.texttable = '%s'\n" %
                     (unique_name, i, a[j].texttable))
+                fp.write("%s.%s.thin = %s\n" % (unique_name, i, a[j].thin))
                 fp.write(
                     "%s.%s.textorientation = '%s'\n\n" %
                     (unique_name, i, a[j].textorientation))
@@ -985,6 +979,7 @@ class P(vcs.bestMatch):
                 fp.write(
                     "%s.%s.texttable = '%s'\n" %
                     (unique_name, i, a[j].texttable))
+                fp.write("%s.%s.thin = %s\n" % (unique_name, i, a[j].thin))
                 fp.write(
                     "%s.%s.textorientation = '%s'\n\n" %
                     (unique_name, i, a[j].textorientation))
@@ -1115,13 +1110,13 @@ class P(vcs.bestMatch):
             obj = getattr(self, axis + 'mintic' + number)
         # the following to make sure we have a unique name,
         # i put them together assuming it would be faster
-        ticks = x.createline(source=obj.line)
+        ticks = vcs.primitives.line(obj.line)
         ticks.projection = gm.projection
         ticks.priority = obj.priority
         if mintic is False:
             # the labels
             objlabl = getattr(self, axis + 'label' + number)
-            tt = x.createtext(
+            tt = vcs.primitives.text(
                 Tt_source=objlabl.texttable,
                 To_source=objlabl.textorientation)
             tt.projection = gm.projection
@@ -1238,18 +1233,17 @@ class P(vcs.bestMatch):
             tt.string = tstring
             tt.x = txs
             tt.y = tys
-            displays.append(x.text(tt, bg=bg, ratio="none", **kargs))
+            if objlabl.thin and tt.priority != 0 and \
+                    vcs.elements["projection"][gm.projection].type == "linear":
+                keep = thinLabels(x, tt, axis)
+                tt.string = [tstring[i] for i in keep]
+                tt.x = [txs[i] for i in keep]
+                tt.y = [tys[i] for i in keep]
+            displays.append(vcs.primitives.plot(x, tt, bg=bg, ratio="none", **kargs))
         if xs != []:
             ticks._x = xs
             ticks._y = ys
-            displays.append(x.line(ticks, bg=bg, **kargs))
-
-        del(vcs.elements["line"][ticks.name])
-        if mintic is False:
-            sp = tt.name.split(":::")
-            del(vcs.elements["texttable"][sp[0]])
-            del(vcs.elements["textorientation"][sp[1]])
-            del(vcs.elements["textcombined"][tt.name])
+            displays.append(vcs.primitives.plot(x, ticks, bg=bg, **kargs))
         return displays
 
     def blank(self, attribute=None):
@@ -1760,11 +1754,7 @@ class P(vcs.bestMatch):
                 for att in ["name", "units", "value"]:
                     nm = nms[i] + att
                     sub = getattr(self, nm)
-                    tt = x.createtext(
-                        None,
-                        sub.texttable,
-                        None,
-                        sub.textorientation)
+                    tt = vcs.primitives.text(sub.texttable, sub.textorientation)
                     if att == "name":
                         if i == 0 and gm.g_name == "G1d":
                             if gm.flip or hasattr(slab, "_yname"):
@@ -1785,11 +1775,7 @@ class P(vcs.bestMatch):
                     tt.priority = sub._priority
                     # This is the name of the axis. It should be transformed
                     # through geographic projection but it is not at the moment
-                    displays.append(x.text(tt, bg=bg, **kargs))
-                    sp = tt.name.split(":::")
-                    del(vcs.elements["texttable"][sp[0]])
-                    del(vcs.elements["textorientation"][sp[1]])
-                    del(vcs.elements["textcombined"][tt.name])
+                    displays.append(vcs.primitives.plot(x, tt, bg=bg, **kargs))
 
         if X is None:
             X = slab.getAxis(-1)
@@ -1831,7 +1817,7 @@ class P(vcs.bestMatch):
             for num in ["1", "2"]:
                 e = getattr(self, tp + num)
                 if e.priority != 0:
-                    ln_tmp = x.createline(source=e.line)
+                    ln_tmp = vcs.primitives.line(e.line)
                     if hasattr(gm, "projection"):
                         ln_tmp.projection = gm.projection
                     if vcs.elements["projection"][
@@ -1865,8 +1851,7 @@ class P(vcs.bestMatch):
                         ln_tmp._x = [e._x1, e._x2, e._x2, e._x1, e._x1]
                         ln_tmp._y = [e._y1, e._y1, e._y2, e._y2, e._y1]
                     ln_tmp._priority = e._priority
-                    displays.append(x.plot(ln_tmp, bg=bg, ratio="none", **kargs))
-                    del(vcs.elements["line"][ln_tmp.name])
+                    displays.append(vcs.primitives.plot(x, ln_tmp, bg=bg, ratio="none", **kargs))
 
         # x.mode=m
         # I think i have to use dict here because it's a valid value
@@ -1985,53 +1970,43 @@ class P(vcs.bestMatch):
                 if ext_2 in ['y', 1, True]:
                     iext = 2
 
-        # Loops thru the boxes (i.e colors NOT actual boxes drawn)
+        # Computes the boxes (i.e colors NOT actual boxes drawn) all at once
+        ext1 = ext_1 in ['y', 1, True]
+        ext2 = ext_2 in ['y', 1, True]
+        arrowThick = [startThick, startThick + thick / 2., startThick + thick]
         adjust = 0
-        for i in range(nbox):
-            if ext_1 in ['y', 1, True] and i == 0:
-                # Draws the little arrow at the begining
-                # Make sure the triangle goes back to first point
-                # Because used to close the extension
-                L.append([
-                    startLength + arrowLength,
-                    startLength,
-                    startLength + arrowLength,
-                ])
-                T.append(
-                    [
-                        startThick,
-                        startThick + thick / 2.,
-                        startThick + thick,
-                    ])
-                # Now readjust startLength if necessary
-                if iext == 1 or iext == 3:
-                    startLength = startLength + arrowLength
-                    adjust = -1
-            elif ext_2 in ['y', 1, True] and i == nbox - 1:
-                # Draws the little arrow at the end
-                L.append([
-                    startLength + boxLength * (i + adjust),
-                    startLength + boxLength * (i + adjust) + arrowLength,
-                    startLength + boxLength * (i + adjust),
-                ])
-                T.append(
-                    [
-                        startThick,
-                        startThick + thick / 2.,
-                        startThick + thick,
-                    ])
-            else:
-                # Draws a normal box
-                L.append([startLength + boxLength * (i + adjust),
-                          startLength + boxLength * (i + adjust + 1),
-                          startLength + boxLength * (i + adjust + 1),
-                          startLength + boxLength * (i + adjust)])
-                T.append([startThick,
-                          startThick,
-                          startThick + thick,
-                          startThick + thick])
-
-        fa = x.createfillarea()
+        first = 0
+        if ext1:
+            # Draws the little arrow at the begining
+            # Make sure the triangle goes back to first point
+            # Because used to close the extension
+            L.append([
+                startLength + arrowLength,
+                startLength,
+                startLength + arrowLength,
+            ])
+            T.append(list(arrowThick))
+            # Now readjust startLength
+            startLength = startLength + arrowLength
+            adjust = -1
+            first = 1
+        last = nbox
+        if ext2 and nbox - 1 >= first:
+            last = nbox - 1
+        # Normal boxes
+        i = numpy.arange(first, last) + adjust
+        lo = startLength + boxLength * i
+        hi = startLength + boxLength * (i + 1)
+        L += numpy.stack([lo, hi, hi, lo], axis=1).tolist()
+        T += numpy.tile([startThick, startThick, startThick + thick, startThick + thick],
+                        (len(i), 1)).tolist()
+        if last < nbox:
+            # Draws the little arrow at the end
+            end = startLength + boxLength * (nbox - 1 + adjust)
+            L.append([end, end + arrowLength, end])
+            T.append(list(arrowThick))
+
+        fa = vcs.primitives.fillarea()
         fa.color = colors
         fa.style = style
         fa.index = index
@@ -2052,8 +2027,7 @@ class P(vcs.bestMatch):
         else:
             fa._x = T
             fa._y = L
-        displays.append(x.plot(fa, bg=bg, **kargs))
-        del(vcs.elements["fillarea"][fa.name])
+        displays.append(vcs.primitives.plot(x, fa, bg=bg, **kargs))
         # Now draws the box around the legend
         # First of all make sure we draw the arrows
         Tl = []  # Thickness labels location
@@ -2118,32 +2092,33 @@ class P(vcs.bestMatch):
             else:
                 comparison = epsilon_gte
 
-            def in_bounds(x):
-                return comparison(levels[0], x) and comparison(x, levels[-1])
-
             boxLength = levelsLength / (len(levels) - 1.)
 
-            for il, l in enumerate(sorted(legend.keys())):
-                if in_bounds(l):
-                    for i in range(len(levels) - 1):
-                        # if legend key is (inclusive) between levels[i] and levels[i+1]
-                        if comparison(levels[i], l) and comparison(l, levels[i + 1]):
-                            # first let's figure out where to put the legend label
-                            location = i * boxLength  # position at beginning of level
-                            # Adds the distance from beginning of level box
-                            location += (l - levels[i]) / (levels[i + 1] - levels[i]) * boxLength
-                            location += startLength  # Figures out the beginning
-
-                            if not (numpy.allclose(l, levels[0]) or numpy.allclose(l, levels[-1])):
-                                Ll.append([location, location])
-                                Tl.append([startThick, startThick + thick])
-                            Lt.append(location)
-                            Tt.append(startThick + thick + self.legend.offset)
-                            St.append(legend[l])
-                            break
+            keys = sorted(legend.keys())
+            if keys:
+                levs = numpy.asarray(levels)
+                k = numpy.asarray(keys)[:, None]
+                # box i of each key: first level interval (inclusive) containing it
+                inBox = comparison(levs[None, :-1], k) & comparison(k, levs[None, 1:])
+                inBox &= (comparison(levs[0], k) & comparison(k, levs[-1]))
+                found = numpy.flatnonzero(inBox.any(axis=1))
+                boxes = inBox[found].argmax(axis=1)
+                # first let's figure out where to put the legend label
+                # position at beginning of level, plus distance from beginning of level box
+                locations = boxes * boxLength + \
+                    (k[found, 0] - levs[boxes]) / (levs[boxes + 1] - levs[boxes]) * boxLength
+                locations = locations + startLength  # Figures out the beginning
+                ends = numpy.isclose(k[found, 0], levs[0]) | numpy.isclose(k[found, 0], levs[-1])
+                for key, location, end in zip(found, locations.tolist(), ends):
+                    if not end:
+                        Ll.append([location, location])
+                        Tl.append([startThick, startThick + thick])
+                    Lt.append(location)
+                    Tt.append(startThick + thick + self.legend.offset)
+                    St.append(legend[keys[key]])
         # ok now creates the line object and text object
-        ln = x.createline(source=self.legend.line)
-        txt = x.createtext(
+        ln = vcs.primitives.line(self.legend.line)
+        txt = vcs.primitives.text(
             To_source=self.legend.textorientation,
             Tt_source=self.legend.texttable)
         txt.string = St
@@ -2164,13 +2139,8 @@ class P(vcs.bestMatch):
             txt.y = Lt
 
         # Now reset the viewport and worldcoordiantes
-        displays.append(x.plot(ln, bg=bg, **kargs))
-        displays.append(x.plot(txt, bg=bg, **kargs))
-        del(vcs.elements["line"][ln.name])
-        sp = txt.name.split(":::")
-        del(vcs.elements["texttable"][sp[0]])
-        del(vcs.elements["textorientation"][sp[1]])
-        del(vcs.elements["textcombined"][txt.name])
+        displays.append(vcs.primitives.plot(x, ln, bg=bg, **kargs))
+        displays.append(vcs.primitives.plot(x, txt, bg=bg, **kargs))
         x._viewport = vp
         x._worldcoordinate = wc
         return displays
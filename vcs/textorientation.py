@@ -248,7 +248,7 @@ class To(vcs.bestMatch):
         # back the appropriate Python Object.                       #
         #############################################################
         #                                                           #
-        if To_name in list(vcs.elements["textorientation"].keys()):
+        if To_name in vcs.elements["textorientation"]:
             raise ValueError(
                 "textorientation object '{n}' already exists".format(n=To_name))
         self._name = To_name
@@ -262,7 +262,7 @@ class To(vcs.bestMatch):
             self._halign = "left"
             self._valign = "half"
         else:
-            if To_name_src not in list(vcs.elements["textorientation"].keys()):
+            if To_name_src not in vcs.elements["textorientation"]:
                 raise ValueError(
                     "source textorientation '%s' does not exists" %
                     To_name_src)
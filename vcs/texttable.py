@@ -25,7 +25,7 @@
 from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
-import genutil
+from .lazyimport import genutil
 from .xmldocs import scriptdocs, listdoc
 
 
@@ -410,7 +410,7 @@ class Tt(vcs.bestMatch):
         #                                                           #
         if (Tt_name is None):
             raise ValueError('Must provide a text table name.')
-        if Tt_name in list(vcs.elements["texttable"].keys()):
+        if Tt_name in vcs.elements["texttable"]:
             raise ValueError("texttable '%s' already exists" % Tt_name)
         self._name = Tt_name
         self.s_name = 'Tt'
@@ -433,26 +433,15 @@ class Tt(vcs.bestMatch):
         else:
             if isinstance(Tt_name_src, Tt):
                 Tt_name_src = Tt_name_src.name
-            if Tt_name_src not in list(vcs.elements["texttable"].keys()):
+            if Tt_name_src not in vcs.elements["texttable"]:
                 raise ValueError(
                     "Source texttable: '%s' does not exists" %
                     Tt_name_src)
             src = vcs.elements["texttable"][Tt_name_src]
-            self.string = src.string
-            self.font = src.font
-            self.spacing = src.spacing
-            self.expansion = src.expansion
-            self.color = src.color
-            self.backgroundcolor = src.backgroundcolor
-            self.backgroundopacity = src.backgroundopacity
-            self.fillincolor = src.fillincolor
-            self.priority = src.priority
-            self.viewport = src.viewport
-            self.worldcoordinate = src.worldcoordinate
-            self.x = src.x
-            self.y = src.y
-            self.projection = src.projection
-            self.colormap = src.colormap
+            vcs.bulkupdate.copyAttributes(self, src, ['string', 'font', 'spacing', 'expansion', 'color',
+                                                      'backgroundcolor', 'backgroundopacity', 'fillincolor',
+                                                      'priority', 'viewport', 'worldcoordinate', 'x', 'y',
+                                                      'projection', 'colormap'])
         vcs.elements["texttable"][Tt_name] = self
 
     ##########################################################################
@@ -323,6 +323,29 @@ class G1d(vcs.bestMatch):
                     yxx.markersize=300
                     yxx.markersize=None
 
+            * To draw very long series with a bounded number of line vertices:
+
+                .. code-block:: python
+
+                    # keep first/last/min/max of each pixel column
+                    yxx.decimation='minmax'
+                    # Largest-Triangle-Three-Buckets downsampling
+                    yxx.decimation='lttb'
+                    # draw every point (default)
+                    yxx.decimation=None
+
+            * To draw scatter plots with many points as a density image:
+
+                .. code-block:: python
+
+                    # number of points per screen pixel
+                    yxx.density='count'
+                    # mean (or max) of the density_values plot keyword
+                    yxx.density='mean'
+                    yxx.density='max'
+                    # only bin when there are more points than this
+                    yxx.density_threshold=100000
+
     %s
     %s
     %s
@@ -359,6 +382,9 @@ class G1d(vcs.bestMatch):
         '_datawc_calendar',
         '_flip',
         '_smooth',
+        '_decimation',
+        '_density',
+        '_density_threshold',
     ]
 
     def _getname(self):
@@ -643,6 +669,48 @@ class G1d(vcs.bestMatch):
         None,
         "beta parameter for kaiser smoothing")
 
+    def _getdecimation(self):
+        return self._decimation
+
+    def _setdecimation(self, value):
+        if value is not None:
+            value = VCS_validation_functions.checkString(self, "decimation", value)
+            if value not in ["minmax", "lttb"]:
+                raise ValueError("decimation must be None, 'minmax' or 'lttb'")
+        self._decimation = value
+    decimation = property(
+        _getdecimation,
+        _setdecimation,
+        None,
+        "pixel-aware decimation of the line vertices (None, 'minmax' or 'lttb')")
+
+    def _getdensity(self):
+        return self._density
+
+    def _setdensity(self, value):
+        if value is not None:
+            value = VCS_validation_functions.checkString(self, "density", value)
+            if value not in ["count", "mean", "max"]:
+                raise ValueError("density must be None, 'count', 'mean' or 'max'")
+        self._density = value
+    density = property(
+        _getdensity,
+        _setdensity,
+        None,
+        "bin the points into a screen resolution image (None, 'count', 'mean' or 'max')")
+
+    def _getdensity_threshold(self):
+        return self._density_threshold
+
+    def _setdensity_threshold(self, value):
+        value = VCS_validation_functions.checkInt(self, "density_threshold", value, 0)
+        self._density_threshold = value
+    density_threshold = property(
+        _getdensity_threshold,
+        _setdensity_threshold,
+        None,
+        "number of points above which density is used instead of markers")
+
     def _gtype(self):
         if self.flip:
             return "xyvsy"
@@ -667,6 +735,9 @@ class G1d(vcs.bestMatch):
         self._name = name
         if name == 'default':
             self._smooth = None
+            self._decimation = None
+            self._density = None
+            self._density_threshold = 100000
             self._flip = False
             self._projection = "linear"
             self._xticlabels1 = "*"
@@ -703,7 +774,8 @@ class G1d(vcs.bestMatch):
             for att in ['projection', 'colormap', 'xticlabels1', 'xticlabels2', 'xmtics1', 'xmtics2',
                         'yticlabels1', 'yticlabels2', 'ymtics1', 'ymtics2', 'datawc_y1', 'datawc_y2', 'datawc_x1',
                         'datawc_x2', 'xaxisconvert', 'yaxisconvert', 'linetype', 'linecolor', 'linewidth', 'marker',
-                        'markercolor', 'markersize', 'datawc_timeunits', 'datawc_calendar', 'smooth', 'flip']:
+                        'markercolor', 'markersize', 'datawc_timeunits', 'datawc_calendar', 'smooth', 'flip',
+                        'decimation', 'density', 'density_threshold']:
                 setattr(self, att, getattr(src, att))
         # Ok now we need to stick in the elements
         vcs.elements["1d"][name] = self
@@ -776,6 +848,9 @@ class G1d(vcs.bestMatch):
         print("markercolor = ", self.markercolor)
         print("markersize = ", self.markersize)
         print("flip = ", self.flip)
+        print("decimation = ", self.decimation)
+        print("density = ", self.density)
+        print("density_threshold = ", self.density_threshold)
     list.__doc__ = xmldocs.listdoc.format(name="1d", parent="'default'")
 
     ###########################################################################
@@ -893,6 +968,9 @@ class G1d(vcs.bestMatch):
             fp.write("%s.markercolor = %s\n" % (unique_name, self.markercolor))
             fp.write("%s.markersize = %s\n\n" % (unique_name, self.markersize))
             fp.write("%s.flip = %s\n\n" % (unique_name, repr(self.flip)))
+            fp.write("%s.decimation = %s\n\n" % (unique_name, repr(self.decimation)))
+            fp.write("%s.density = %s\n" % (unique_name, repr(self.density)))
+            fp.write("%s.density_threshold = %s\n\n" % (unique_name, self.density_threshold))
             if self.colormap is not None:
                 fp.write("%s.colormap = %s\n\n" % (unique_name, repr(self.colormap)))
             else:
@@ -33,14 +33,12 @@ from . import vector
 from . import marker
 from . import colormap
 import os
+import sys
+import pickle
+import functools
+import hashlib
 import tempfile
-import cdms2
-import genutil
-try:
-    import vtk
-    HAS_VTK = True
-except Exception:
-    HAS_VTK = False
+from .lazyimport import available, cdms2, genutil, vtk
 import struct
 from .clickMap import mapPng, getPngDimensions, meshToPngCoords, vcsToHtml, axisToPngCoords  # noqa
 try:
@@ -61,6 +59,8 @@ except NameError:
 
 from .colors import rgb2str, str2rgb, matplotlib2vcs, loadmatplotlibcolormaps  # noqa
 
+HAS_VTK = available("vtk")
+
 indent = 1
 sort_keys = True
 # Deprecated color map names mapping
@@ -264,7 +264,7 @@ def process_range_from_old_scr(code, g):
             levs.append([float(sp[1][7:]), float(sp[2][7:])])
             fa = sp[-1][3:]
             fa = fa[:fa.find(")")]
-            if fa not in list(vcs.elements["fillarea"].keys()):
+            if fa not in vcs.elements["fillarea"]:
                 badfa = True
                 fai.append(fa)
             else:
@@ -1003,7 +1003,48 @@ def saveinitialfile():
 #
 
 
-def scriptrun(script):
+SNAPSHOT_VERSION = 4
+
+_scriptLoader = {"P": 'template',
+                 "Gfb": 'boxfill',
+                 "Gfi": 'isofill',
+                 "Gi": 'isoline',
+                 "Gvp": 'vector',
+                 "Gs": 'streamline',
+                 "Gfm": 'meshfill',
+                 "G1d": '1d',
+                 "Tf": 'fillarea',
+                 "Tt": "texttable",
+                 "To": "textorientation",
+                 "Tm": "marker",
+                 "Tl": "line",
+                 "Gf3Dscalar": "3d_scalar",
+                 "Gf3DDualScalar": "3d_dual_scalar",
+                 "Gf3Dvector": "3d_vector",
+                 "Proj": "projection",
+                 "Gtd": "taylordiagram",
+                 "Cp": "colormap",
+                 "L": "L",
+                 }
+
+
+def scriptrun(script, snapshot=None, lazy=False):
+    """Loads a vcs script (.scr, .py or json attributes file)
+
+    :param script: Path to the script
+    :type script: `str`_
+
+    :param snapshot: Path to a binary snapshot of the elements loaded from a
+        json attributes file. If the snapshot was made from the current
+        version of script it is loaded instead of script, otherwise it is
+        (re)written after loading script.
+    :type snapshot: `str`_ or None
+
+    :param lazy: For json attributes files, elements that do not exist yet
+        are only created when first accessed (see
+        :py:meth:`vcs.journal.ElementsDict.addLazy`)
+    :type lazy: `bool`_
+    """
     if script.split(".")[-1] == "scr":
         scriptrun_scr(script)
     elif script.split(".")[-1] == "py":
@@ -1011,60 +1052,198 @@ def scriptrun(script):
     else:
         if os.path.split(script)[-1] == "initial.attributes":
             vcs._doValidation = False
-        loader = {"P": 'template',
-                  "Gfb": 'boxfill',
-                  "Gfi": 'isofill',
-                  "Gi": 'isoline',
-                  "Gvp": 'vector',
-                  "Gs": 'streamline',
-                  "Gfm": 'meshfill',
-                  "G1d": '1d',
-                  "Tf": 'fillarea',
-                  "Tt": "texttable",
-                  "To": "textorientation",
-                  "Tm": "marker",
-                  "Tl": "line",
-                  "Gf3Dscalar": "3d_scalar",
-                  "Gf3DDualScalar": "3d_dual_scalar",
-                  "Gf3Dvector": "3d_vector",
-                  "Proj": "projection",
-                  "Gtd": "taylordiagram",
-                  "Cp": "colormap",
-                  "L": "L",
-                  }
         try:
+            if snapshot is not None and loadSnapshot(script, snapshot, lazy):
+                return
             f = open(script)
             jsn = json.load(f)
-            keys = []
-            for k in ["Tt", "To", "Tl",
-                      "Tm", "Proj"]:  # always read these first
-                if k in list(jsn.keys()):
-                    keys.append(k)
-            for k in list(jsn.keys()):
-                if k not in keys:
-                    keys.append(k)
-            for typ in keys:
-                for nm, v in jsn[typ].items():
-                    if typ == "P":
-                        try:
-                            loadTemplate(str(nm), v)
-                        except Exception as err:
-                            print("could not load tmpl:", nm, err)
-                    else:
-                        try:
-                            loadVCSItem(loader[typ], nm, v)
-                        except Exception as err:
-                            print("failed", typ, nm, err)
+            if snapshot is None:
+                loadJson(jsn, lazy)
+            else:
+                # every element is needed to write the snapshot
+                journal = vcs.journal.start()
+                try:
+                    loaded = loadJson(jsn)
+                finally:
+                    vcs.journal.stop(journal)
+                saveSnapshot(script, snapshot, list(journal) + loaded)
         # ok could not read json file maybe it is an old initial.attributes
         except Exception as err:
             if os.path.split(script)[-1] == "initial.attributes":
                 _scriptrun(script)
             else:
                 warnings.warn("unable to source file: %s %s" % (script, err))
-    vcs._doValidation = True
+        finally:
+            vcs._doValidation = True
     return
 
 
+def _elementsType(typ):
+    if typ == "P":
+        return "template"
+    elif typ == "L":
+        return "list"
+    return _scriptLoader[typ]
+
+
+def _loadJsonItem(typ, nm, v, skip_protected=True):
+    if typ == "P":
+        try:
+            loadTemplate(str(nm), v)
+            return True
+        except Exception as err:
+            print("could not load tmpl:", nm, err)
+    else:
+        try:
+            loadVCSItem(_scriptLoader[typ], nm, v, skip_protected)
+            return True
+        except Exception as err:
+            print("failed", typ, nm, err)
+    return False
+
+
+def _loadLazy(load, *args, **kargs):
+    """Runs load(*args, **kargs) as the initial load would have: without
+    raising validation errors"""
+    validation = vcs._doValidation
+    vcs._doValidation = False
+    try:
+        load(*args, **kargs)
+    finally:
+        vcs._doValidation = validation
+
+
+def loadJson(jsn, lazy=False):
+    """Creates/updates the elements described in jsn (json attributes)
+
+    :param lazy: Register the elements that do not exist yet as lazy entries
+        instead of creating them
+
+    :returns: (elements type, name) of the elements loaded
+    :rtype: `list`_
+    """
+    keys = []
+    for k in ["Tt", "To", "Tl",
+              "Tm", "Proj"]:  # always read these first
+        if k in list(jsn.keys()):
+            keys.append(k)
+    for k in list(jsn.keys()):
+        if k not in keys:
+            keys.append(k)
+    loaded = []
+    for typ in keys:
+        e = _elementsType(typ)
+        for nm, v in jsn[typ].items():
+            if typ == "P":
+                nm = str(nm)
+            if lazy and typ != "L" and nm not in vcs.elements[e] and \
+                    nm not in vcs._protected_elements.get(e, ()):
+                vcs.elements[e].addLazy(nm, functools.partial(
+                    _loadLazy, _loadJsonItem, typ, nm, v, skip_protected=False))
+                loaded.append((e, nm))
+            elif _loadJsonItem(typ, nm, v):
+                loaded.append((e, nm))
+    return loaded
+
+
+def _classSlots(cls):
+    slots = []
+    for c in cls.__mro__:
+        slots += list(getattr(c, "__slots__", []))
+    return slots
+
+
+def _className(cls):
+    return "%s.%s" % (cls.__module__, cls.__name__)
+
+
+def _snapshotHeader(script):
+    with open(script, "rb") as f:
+        sha1 = hashlib.sha1(f.read()).hexdigest()
+    return {"version": SNAPSHOT_VERSION,
+            "python": tuple(sys.version_info[:2]),
+            "script": os.path.abspath(script),
+            "mtime": os.path.getmtime(script),
+            "sha1": sha1}
+
+
+def saveSnapshot(script, snapshot, keys):
+    """Writes the elements keys ((type, name) list) loaded from script to
+    snapshot. Failures are silent, the snapshot is only an optimization"""
+    tmp = snapshot + ".%i.tmp" % os.getpid()
+    try:
+        entries = []
+        classes = {}
+        done = set()
+        for e, nm in keys:
+            if (e, nm) in done or nm not in vcs.elements[e]:
+                continue
+            done.add((e, nm))
+            obj = vcs.elements[e][nm]
+            # one pickle per element so they can be restored lazily
+            entries.append((e, nm, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)))
+            classes[_className(type(obj))] = _classSlots(type(obj))
+        header = _snapshotHeader(script)
+        header["classes"] = classes
+        with open(tmp, "wb") as f:
+            pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(entries, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp, snapshot)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _restoreElement(e, nm, blob):
+    obj = pickle.loads(blob)
+    existing = vcs.elements[e].get(nm)
+    if existing is not None and type(existing) is type(obj) and hasattr(obj, "__slots__"):
+        # update in place, someone might hold a reference
+        for a in _classSlots(type(obj)):
+            if hasattr(obj, a):
+                object.__setattr__(existing, a, getattr(obj, a))
+        existing.__dict__.update(getattr(obj, "__dict__", {}))
+    else:
+        vcs.elements[e][nm] = obj
+
+
+def loadSnapshot(script, snapshot, lazy=False):
+    """Loads the elements of snapshot if it was made from script as it is now
+
+    Values in the snapshot were validated when script was first loaded,
+    they are assigned as is.
+
+    :param lazy: Register the elements that do not exist yet as lazy entries
+        instead of restoring them
+
+    :returns: True if the snapshot was loaded
+    :rtype: `bool`_
+    """
+    if not os.path.exists(snapshot):
+        return False
+    try:
+        with open(snapshot, "rb") as f:
+            header = pickle.load(f)
+            expected = _snapshotHeader(script)
+            for k in expected:
+                if header.get(k) != expected[k]:
+                    return False
+            for name, slots in header["classes"].items():
+                module, cls = name.rsplit(".", 1)
+                if _classSlots(getattr(sys.modules[module], cls)) != slots:
+                    # vcs changed since the snapshot was taken
+                    return False
+            entries = pickle.load(f)
+    except Exception:
+        return False
+    for e, nm, blob in entries:
+        if lazy and nm not in vcs.elements[e]:
+            vcs.elements[e].addLazy(nm, functools.partial(_restoreElement, e, nm, blob))
+        else:
+            _restoreElement(e, nm, blob)
+    return True
+
+
 def loadTemplate(nm, vals):
     try:
         t = vcs.gettemplate(nm)
@@ -1081,8 +1260,8 @@ def loadTemplate(nm, vals):
             setattr(t, k, v)
 
 
-def loadVCSItem(typ, nm, json_dict={}):
-    if typ in list(vcs._protected_elements.keys(
+def loadVCSItem(typ, nm, json_dict={}, skip_protected=True):
+    if skip_protected and typ in list(vcs._protected_elements.keys(
     )) and nm in vcs._protected_elements[typ]:
         # protected element do not overload
         return
@@ -1103,19 +1282,13 @@ def loadVCSItem(typ, nm, json_dict={}):
                       "default_xyvsy_", "default_yxvsx_"]:
             gm = vcs.elements[tp][nm]
     else:
-        cmd = "gm = vcs.create%s('%s')" % (typ, nm)
-        loc = locals()
-        exec(cmd)
-        gm = loc["gm"]
+        gm = getattr(vcs, "create%s" % typ)(nm)
     for a, v in json_dict.items():
         if isinstance(v, dict):
             if a == "Marker" and tp == "taylordiagram":
                 gm.addMarker()
                 for k in list(v.keys()):
-                    cmd = "gm.Marker.%s = %s" % (k, repr(v[k]))
-                    loc = locals()
-                    exec(cmd)
-                    gm = loc["gm"]
+                    setattr(gm.Marker, k, v[k])
             else:
                 for k in list(v.keys()):
                     try:
@@ -1129,11 +1302,8 @@ def loadVCSItem(typ, nm, json_dict={}):
             setattr(gm, a, v)
 
             if nm in vcs_deprecated_colormap_names:
-                cmd = "gm = vcs.create%s('%s')" % (
-                    typ, vcs_deprecated_colormap_names[nm])
-                loc = locals()
-                exec(cmd)
-                gm = loc["gm"]
+                gm = getattr(vcs, "create%s" % typ)(
+                    vcs_deprecated_colormap_names[nm])
                 setattr(gm, a, v)
 
     return gm
@@ -2197,19 +2367,8 @@ def match_color(color, colormap=None):
         colormap = 'default'
     cmap = vcs.getcolormap(colormap)
 
-    # Now tries determines the min rms diff
-    rmsmin = 2.E40
-    match = None
-    for i in list(cmap.index.keys()):
-        col = cmap.index[i]
-        rms = numpy.sqrt((vals[0] - col[0]) ** 2 +
-                         (vals[1] - col[1]) ** 2 +
-                         (vals[2] - col[2]) ** 2
-                         )
-        if rms < rmsmin:
-            rmsmin = rms
-            match = i
-    return match
+    # Now finds the closest cell
+    return cmap.index.nearest(vals[0], vals[1], vals[2])
 
 
 def monotonic(x):
@@ -2704,15 +2863,15 @@ def drawLinesAndMarkersLegend(canvas, templateLegend,
     while maxx * maxy < nlines:
         maxwidth = 0
         maxheight = 0
-        for i in range(nlines):
-            text.string = strings[i]
-            ext = canvas.gettextextent(text)[0]
+        # measure all the strings at once
+        text.string = list(strings[:nlines])
+        for ext in canvas.gettextextent(text):
             maxwidth = max(maxwidth, ext[1] - ext[0])
             maxheight = max(maxheight, ext[3] - ext[2])
         if nolines:
             leg_lines = 0.
             leg_spc = .015
-        elif len(strings[i]) > 4:
+        elif len(strings[nlines - 1]) > 4:
             leg_lines = maxwidth / 3.
             leg_spc = leg_lines / 3.
         else:
@@ -4,13 +4,14 @@ import vcs
 import vtk
 import numpy
 import json
+import collections
 import os
 import math
 from . import meshfill
 from vtk.util import numpy_support as VN
 import cdms2
 import warnings
-from .projection import round_projections, no_over_proj4_parameter_projections
+from .projection import no_over_proj4_parameter_projections
 from .vcsvtk import fillareautils
 import sys
 import numbers
@@ -151,6 +152,16 @@ def configureContextArea(area, dataBounds, screenGeom):
     axisTop.SetMargins(0, 0)
 
 
+def contextArea(plotsContext, dataBounds, screenGeom, batch=None, priority=1):
+    """Context area drawing dataBounds in screenGeom: the one batch already
+    uses for these at this priority if any, a new one otherwise"""
+    if batch is not None:
+        return batch.contextArea(dataBounds, screenGeom, priority)
+    area = plotsContext.newContextArea()
+    configureContextArea(area, dataBounds, screenGeom)
+    return area
+
+
 def growBounds(previousBounds, newBounds):
     nextBounds = [i for i in previousBounds]
 
@@ -190,6 +201,39 @@ def generateSolidColorArray(numTuples, color):
                            array_type=vtk.VTK_UNSIGNED_CHAR)
 
 
+# (colormap name, colormap stamp, colors) -> vtkLookupTable
+_lookupTables = {}
+
+
+def _colorKey(color):
+    if isinstance(color, (list, tuple)):
+        return tuple(color)
+    return color
+
+
+def lookupTable(cmap, colors):
+    """New vtkLookupTable with one entry per color (index, name or rgba)
+
+    The table is copied from one built once per colors and kept until cmap
+    is modified, plots with many levels do not convert every color again.
+    """
+    key = (cmap.name, cmap.index.stamp, tuple(_colorKey(c) for c in colors))
+    cached = _lookupTables.get(key)
+    if cached is None:
+        if len(_lookupTables) > 256:
+            _lookupTables.clear()
+        rgba = numpy.array([vcs.utils.rgba_color(c, cmap) for c in colors],
+                           dtype=float).reshape((-1, 4)) / 100.
+        cached = vtk.vtkLookupTable()
+        cached.SetNumberOfTableValues(len(rgba))
+        for i, (r, g, b, a) in enumerate(rgba):
+            cached.SetTableValue(i, r, g, b, a)
+        _lookupTables[key] = cached
+    lut = vtk.vtkLookupTable()
+    lut.DeepCopy(cached)
+    return lut
+
+
 def applyAttributesFromVCStmpl(tmpl, tmplattribute, txtobj=None):
     tatt = getattr(tmpl, tmplattribute)
     if txtobj is None:
@@ -797,14 +841,77 @@ def genGrid(data1, data2, gm, grid=None, geo=None, genVectors=False,
 vcsContinents = {}
 
 
-def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y: y):
-    """ This converts vcs continents files to vtkpolydata
-    Author: Charles Doutriaux
-    Input: vcs continent file name
-    """
-    poly = vtk.vtkPolyData()
-    cells = vtk.vtkCellArray()
-    pts = vtk.vtkPoints()
+# Simplifications (in world units) of continents available, picked by prepContinents
+CONTINENTS_LEVELS = tuple(.01 * 2 ** k for k in range(9))
+# Maximum distance (in pixels) between simplified and actual continents
+CONTINENTS_TOLERANCE = .25
+
+# (file name, modification time, x convert, y convert) -> _Continents
+_continents = {}
+
+
+class _Continents(object):
+    """Polylines of a continents file, and their simplifications (computed
+    the first time they are used)"""
+
+    def __init__(self, coords, counts):
+        # tolerance -> (coords, counts)
+        self.levels = {0.: (coords, counts)}
+
+    def level(self, tolerance):
+        """Polylines simplified by the largest of CONTINENTS_LEVELS not above
+        tolerance (the actual ones if there is none)"""
+        tolerance = max([t for t in CONTINENTS_LEVELS if t <= tolerance] + [0.])
+        if tolerance not in self.levels:
+            coords, counts = self.levels[0.]
+            keep = _simplifyPolylines(coords, counts, tolerance)
+            lineOf = numpy.repeat(numpy.arange(len(counts)), counts)
+            self.levels[tolerance] = (coords[keep], numpy.bincount(lineOf[keep], minlength=len(counts)))
+        return self.levels[tolerance]
+
+
+def _simplifyPolylines(coords, counts, tolerance):
+    """Douglas-Peucker simplification of the polylines (coords, counts):
+    mask of the points to keep for every polyline to stay within tolerance of
+    its points. All the polylines are processed at once, one level of the
+    recursion at a time."""
+    ends = numpy.cumsum(counts)
+    starts = ends - counts
+    keep = numpy.zeros(len(coords), dtype=bool)
+    keep[starts[counts > 0]] = True
+    keep[ends[counts > 0] - 1] = True
+    # pieces of polylines with points between their ends
+    lo = starts[counts > 2]
+    hi = ends[counts > 2] - 1
+    xy = coords[:, :2]
+    while len(lo):
+        inner = hi - lo - 1
+        firsts = numpy.cumsum(inner) - inner
+        piece = numpy.repeat(numpy.arange(len(lo)), inner)
+        ids = numpy.arange(inner.sum()) - firsts[piece] + lo[piece] + 1
+        a = xy[lo[piece]]
+        chord = xy[hi[piece]] - a
+        offset = xy[ids] - a
+        length = numpy.hypot(chord[:, 0], chord[:, 1])
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            distance = numpy.where(
+                length > 0,
+                numpy.abs(chord[:, 0] * offset[:, 1] - chord[:, 1] * offset[:, 0]) / length,
+                numpy.hypot(offset[:, 0], offset[:, 1]))
+        # furthest point of each piece: first of the piece once sorted by decreasing distance
+        furthest = numpy.lexsort((-distance, piece))[firsts]
+        split = distance[furthest] > tolerance
+        middle = ids[furthest][split]
+        keep[middle] = True
+        lo, hi = numpy.concatenate([lo[split], middle]), numpy.concatenate([middle, hi[split]])
+        lo, hi = lo[hi - lo > 1], hi[hi - lo > 1]
+    return keep
+
+
+def _readContinents(fnm, xConvertFunction, yConvertFunction):
+    """Points and number of points of the polylines of a continents file"""
+    xy = []
+    counts = []
     f = open(fnm)
     ln = f.readline()
     while ln.strip().split() != ["-99", "-99"]:
@@ -812,7 +919,6 @@ def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y:
         N = int(ln.split()[0])
         # Now create and store these points
         n = 0
-        npts = pts.GetNumberOfPoints()
         while n < N:
             ln = str(f.readline())
             sp = ln.split()
@@ -827,7 +933,7 @@ def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y:
                     for p in spts:
                         x = xConvertFunction(p[1])
                         y = yConvertFunction(p[0])
-                        pts.InsertNextPoint(x, y, 0.)
+                        xy.append((x, y))
                     n += sn
                     didIt = True
                 except Exception:
@@ -837,17 +943,33 @@ def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y:
                     l, L = float(ln[:8]), float(ln[8:16])
                     x = xConvertFunction(L)
                     y = yConvertFunction(l)
-                    pts.InsertNextPoint(x, y, 0.)
+                    xy.append((x, y))
                     ln = ln[16:]
                     n += 2
-        ln = vtk.vtkPolyLine()
-        ln.GetPointIds().SetNumberOfIds(N // 2)
-        for i in range(N // 2):
-            ln.GetPointIds().SetId(i, i + npts)
-        cells.InsertNextCell(ln)
+        counts.append(N // 2)
         ln = f.readline()
-    poly.SetPoints(pts)
-    poly.SetLines(cells)
+    f.close()
+    coords = numpy.zeros((len(xy), 3))
+    if xy:
+        coords[:, :2] = xy
+    return coords, numpy.array(counts, dtype=numpy.int64)
+
+
+def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y: y, tolerance=0.):
+    """ This converts vcs continents files to vtkpolydata
+    Author: Charles Doutriaux
+    Input: vcs continent file name
+    tolerance: distance (world units) the outlines may be simplified by,
+    files are parsed once and their simplifications kept
+    """
+    key = (fnm, os.path.getmtime(fnm), xConvertFunction, yConvertFunction)
+    continents = _continents.get(key)
+    if continents is None:
+        continents = _continents[key] = _Continents(*_readContinents(fnm, xConvertFunction, yConvertFunction))
+    coords, counts = continents.level(tolerance)
+    poly = vtk.vtkPolyData()
+    poly.SetPoints(_vtkPoints(coords))
+    poly.SetLines(_cellArray(counts))
 
     # The dataset has some duplicate lines that extend
     # outside of x=[-180, 180],
@@ -946,22 +1068,30 @@ def projectArray(w, projection, wc, geo=None):
         w.SetTypedTuple(i, tuple)
 
 
+def geoTransform(projection, wc):
+    """vtkGeoTransform from lon/lat to projection (a non linear one) over wc"""
+    x1, x2, y1, y2 = wc
+    if isinstance(projection, str):
+        projection = vcs.elements["projection"][projection]
+    geo = vtk.vtkGeoTransform()
+    ps = vtk.vtkGeoProjection()
+    pd = vtk.vtkGeoProjection()
+
+    apply_proj_parameters(pd, projection, x1, x2, y1, y2)
+
+    geo.SetSourceProjection(ps)
+    geo.SetDestinationProjection(pd)
+    return geo
+
+
 # Geo projection
 def project(pts, projection, wc, geo=None):
-    x1, x2, y1, y2 = wc
     if isinstance(projection, str):
         projection = vcs.elements["projection"][projection]
     if projection.type == "linear":
         return None, pts
     if geo is None:
-        geo = vtk.vtkGeoTransform()
-        ps = vtk.vtkGeoProjection()
-        pd = vtk.vtkGeoProjection()
-
-        apply_proj_parameters(pd, projection, x1, x2, y1, y2)
-
-        geo.SetSourceProjection(ps)
-        geo.SetDestinationProjection(pd)
+        geo = geoTransform(projection, wc)
     geopts = vtk.vtkPoints()
     geo.TransformPoints(pts, geopts)
     return geo, geopts
@@ -1425,27 +1555,80 @@ def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
     p.SetFontSize(int(to.height * winSize[1] / 800.))
 
 
-class TextActorWrapperItem(object):
-    def __init__(self, textActor):
-        self.textActor = textActor
+class TextActorsWrapperItem(object):
+    """Paints all the text actors in textActors, in order, in a single Paint
+    call (i.e. a single call into Python per render for all of them).
+
+    The actors stay the reference: editors move, hide or restyle them and
+    the next render shows it.
+    """
+
+    def __init__(self, textActors=()):
+        self.textActors = list(textActors)
 
     def Initialize(self, vtkSelf):
         return True
 
     def Paint(self, vtkSelf, context2D):
-        pos = self.textActor.GetPosition()
-        text = self.textActor.GetInput()
-        textProp = self.textActor.GetTextProperty()
-
-        context2D.ApplyTextProp(textProp)
-        context2D.DrawString(pos[0], pos[1], text)
+        for textActor in self.textActors:
+            if not textActor.GetVisibility():
+                continue
+            pos = textActor.GetPosition()
+            context2D.ApplyTextProp(textActor.GetTextProperty())
+            context2D.DrawString(pos[0], pos[1], textActor.GetInput())
 
         return False
 
 
+class TextActorWrapperItem(TextActorsWrapperItem):
+    def __init__(self, textActor):
+        super(TextActorWrapperItem, self).__init__([textActor])
+
+    @property
+    def textActor(self):
+        return self.textActors[0]
+
+
+# (projection, parameters, worldcoordinate) -> projected bounds of worldcoordinate
+# scanned by genTextActor when it is not given geoBounds
+_textWorldBounds = {}
+
+
+def _textWorldBoundsKey(tt):
+    proj = vcs.elements["projection"][tt.projection]
+    return (tt.projection, proj.type, repr(proj.parameters), tuple(tt.worldcoordinate))
+
+
+def _scanTextWorldBounds(tt, geo, cache):
+    """Projected bounds of the worldcoordinate of tt, stored in _textWorldBounds
+    if cache is True"""
+    wc = tt.worldcoordinate
+    pts_wc = vtk.vtkPoints()
+    # Scan a bunch of points within wc
+    # In case the proj deformation bring origin close
+    # from each others
+    for wx in numpy.arange(wc[0], wc[1], (wc[1] - wc[0]) / 25.):
+        for wy in numpy.arange(wc[2], wc[3], (wc[3] - wc[2]) / 25.):
+            pts_wc.InsertNextPoint(wx, wy, 0.)
+    _, pts_wc = project(pts_wc, tt.projection, tt.worldcoordinate, geo=geo)
+    as_numpy = VN.vtk_to_numpy(pts_wc.GetData())
+    wx = as_numpy[:, 0]
+    wy = as_numpy[:, 1]
+    wc = [wx.min(), wx.max(), wy.min(), wy.max()]
+    if cache:
+        if len(_textWorldBounds) >= 256:
+            _textWorldBounds.clear()
+        _textWorldBounds[_textWorldBoundsKey(tt)] = wc
+    return wc
+
+
 # def genTextActor(renderer, string=None, x=None, y=None,
 def genTextActor(contextArea, string=None, x=None, y=None,
-                 to='default', tt='default', cmap=None, geoBounds=None, geo=None):
+                 to='default', tt='default', cmap=None, geoBounds=None, geo=None,
+                 textItem=None):
+    """Adds an item painting the strings to contextArea, or appends the text
+    actors to textItem (a TextActorsWrapperItem painted by contextArea) if
+    given"""
 
     renderer = contextArea.GetDrawAreaItem().GetScene().GetRenderer()
 
@@ -1471,36 +1654,30 @@ def genTextActor(contextArea, string=None, x=None, y=None,
 
     sz = renderer.GetRenderWindow().GetSize()
     actors = []
-    pts = vtk.vtkPoints()
-    if vcs.elements["projection"][tt.projection].type != "linear":
+    projected = vcs.elements["projection"][tt.projection].type != "linear"
+    cacheBounds = geoBounds is None and geo is None
+    if projected:
         if geoBounds is not None:
             wc = geoBounds[:4]
+        elif cacheBounds:
+            wc = _textWorldBounds.get(_textWorldBoundsKey(tt))
         else:
             wc = None
+    # same property for all strings, actors get a copy
+    prop = vtk.vtkTextProperty()
+    prepTextProperty(prop, sz, to, tt, cmap)
 
     for i in range(n):
         t = vtk.vtkTextActor()
-        p = t.GetTextProperty()
-        prepTextProperty(p, sz, to, tt, cmap)
-        pts = vtk.vtkPoints()
-        pts.InsertNextPoint(x[i], y[i], 0.)
-        if vcs.elements["projection"][tt.projection].type != "linear":
-            _, pts = project(pts, tt.projection, tt.worldcoordinate, geo=geo)
+        t.GetTextProperty().ShallowCopy(prop)
+        if projected:
+            pts = vtk.vtkPoints()
+            pts.InsertNextPoint(x[i], y[i], 0.)
+            # the transform is built once and reused for the next strings
+            geo, pts = project(pts, tt.projection, tt.worldcoordinate, geo=geo)
             X, Y, tz = pts.GetPoint(0)
             if wc is None:
-                wc = tt.worldcoordinate
-                pts_wc = vtk.vtkPoints()
-                # Scan a bunch of points within wc
-                # In case the proj deformation bring origin close
-                # from each others
-                for wx in numpy.arange(wc[0], wc[1], (wc[1] - wc[0]) / 25.):
-                    for wy in numpy.arange(wc[2], wc[3], (wc[3] - wc[2]) / 25.):
-                        pts_wc.InsertNextPoint(wx, wy, 0.)
-                _, pts_wc = project(pts_wc, tt.projection, tt.worldcoordinate, geo=geo)
-                as_numpy = VN.vtk_to_numpy(pts_wc.GetData())
-                wx = as_numpy[:, 0]
-                wy = as_numpy[:, 1]
-                wc = [wx.min(), wx.max(), wy.min(), wy.max()]
+                wc = _scanTextWorldBounds(tt, geo, cacheBounds)
             X, Y = world2Renderer(renderer, X, Y, tt.viewport, wc)
         else:
             X, Y = world2Renderer(
@@ -1508,21 +1685,25 @@ def genTextActor(contextArea, string=None, x=None, y=None,
         t.SetPosition(X, Y)
         t.SetInput(string[i])
 
+        actors.append(t)
+
+    if textItem is not None:
+        textItem.textActors.extend(actors)
+    elif actors:
         item = vtk.vtkPythonItem()
-        item.SetPythonObject(TextActorWrapperItem(t))
+        item.SetPythonObject(TextActorsWrapperItem(actors))
         contextArea.GetDrawAreaItem().AddItem(item)
 
-        actors.append(t)
-
     return actors
 
 
 def prepPrimitive(prim):
     if prim.x is None or prim.y is None:
         return 0
-    if not isinstance(prim.x[0], (list, tuple)):
+    # segments may be numpy arrays (see Pipeline1D)
+    if not isinstance(prim.x[0], (list, tuple, numpy.ndarray)):
         prim.x = [prim.x, ]
-    if not isinstance(prim.y[0], (list, tuple)):
+    if not isinstance(prim.y[0], (list, tuple, numpy.ndarray)):
         prim.y = [prim.y, ]
     if vcs.isfillarea(prim):
         atts = ["x", "y", "color", "style", "index"]
@@ -1535,9 +1716,10 @@ def prepPrimitive(prim):
         n = max(n, len(getattr(prim, a)))
     for a in atts:
         v = getattr(prim, a)
-        while len(v) < n:
-            v.append(v[-1])
-        setattr(prim, a, v)
+        if len(v) < n:
+            while len(v) < n:
+                v.append(v[-1])
+            setattr(prim, a, v)
 
     # Handle fillarea opacity case, where the default will depend on the style
     if vcs.isfillarea(prim):
@@ -1555,22 +1737,131 @@ def prepPrimitive(prim):
     return n
 
 
-def __build_pd__():
+def _raggedCoordinates(xs, ys):
+    """Flat (npoints, 3) array of the points of the ragged coordinate lists
+    xs and ys, and the number of points of each list. The shorter of a pair
+    of lists is extended with its last value"""
+    counts = numpy.array([max(len(x), len(y)) for x, y in zip(xs, ys)], dtype=numpy.int64)
+    coords = numpy.zeros((int(counts.sum()), 3))
+    if len(coords):
+        for axis, lists in ((0, xs), (1, ys)):
+            coords[:, axis] = numpy.concatenate(
+                [v if len(v) == c else list(v) + [v[-1]] * (c - len(v)) for v, c in zip(lists, counts) if c > 0])
+    return coords, counts
+
+
+def _cellArray(counts, ids=None):
+    """vtkCellArray with a cell of counts[i] points per entry of counts,
+    made of the successive point ids (or of the successive values of ids)"""
+    n = len(counts)
+    npts = int(counts.sum())
+    # legacy cell array layout: count followed by the point ids, per cell
+    cells = numpy.empty(n + npts, dtype=numpy.int64)
+    heads = numpy.cumsum(counts) - counts + numpy.arange(n)
+    isId = numpy.ones(len(cells), dtype=bool)
+    isId[heads] = False
+    cells[heads] = counts
+    cells[isId] = numpy.arange(npts) if ids is None else ids
+    cellArray = vtk.vtkCellArray()
+    cellArray.SetCells(n, VN.numpy_to_vtkIdTypeArray(cells, deep=True))
+    return cellArray
+
+
+def _segmentStarts(counts):
+    """Ids of the points followed by another point of the same polyline"""
+    starts = numpy.ones(int(counts.sum()), dtype=bool)
+    starts[(numpy.cumsum(counts) - 1)[counts > 0]] = False
+    return numpy.nonzero(starts)[0]
+
+
+def _densifySegments(coords, counts, geo, tolerance, maxDepth=7):
+    """Inserts points in the segments of the polylines (coords, counts), so
+    that they follow their projection by geo: pieces of segments are split
+    in two (at most maxDepth times) while their projected middle is further
+    than tolerance (projected units) from their projected chord"""
+    starts = _segmentStarts(counts)
+    lineOf = numpy.repeat(numpy.arange(len(counts)), counts)
+    projected = _projectCoordinates(coords, geo)
+    # pieces of segments still to check: segment start, t range, projected ends
+    seg = starts
+    t0 = numpy.zeros(len(seg))
+    t1 = numpy.ones(len(seg))
+    p0 = projected[seg]
+    p1 = projected[seg + 1]
+    keys = [numpy.arange(len(coords), dtype=float)]
+    points = [coords]
+    newCounts = counts.copy()
+    with numpy.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        for depth in range(maxDepth):
+            if not len(seg):
+                break
+            tm = (t0 + t1) / 2.
+            mid = coords[seg] + tm[:, numpy.newaxis] * (coords[seg + 1] - coords[seg])
+            pm = _projectCoordinates(mid, geo)
+            chord = p1 - p0
+            offset = pm - p0
+            length = numpy.hypot(chord[:, 0], chord[:, 1])
+            deviation = numpy.where(
+                length > 0,
+                numpy.abs(chord[:, 0] * offset[:, 1] - chord[:, 1] * offset[:, 0]) / length,
+                numpy.hypot(offset[:, 0], offset[:, 1]))
+            # points projected to infinity (nan deviation) are split too
+            split = ~(deviation <= tolerance)
+            keys.append(seg[split] + tm[split])
+            points.append(mid[split])
+            numpy.add.at(newCounts, lineOf[seg[split]], 1)
+            seg = numpy.concatenate([seg[split], seg[split]])
+            t0, t1 = numpy.concatenate([t0[split], tm[split]]), numpy.concatenate([tm[split], t1[split]])
+            p0, p1 = numpy.concatenate([p0[split], pm[split]]), numpy.concatenate([pm[split], p1[split]])
+    order = numpy.argsort(numpy.concatenate(keys), kind="stable")
+    return numpy.concatenate(points)[order], newCounts
+
+
+def _projectCoordinates(coords, geo):
+    """x, y of the (n, 3) coords transformed by geo"""
+    projected = vtk.vtkPoints()
+    projected.SetDataTypeToDouble()
+    geo.TransformPoints(_vtkPoints(coords), projected)
+    return VN.vtk_to_numpy(projected.GetData())[:, :2]
+
+
+def _vtkPoints(coords):
     pts = vtk.vtkPoints()
-    polygons = vtk.vtkCellArray()
+    pts.SetData(VN.numpy_to_vtk(coords, deep=True))
+    return pts
+
+
+def _colorArray(rgba, name="Colors"):
+    """unsigned char array of the (n, 4) rgba colors (0-100 components)"""
+    colors = VN.numpy_to_vtk((numpy.asarray(rgba, dtype=float).reshape(-1, 4) / 100. * 255).astype(numpy.uint8),
+                             deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+    colors.SetName(name)
+    return colors
+
+
+def _polygons(farea, indices):
+    """Polydata of the polygons of farea at indices"""
+    xs = [farea.x[i] for i in indices]
+    ys = [farea.y[i] for i in indices]
+    for x, y in zip(xs, ys):
+        assert(len(x) == len(y))
+    coords, counts = _raggedCoordinates(xs, ys)
     polygonPolyData = vtk.vtkPolyData()
-    polygonPolyData.SetPoints(pts)
-    polygonPolyData.SetPolys(polygons)
-    return pts, polygons, polygonPolyData
+    polygonPolyData.SetPoints(_vtkPoints(coords))
+    polygonPolyData.SetPolys(_cellArray(counts))
+    return polygonPolyData
 
 
-def prepFillarea(context, renWin, farea, cmap=None):
-    vp = farea.viewport
+def _fillareaColor(farea, cmap, i, c):
+    """rgba (0-100) of color c of polygon i, with the opacity of farea"""
+    color = list(cmap.index[c]) if isinstance(c, int) else list(c)
+    if len(farea.opacity) > i and farea.opacity[i] is not None:
+        color[-1] = farea.opacity[i]
+    return color
 
-    # view and interactive area
-    view = context.contextView
-    area = vtk.vtkContextArea()
-    view.GetScene().AddItem(area)
+
+def prepFillarea(context, renWin, farea, cmap=None, batch=None):
+    vp = farea.viewport
 
     wc = farea.worldcoordinate
     rect = vtk.vtkRectd(wc[0], wc[2], wc[1] - wc[0], wc[3] - wc[2])
@@ -1581,30 +1872,14 @@ def prepFillarea(context, renWin, farea, cmap=None):
                         int(round((vp[1] - vp[0]) * renWinWidth)),
                         int(round((vp[3] - vp[2]) * renWinHeight)))
 
-    area.SetDrawAreaBounds(rect)
-    area.SetGeometry(geom)
-    area.SetFillViewport(False)
-    area.SetShowGrid(False)
-
-    axisLeft = area.GetAxis(vtk.vtkAxis.LEFT)
-    axisRight = area.GetAxis(vtk.vtkAxis.RIGHT)
-    axisBottom = area.GetAxis(vtk.vtkAxis.BOTTOM)
-    axisTop = area.GetAxis(vtk.vtkAxis.TOP)
-    axisTop.SetVisible(False)
-    axisRight.SetVisible(False)
-    axisLeft.SetVisible(False)
-    axisBottom.SetVisible(False)
-
-    axisTop.SetMargins(0, 0)
-    axisRight.SetMargins(0, 0)
-    axisLeft.SetMargins(0, 0)
-    axisBottom.SetMargins(0, 0)
-
     n = prepPrimitive(farea)
     if n == 0:
         return []
     actors = []
 
+    # view and interactive area
+    area = contextArea(context, rect, geom, batch, farea.priority)
+
     # Find color map:
     if farea.colormap is not None:
         cmap = farea.colormap
@@ -1613,78 +1888,27 @@ def prepFillarea(context, renWin, farea, cmap=None):
     if isinstance(cmap, str):
         cmap = vcs.elements["colormap"][cmap]
 
-    # Create data structures
-    pts, polygons, polygonPolyData = __build_pd__()
-    colors = vtk.vtkUnsignedCharArray()
-    colors.SetNumberOfComponents(4)
-    colors.SetNumberOfTuples(n)
-    colors.SetName("Colors")
-    polygonPolyData.GetCellData().SetScalars(colors)
+    solid = [i for i in range(n) if farea.style[i] == "solid"]
+    # solid polygons all go to one polydata, with their colors as cell scalars
+    polygonPolyData = _polygons(farea, solid)
+    polygonPolyData.GetCellData().SetScalars(
+        _colorArray([_fillareaColor(farea, cmap, i, farea.color[i]) for i in solid]))
+    pts = polygonPolyData.GetPoints()
 
+    # each pattern/hatch polygon gets its own polydata, on a transparent background
     pattern_polydatas = []
-
-    # Iterate through polygons:
+    pattern_colors = {}
     for i in range(n):
-        x = farea.x[i]
-        y = farea.y[i]
         st = farea.style[i]
-        if st == "pattern":
-            c = (0., 0., 0., 100.)
-        else:
-            c = farea.color[i]
-
         if st == "solid":
-            points, polys, pd, color_arr = pts, polygons, polygonPolyData, colors
-        else:
-            points, polys, pd = __build_pd__()
-            color_arr = vtk.vtkUnsignedCharArray()
-            color_arr.SetNumberOfComponents(4)
-            color_arr.SetNumberOfTuples(1)
-            color_arr.SetName("BackgroundColors")
-            pd.GetCellData().SetScalars(color_arr)
-            pattern_polydatas.append([i, pd])
-
-        N = max(len(x), len(y))
-
-        for a in [x, y]:
-            assert(len(a) == N)
-
-        polygon = vtk.vtkPolygon()
-        # Add current polygon
-        pid = polygon.GetPointIds()
-        pid.SetNumberOfIds(N)
-
-        for j in range(N):
-            pid.SetId(j, points.InsertNextPoint(x[j], y[j], 0.))
-        cellId = polys.InsertNextCell(polygon)
-
-        if isinstance(c, int):
-            color = [C for C in cmap.index[c]]
-        else:
-            color = [C for C in c]
-        if len(farea.opacity) > i:
-            opacity = farea.opacity[i]
-            if opacity is not None:
-                opacity = farea.opacity[i]
-        else:
-            opacity = None
-        # Draw colored background for solid
-        # transparent/white background for hatches/patterns
-        # Add the color to the color array:
-        if opacity is not None:
-            color[-1] = opacity
-        color = [int(C / 100. * 255) for C in color]
-        if st == 'solid':
-            # In this case, colors is our scalar array
-            # so, add the color at the cell index
-            color_arr.SetTypedTuple(cellId, color)
-        else:
-            # In this case, colors is a backup array that represents colors
-            # for the pattern in each polygon. Each tuple in the colors array
-            # should represent the pattern color for the indexed polygon
-            colors.SetTypedTuple(i, color)
-            # color_arr is our scalar array
-            color_arr.SetTypedTuple(cellId, [255, 255, 255, 0])
+            continue
+        pd = _polygons(farea, [i])
+        pd.GetCellData().SetScalars(_colorArray([100, 100, 100, 0], "BackgroundColors"))
+        pattern_polydatas.append([i, pd])
+        c = (0., 0., 0., 100.) if st == "pattern" else farea.color[i]
+        # same rounding as the colors of the vtk arrays
+        pattern_colors[i] = [int(C / 100. * 255) * 100. / 255.
+                             for C in _fillareaColor(farea, cmap, i, c)]
 
     # Transform points
     geo, pts = project(pts, farea.projection, farea.worldcoordinate)
@@ -1715,9 +1939,7 @@ def prepFillarea(context, renWin, farea, cmap=None):
                 pd.GetPoints(), farea.projection, farea.worldcoordinate)
             pd.SetPoints(proj_points)
 
-            cellcolor = [0, 0, 0, 0]
-            colors.GetTypedTuple(i, cellcolor)
-            pcolor = [indC * 100. / 255.0 for indC in cellcolor]
+            pcolor = pattern_colors[i]
 
             if len(farea.x[i]) >= 3:
                 screenGeom = [
@@ -1977,19 +2199,13 @@ def prepMarker(marker, screenGeom, scale=None, cmap=None):
     if n == 0:
         return []
     actors = []
+    coords, counts = _raggedCoordinates(marker.x[:n], marker.y[:n])
+    offsets = numpy.cumsum(counts) - counts
     for i in range(n):
         g = vtk.vtkGlyph2D()
         markers = vtk.vtkPolyData()
-        x = marker.x[i]
-        y = marker.y[i]
         c = marker.color[i]
-        N = max(len(x), len(y))
-        for a in [x, y]:
-            while len(a) < n:
-                a.append(a[-1])
-        pts = vtk.vtkPoints()
-        for j in range(N):
-            pts.InsertNextPoint(x[j], y[j], 0.)
+        pts = _vtkPoints(coords[offsets[i]:offsets[i] + counts[i]])
         geo, pts = project(pts, marker.projection, marker.worldcoordinate)
         markers.SetPoints(pts)
 
@@ -2013,12 +2229,9 @@ def prepMarker(marker, screenGeom, scale=None, cmap=None):
 
         vtk_color = getMarkerColor(marker, c, cmap)
 
-        colors = vtk.vtkUnsignedCharArray()
+        colors = VN.numpy_to_vtk(numpy.tile(numpy.array(vtk_color, dtype=numpy.uint8), (numCells, 1)),
+                                 deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
         colors.SetName('Colors')
-        colors.SetNumberOfComponents(4)
-
-        for j in range(numCells):
-            colors.InsertNextTypedTuple(vtk_color)
 
         cellData.AddArray(colors)
 
@@ -2027,18 +2240,6 @@ def prepMarker(marker, screenGeom, scale=None, cmap=None):
     return actors
 
 
-def __build_ld__():
-    pts = vtk.vtkPoints()
-    lines = vtk.vtkCellArray()
-    linePolyData = vtk.vtkPolyData()
-    linePolyData.SetPoints(pts)
-    linePolyData.SetLines(lines)
-    colors = vtk.vtkUnsignedCharArray()
-    colors.SetNumberOfComponents(4)
-    colors.SetName("Colors")
-    return pts, lines, linePolyData, colors
-
-
 def stippleLine(prop, line_type):
     if line_type == 'long-dash':
         prop.SetLineStipplePattern(int('0000111111111111', 2))
@@ -2104,33 +2305,51 @@ def getProjectedBoundsForWorldCoords(wc, proj, subdiv=50):
     return xformPts.GetBounds()
 
 
-def prepLine(plotsContext, line, geoBounds=None, cmap=None):
+# Maximum distance (in pixels) between projected lines and the exact curves
+DENSIFY_TOLERANCE = .5
+
+
+def _lineContextArea(plotsContext, line, batch=None):
+    """Context area mapping the (projected) world coordinates of line to its
+    viewport, and the size of a pixel in projected coordinates"""
     numDivisions = 50
     if vcs.elements["projection"][line.projection].type == "aeqd":
         numDivisions = 100
 
-    # print('Inside prepLine, about to get projected bounds for world coordinates')
-
     projBounds = getProjectedBoundsForWorldCoords(
         line.worldcoordinate, line.projection, subdiv=numDivisions)
 
-    # print('prepping a line')
-    # print('  projection type = {0}'.format(vcs.elements["projection"][line.projection].type))
-    # print('  wc = {0}'.format(line.worldcoordinate))
-    # print('  projected bounds = {0}'.format(projBounds))
-    # print('  vp = {0}'.format(line.viewport))
-    # print('  coords')
-    # print('    x = {0}'.format(line.x))
-    # print('    y = {0}'.format(line.y))
+    vp = line.viewport
 
-    number_lines = prepPrimitive(line)
-    if number_lines == 0:
-        return []
+    wc = projBounds
 
-    actors = []
+    doAdjustBounds = True
+    boundsAdjustment = 1.005
+
+    if doAdjustBounds:
+        wc = adjustBounds(wc, boundsAdjustment, boundsAdjustment)
+    rect = vtk.vtkRectd(wc[0], wc[2], wc[1] - wc[0], wc[3] - wc[2])
+
+    [renWinWidth, renWinHeight] = plotsContext.renWin.GetSize()
+    if doAdjustBounds:
+        vp = adjustBounds(vp, boundsAdjustment, boundsAdjustment)
+    geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
+                        int(round(vp[2] * renWinHeight)),
+                        int(round((vp[1] - vp[0]) * renWinWidth)),
+                        int(round((vp[3] - vp[2]) * renWinHeight)))
+
+    area = contextArea(plotsContext, rect, geom, batch, line.priority)
+    # size of a pixel in projected coordinates
+    pixel = min(rect.GetWidth() / max(geom.GetWidth(), 1), rect.GetHeight() / max(geom.GetHeight(), 1))
+    return area, pixel
 
-    line_data = {}
 
+def _collectLine(line, cmap, line_data, pixel):
+    """Appends the segments of line (prepPrimitive'd already) to line_data,
+    a dict (type, width) -> [points, segment colors] chunks in world
+    coordinates. On geographic projections, segments get enough points for
+    their projection to be within DENSIFY_TOLERANCE of a pixel (pixel, in
+    projected units) of the exact curve"""
     if line.colormap is not None:
         cmap = line.colormap
     elif cmap is None:
@@ -2139,96 +2358,41 @@ def prepLine(plotsContext, line, geoBounds=None, cmap=None):
     if isinstance(cmap, str):
         cmap = vcs.elements["colormap"][cmap]
 
-    for i in range(number_lines):
-
-        x = line.x[i]
-        y = line.y[i]
-        if isinstance(line.color[i], int):
-            c = cmap.index[line.color[i]]
-        else:
-            c = line.color[i]
-        w = line.width[i]
-        t = line.type[i]
-
-        if (t, w) not in line_data:
-            line_data[(t, w)] = __build_ld__()
-        pts, lines, linesPoly, colors = line_data[(t, w)]
-        vtk_color = [int(component / 100. * 255) for component in c]
-
-        number_points = max(len(x), len(y))
-
-        point_offset = pts.GetNumberOfPoints()
-        # Extend x or y to the length of the other by duplicating the last
-        # coord.
-        for a in [x, y]:
-            while len(a) < number_points:
-                a.append(a[-1])
-
-        if vcs.elements["projection"][line.projection].type == "linear":
-            for j in range(number_points):
-                pts.InsertNextPoint(x[j], y[j], 0.)
-            n2 = number_points - 1
-        else:
-            pts.InsertNextPoint(x[0], y[0], 0.)
-            n2 = 0
-            for j in range(1, number_points):
-                if vcs.elements["projection"][
-                        line.projection].type in round_projections:
-                    NPointsInterp = 50
-                else:
-                    NPointsInterp = 25
-                for i in range(1, NPointsInterp + 1):
-                    if x[j] != x[j - 1]:
-                        tmpx = x[j - 1] + \
-                            float(i) / NPointsInterp * (x[j] - x[j - 1])
-                    else:
-                        tmpx = x[j]
-                    if y[j] != y[j - 1]:
-                        tmpy = y[j - 1] + \
-                            float(i) / NPointsInterp * (y[j] - y[j - 1])
-                    else:
-                        tmpy = y[j]
-                    pts.InsertNextPoint(tmpx, tmpy, 0.)
-                    n2 += 1
-        for j in range(n2):
-            colors.InsertNextTypedTuple(vtk_color)
-            ln_tmp = vtk.vtkLine()
-            ln_tmp.GetPointIds().SetId(0, j + point_offset)
-            ln_tmp.GetPointIds().SetId(1, j + point_offset + 1)
-            lines.InsertNextCell(ln_tmp)
-
-    for t, w in line_data:
-        pts, _, linesPoly, colors = line_data[(t, w)]
-
-        linesPoly.GetCellData().SetScalars(colors)
-        geoTransform, pts = project(pts, line.projection, line.worldcoordinate)
-        linesPoly.SetPoints(pts)
-
-        view = plotsContext.contextView
-
-        area = vtk.vtkContextArea()
-        view.GetScene().AddItem(area)
+    projType = vcs.elements["projection"][line.projection].type
 
-        vp = line.viewport
+    geo = None if projType == "linear" else geoTransform(line.projection, line.worldcoordinate)
 
-        wc = projBounds
+    groups = collections.OrderedDict()
+    for i in range(len(line.x)):
+        groups.setdefault((line.type[i], line.width[i]), []).append(i)
 
-        doAdjustBounds = True
-        boundsAdjustment = 1.005
+    for key, indices in groups.items():
+        coords, counts = _raggedCoordinates([line.x[i] for i in indices],
+                                            [line.y[i] for i in indices])
+        if geo is not None:
+            # so that segments follow the projection
+            coords, counts = _densifySegments(coords, counts, geo, DENSIFY_TOLERANCE * pixel)
+        rgba = [cmap.index[line.color[i]] if isinstance(line.color[i], int) else line.color[i]
+                for i in indices]
+        colors = numpy.repeat(numpy.array(rgba, dtype=float), numpy.maximum(counts - 1, 0), axis=0)
+        line_data.setdefault(key, []).append((coords, counts, colors))
 
-        if doAdjustBounds:
-            wc = adjustBounds(wc, boundsAdjustment, boundsAdjustment)
-        rect = vtk.vtkRectd(wc[0], wc[2], wc[1] - wc[0], wc[3] - wc[2])
 
-        [renWinWidth, renWinHeight] = plotsContext.renWin.GetSize()
-        if doAdjustBounds:
-            vp = adjustBounds(vp, boundsAdjustment, boundsAdjustment)
-        geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
-                            int(round(vp[2] * renWinHeight)),
-                            int(round((vp[1] - vp[0]) * renWinWidth)),
-                            int(round((vp[3] - vp[2]) * renWinHeight)))
-
-        configureContextArea(area, rect, geom)
+def _addLineItems(area, projection, worldcoordinate, line_data):
+    """Projects line_data and adds one polydata item per (type, width) to area"""
+    for t, w in line_data:
+        chunks = line_data[(t, w)]
+        coords = numpy.concatenate([chunk[0] for chunk in chunks])
+        counts = numpy.concatenate([chunk[1] for chunk in chunks])
+        starts = _segmentStarts(counts)
+
+        linesPoly = vtk.vtkPolyData()
+        colors = _colorArray(numpy.concatenate([chunk[2] for chunk in chunks]))
+        linesPoly.SetLines(_cellArray(numpy.full(len(starts), 2, dtype=numpy.int64),
+                                      numpy.stack([starts, starts + 1], axis=1).ravel()))
+        linesPoly.GetCellData().SetScalars(colors)
+        geoTransform, pts = project(_vtkPoints(coords), projection, worldcoordinate)
+        linesPoly.SetPoints(pts)
 
         intValue = vtk.vtkIntArray()
         intValue.SetNumberOfComponents(1)
@@ -2248,7 +2412,86 @@ def prepLine(plotsContext, line, geoBounds=None, cmap=None):
         item.SetMappedColors(colors)
         area.GetDrawAreaItem().AddItem(item)
 
-    return actors
+
+def prepLine(plotsContext, line, geoBounds=None, cmap=None):
+    number_lines = prepPrimitive(line)
+    if number_lines == 0:
+        return []
+
+    line_data = {}
+    area, pixel = _lineContextArea(plotsContext, line)
+    _collectLine(line, cmap, line_data, pixel)
+    _addLineItems(area, line.projection, line.worldcoordinate, line_data)
+    return []
+
+
+class PrimitiveBatch(object):
+    """Merges the context areas and items of the primitives drawn while a
+    template is rendered.
+
+    Primitives drawing the same bounds in the same screen geometry, at the
+    same priority, share a context area. Lines sharing viewport, world
+    coordinates and projection get one polydata item per (type, width)
+    filled when the batch is flushed. Texts sharing the canvas viewport are
+    painted by a single item. The number of context areas and items then
+    depends on the number of panels rather than on the number of ticks.
+    """
+
+    def __init__(self, plotsContext):
+        self.context = plotsContext
+        # (bounds, geometry, priority) -> area
+        self._areas = {}
+        # (viewport, worldcoordinate, projection, priority) -> [area, pixel size, line_data]
+        self._lines = collections.OrderedDict()
+        # canvas viewport -> (area, TextActorsWrapperItem)
+        self._texts = {}
+
+    def contextArea(self, dataBounds, screenGeom, priority=1):
+        """Context area drawing dataBounds (vtkRectd) in screenGeom (vtkRecti)"""
+        key = ((dataBounds.GetX(), dataBounds.GetY(), dataBounds.GetWidth(), dataBounds.GetHeight()),
+               (screenGeom.GetX(), screenGeom.GetY(), screenGeom.GetWidth(), screenGeom.GetHeight()),
+               priority)
+        area = self._areas.get(key)
+        if area is None:
+            area = self._areas[key] = self.context.newContextArea()
+            configureContextArea(area, dataBounds, screenGeom)
+        return area
+
+    def line(self, line, cmap=None):
+        if prepPrimitive(line) == 0:
+            return
+        key = (tuple(line.viewport), tuple(line.worldcoordinate), line.projection, line.priority)
+        entry = self._lines.get(key)
+        if entry is None:
+            entry = self._lines[key] = list(_lineContextArea(self.context, line, self)) + [{}]
+        _collectLine(line, cmap, entry[2], entry[1])
+
+    def textArea(self, vp):
+        """Context area (window pixels, geometry vp) and item texts go to"""
+        key = tuple(vp)
+        entry = self._texts.get(key)
+        if entry is None:
+            [renWinWidth, renWinHeight] = self.context.renWin.GetSize()
+            geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
+                                int(round(vp[2] * renWinHeight)),
+                                int(round((vp[1] - vp[0]) * renWinWidth)),
+                                int(round((vp[3] - vp[2]) * renWinHeight)))
+            rect = vtk.vtkRectd(0.0, 0.0, float(renWinWidth), float(renWinHeight))
+            area = self.contextArea(rect, geom, "text")
+            wrapper = TextActorsWrapperItem()
+            item = vtk.vtkPythonItem()
+            item.SetPythonObject(wrapper)
+            area.GetDrawAreaItem().AddItem(item)
+            entry = self._texts[key] = (area, wrapper)
+        return entry
+
+    def flush(self):
+        """Adds the merged line items to their areas"""
+        for (vp, wc, projection, priority), (area, pixel, line_data) in self._lines.items():
+            _addLineItems(area, projection, list(wc), line_data)
+        self._lines.clear()
+        self._texts.clear()
+        self._areas.clear()
 
 
 def getRendererCorners(Renderer, vp=[0., 1., 0., 1.]):
@@ -97,9 +97,7 @@ class BoxfillPipeline(Pipeline2D):
         fareapixelspacing, fareapixelscale = self._patternSpacingAndScale()
 
         # view and interactive area
-        view = self._context().contextView
-        area = vtk.vtkInteractiveArea()
-        view.GetScene().AddItem(area)
+        area = self._context().newContextArea(interactive=True)
 
         [renWinWidth, renWinHeight] = self._context().renWin.GetSize()
         # vp = vcs2vtk.adjustBounds(vp, 0.9, 0.9)
@@ -317,12 +315,7 @@ class BoxfillPipeline(Pipeline2D):
         while len(self._contourColors) < numLevels:
             self._contourColors.append(self._contourColors[-1])
 
-        lut = vtk.vtkLookupTable()
-        lut.SetNumberOfTableValues(numLevels)
-        _colorMap = self.getColorMap()
-        for i in range(numLevels):
-            r, g, b, a = self.getColorIndexOrRGBA(_colorMap, self._contourColors[i])
-            lut.SetTableValue(i, r / 100., g / 100., b / 100., a / 100.)
+        lut = vcs2vtk.lookupTable(self.getColorMap(), self._contourColors[:numLevels])
 
         mapper.SetLookupTable(lut)
         if numpy.allclose(self._contourLevels[0], -1.e20):
@@ -91,11 +91,7 @@ class IsofillPipeline(Pipeline2D):
             while len(self._contourColors) < len(self._contourLevels):
                 self._contourColors.append(self._contourColors[-1])
 
-            lut = vtk.vtkLookupTable()
-            lut.SetNumberOfTableValues(numLevels)
-            for i in range(numLevels):
-                r, g, b, a = self.getColorIndexOrRGBA(_colorMap, self._contourColors[i])
-                lut.SetTableValue(i, r / 100., g / 100., b / 100., a / 100.)
+            lut = vcs2vtk.lookupTable(_colorMap, self._contourColors[:numLevels])
 
             mapper.SetLookupTable(lut)
             if numpy.allclose(self._contourLevels[0], -1.e20):
@@ -120,9 +116,7 @@ class IsofillPipeline(Pipeline2D):
                                    self._template.data.y1, self._template.data.y2])
 
         # view and interactive area
-        view = self._context().contextView
-        area = vtk.vtkInteractiveArea()
-        view.GetScene().AddItem(area)
+        area = self._context().newContextArea(interactive=True)
 
         adjusted_plotting_bounds = vcs2vtk.getProjectedBoundsForWorldCoords(
             plotting_dataset_bounds, self._gm.projection)
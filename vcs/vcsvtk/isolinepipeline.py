@@ -130,9 +130,7 @@ class IsolinePipeline(Pipeline2D):
              self._template.data.y1, self._template.data.y2])
 
         # view and interactive area
-        view = self._context().contextView
-        area = vtk.vtkInteractiveArea()
-        view.GetScene().AddItem(area)
+        area = self._context().newContextArea(interactive=True)
 
         adjusted_plotting_bounds = vcs2vtk.getProjectedBoundsForWorldCoords(
             plotting_dataset_bounds, self._gm.projection)
@@ -149,7 +147,9 @@ class IsolinePipeline(Pipeline2D):
         # FIXME: This render call is needed to work around a bug somewhere in the
         # FIXME: vtkContextTransform code, where the transformation represented by
         # FIXME: Map[To|From]Scene() isn't set up properly until after a render call.
-        self._context().renWin.Render()
+        # Only labels are placed with that transform when the items are built, the
+        # render can wait for the end of a batch otherwise.
+        self._context().render(force=bool(self._gm.label))
 
         for i, l in enumerate(tmpLevels):
             numLevels = len(l)
@@ -164,12 +164,8 @@ class IsolinePipeline(Pipeline2D):
             # TODO remove update
             cot.Update()
 
-            lut = vtk.vtkLookupTable()
-            lut.SetNumberOfTableValues(len(tmpColors[i]))
             cmap = self.getColorMap()
-            for n, col in enumerate(tmpColors[i]):
-                r, g, b, a = self.getColorIndexOrRGBA(cmap, col)
-                lut.SetTableValue(n, r / 100., g / 100., b / 100., a / 100.)
+            lut = vcs2vtk.lookupTable(cmap, tmpColors[i])
 
             # Setup isoline labels
             if self._gm.label:
@@ -203,13 +199,13 @@ class IsolinePipeline(Pipeline2D):
                                 tt = sp[0]
                                 to = sp[1]
                             else:  # Hum don't know what do do with this
-                                if sp[0] in vcs.listelements("textcombined"):
+                                if sp[0] in vcs.elements["textcombined"]:
                                     tc = vcs.gettextcombined(tc)
                                     tt, to = tuple(tc.name.split(":::"))
-                                elif sp[0] in vcs.listelements("textorientation"):
+                                elif sp[0] in vcs.elements["textorientation"]:
                                     to = sp[0]
                                     tt = "default"
-                                elif sp[0] in vcs.listelements("texttable"):
+                                elif sp[0] in vcs.elements["texttable"]:
                                     tt = sp[0]
                                     to = "default"
 
@@ -136,9 +136,7 @@ class MeshfillPipeline(Pipeline2D):
         ctj = 0
 
         # view and interactive area
-        view = self._context().contextView
-        area = vtk.vtkInteractiveArea()
-        view.GetScene().AddItem(area)
+        area = self._context().newContextArea(interactive=True)
 
         adjusted_plotting_bounds = vcs2vtk.getProjectedBoundsForWorldCoords(
             plotting_dataset_bounds, self._gm.projection)
@@ -2,7 +2,10 @@ from .pipeline import Pipeline
 
 import numpy
 import vcs
+import vtk
 import cdms2
+from .. import vcs2vtk
+from vtk.util import numpy_support as VN
 
 
 def smooth(x, beta, window_len=11):
@@ -15,6 +18,143 @@ def smooth(x, beta, window_len=11):
     return y[(window_len / 2):-(window_len / 2)]
 
 
+def validSegments(x, y):
+    """ run-length split of the points where neither x nor y is masked
+
+    Returns the start (inclusive) and stop (exclusive) indices of each run
+    of valid points.
+    """
+    valid = ~(numpy.ma.getmaskarray(x) | numpy.ma.getmaskarray(y))
+    edges = numpy.flatnonzero(numpy.diff(numpy.concatenate(([0], valid.astype(numpy.int8), [0]))))
+    return edges[::2], edges[1::2]
+
+
+def minmaxDecimate(x, y, x1, x2, ncolumns):
+    """ indices of the points to keep so that each pixel column between x1 and x2
+    still shows its first, last, lowest and highest value
+
+    x must be monotonic
+    """
+    if len(x) <= 4 * ncolumns or x1 == x2:
+        return numpy.arange(len(x))
+    column = numpy.floor((x - x1) / (x2 - x1) * ncolumns).astype(numpy.int64)
+    run = numpy.concatenate(([0], numpy.cumsum(numpy.diff(column) != 0)))
+    starts = numpy.flatnonzero(numpy.diff(numpy.concatenate(([-1], run))))
+    stops = numpy.concatenate((starts[1:], [len(x)])) - 1
+    order = numpy.lexsort((y, run))
+    keep = numpy.concatenate((starts, stops, order[starts], order[stops]))
+    return numpy.unique(keep)
+
+
+def lttb(x, y, nout):
+    """ indices of the points kept by Largest-Triangle-Three-Buckets downsampling """
+    n = len(x)
+    if nout >= n or nout < 3:
+        return numpy.arange(n)
+    edges = numpy.linspace(1, n - 1, nout - 1).astype(numpy.int64)
+    keep = numpy.empty(nout, dtype=numpy.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(nout - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < nout - 1:
+            nlo, nhi = edges[i + 1], edges[i + 2]
+        else:
+            nlo, nhi = n - 1, n
+        cx = x[nlo:nhi].mean()
+        cy = y[nlo:nhi].mean()
+        area = numpy.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(numpy.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def monotonic(x):
+    """ is x monotonic (increasing or decreasing) """
+    dx = numpy.diff(x)
+    return (dx >= 0).all() or (dx <= 0).all()
+
+
+def decimate(method, x, y, x1, x2, ncolumns, y1=None, y2=None, nrows=None):
+    """ indices of the points to draw for a segment using decimation method
+    ('minmax' or 'lttb') for a viewport ncolumns pixels wide
+
+    Pixel columns only make sense along a monotonic axis, if x is not
+    monotonic and y1, y2 and nrows (height of the viewport) are given the
+    segment is decimated along y if it is monotonic (e.g. flipped plots).
+    Otherwise all the points are kept.
+    """
+    if monotonic(x):
+        u, v, u1, u2, n = x, y, x1, x2, ncolumns
+    elif nrows is not None and monotonic(y):
+        u, v, u1, u2, n = y, x, y1, y2, nrows
+    else:
+        return numpy.arange(len(x))
+    if method == "minmax":
+        return minmaxDecimate(u, v, u1, u2, n)
+    return lttb(u, v, 2 * n)
+
+
+def densityPoints(x, y, values=None):
+    """ data of the points where none of x, y and values (if given) is masked """
+    valid = ~(numpy.ma.getmaskarray(x) | numpy.ma.getmaskarray(y))
+    if values is not None:
+        valid &= ~numpy.ma.getmaskarray(values)
+        values = numpy.ma.getdata(values)[valid]
+    return numpy.ma.getdata(x)[valid], numpy.ma.getdata(y)[valid], values
+
+
+def densityGrid(x, y, values, mode, wc, shape):
+    """ bins the points into a shape=(ncolumns, nrows) histogram covering world
+    coordinates wc and returns, per bin, the number of points ('count') or the
+    'mean' or 'max' of values. Empty bins are masked.
+    """
+    nx, ny = shape
+    tx = (x - wc[0]) / float(wc[1] - wc[0])
+    ty = (y - wc[2]) / float(wc[3] - wc[2])
+    inside = (tx >= 0.) & (tx <= 1.) & (ty >= 0.) & (ty <= 1.)
+    i = numpy.minimum((tx[inside] * nx).astype(numpy.int64), nx - 1)
+    j = numpy.minimum((ty[inside] * ny).astype(numpy.int64), ny - 1)
+    flat = j * nx + i
+    count = numpy.bincount(flat, minlength=nx * ny)
+    if mode == "count":
+        grid = count.astype(numpy.float64)
+    elif mode == "mean":
+        grid = numpy.bincount(flat, weights=values[inside], minlength=nx * ny) / numpy.maximum(count, 1)
+    else:
+        grid = numpy.full(nx * ny, -numpy.inf)
+        numpy.maximum.at(grid, flat, values[inside])
+    return numpy.ma.masked_where(count == 0, grid).reshape((ny, nx))
+
+
+def densityPolyData(grid, wc):
+    """ one quad per non empty bin of grid, in world coordinates wc
+    returns the polydata and the values of its cells
+    """
+    ny, nx = grid.shape
+    j, i = numpy.nonzero(~numpy.ma.getmaskarray(grid))
+    xe = numpy.linspace(wc[0], wc[1], nx + 1)
+    ye = numpy.linspace(wc[2], wc[3], ny + 1)
+    n = len(i)
+    pts = numpy.zeros((n, 4, 3))
+    pts[:, 0, 0] = pts[:, 3, 0] = xe[i]
+    pts[:, 1, 0] = pts[:, 2, 0] = xe[i + 1]
+    pts[:, 0, 1] = pts[:, 1, 1] = ye[j]
+    pts[:, 2, 1] = pts[:, 3, 1] = ye[j + 1]
+    cells = numpy.empty((n, 5), dtype=numpy.int64)
+    cells[:, 0] = 4
+    cells[:, 1:] = numpy.arange(4 * n).reshape((n, 4))
+    points = vtk.vtkPoints()
+    points.SetData(VN.numpy_to_vtk(pts.reshape((4 * n, 3)), deep=True))
+    polys = vtk.vtkCellArray()
+    polys.SetCells(n, VN.numpy_to_vtkIdTypeArray(cells.ravel(), deep=True))
+    poly = vtk.vtkPolyData()
+    poly.SetPoints(points)
+    poly.SetPolys(polys)
+    return poly, numpy.ma.getdata(grid)[j, i]
+
+
 class Pipeline1D(Pipeline):
 
     """Implementation of the Pipeline interface for 1D VCS plots."""
@@ -48,38 +188,20 @@ class Pipeline1D(Pipeline):
             Y = smooth(Y, self._gm.smooth)
         Y = self.convertAxis(cdms2.createAxis(Y), "y")
 
-        ln_tmp = self._context().canvas.createline()
+        ln_tmp = vcs.primitives.line()
         try:  # Need to squeeze or list it too deep
-            Xs = X[:](squeeze=1).tolist()
+            Xa = numpy.ma.ravel(X[:](squeeze=1))
         except Exception:
-            Xs = X[:].tolist()
+            Xa = numpy.ma.ravel(X[:])
         try:  # Need to squeeze or list it too deep
-            Ys = Y[:](squeeze=1).tolist()
+            Ya = numpy.ma.ravel(Y[:](squeeze=1))
         except Exception:
-            Ys = Y[:].tolist()
-
-        xs = []
-        ys = []
-        prev = None
-        for i, v in enumerate(Ys):
-            if v is not None and Xs[i] is not None:  # Valid data
-                if prev is None:
-                    prev = []
-                    prev2 = []
-                prev.append(Xs[i])
-                prev2.append(v)
-            else:
-                if prev is not None:
-                    xs.append(prev)
-                    ys.append(prev2)
-                    prev = None
-
-        if prev is not None:
-            xs.append(prev)
-            ys.append(prev2)
+            Ya = numpy.ma.ravel(Y[:])
+        starts, stops = validSegments(Xa, Ya)
+        # Xa and Ya keep their masks for the density binning
+        Xd = numpy.ma.getdata(Xa)
+        Yd = numpy.ma.getdata(Ya)
 
-        ln_tmp._x = xs
-        ln_tmp._y = ys
         ln_tmp.color = [self._gm.linecolor, ]
         ln_tmp.priority = tmpl.data.priority
         if self._gm.linewidth > 0:
@@ -109,55 +231,120 @@ class Pipeline1D(Pipeline):
             x2 += .0001
 
         ln_tmp._worldcoordinate = [x1, x2, y1, y2]
+        # segments are numpy views of the data, the primitives take them as is
+        xs = [Xd[b:e] for b, e in zip(starts, stops)]
+        ys = [Yd[b:e] for b, e in zip(starts, stops)]
+        ln_tmp._x = xs
+        ln_tmp._y = ys
+        if self._gm.decimation is not None:
+            [width, height] = self._context().renWin.GetSize()
+            ncolumns = max(1, int(abs(tmpl.data.x2 - tmpl.data.x1) * width))
+            nrows = max(1, int(abs(tmpl.data.y2 - tmpl.data.y1) * height))
+            keeps = [decimate(self._gm.decimation, x, y, x1, x2, ncolumns, y1, y2, nrows)
+                     for x, y in zip(xs, ys)]
+            ln_tmp._x = [x[keep] for x, keep in zip(xs, keeps)]
+            ln_tmp._y = [y[keep] for y, keep in zip(ys, keeps)]
         if self._gm.marker is not None:
-            m = self._context().canvas.createmarker()
+            m = vcs.primitives.marker()
             m.type = self._gm.marker
             m.color = [self._gm.markercolor, ]
             if self._gm.markersize > 0:
                 m.size = self._gm.markersize
             else:
                 m.priority = 0
-            m._x = ln_tmp.x
-            m._y = ln_tmp.y
+            m._x = xs
+            m._y = ys
             m._viewport = ln_tmp.viewport
             m._worldcoordinate = ln_tmp.worldcoordinate
 
+        density = None
+        npoints = (stops - starts).sum()
+        if self._gm.density is not None and npoints > self._gm.density_threshold:
+            density = self._gm.density
+
         if not (Y[:].min() > max(y1, y2) or Y[:].max() < min(y1, y2) or
                 X[:].min() > max(x1, x2) or X[:].max() < min(x1, x2)):
-            if ln_tmp.priority > 0:
-                self._context().canvas.plot(ln_tmp, donotstoredisplay=True)
-            if self._gm.marker is not None and m.priority > 0:
-                self._context().canvas.plot(m, donotstoredisplay=True)
+            if density is not None:
+                self._plotDensity(Xa, Ya, density, tmpl, [x1, x2, y1, y2])
+            else:
+                if ln_tmp.priority > 0:
+                    vcs.primitives.plot(self._context().canvas, ln_tmp)
+                if self._gm.marker is not None and m.priority > 0:
+                    vcs.primitives.plot(self._context().canvas, m)
 
         if hasattr(data1, "_yname"):
             del(data1._yname)
-        del(vcs.elements["line"][ln_tmp.name])
-        if self._gm.marker is not None:
-            del(vcs.elements["marker"][m.name])
 
-        if tmpl.legend.priority > 0:
-            legd = self._context().canvas.createline()
+        if tmpl.legend.priority > 0 and density is None:
+            legd = vcs.primitives.line()
             legd.x = [tmpl.legend.x1, tmpl.legend.x2]
             legd.y = [tmpl.legend.y1, tmpl.legend.y1]  # [y1, y1] intentional.
             legd.color = ln_tmp.color
             legd.width = ln_tmp.width
             legd.type = ln_tmp.type
-            t = self._context().canvas.createtext(
+            t = vcs.primitives.text(
                 To_source=tmpl.legend.textorientation,
                 Tt_source=tmpl.legend.texttable)
             t.x = tmpl.legend.x2
             t.y = tmpl.legend.y2
             t.string = data1.id
-            self._context().canvas.plot(t, donotstoredisplay=True)
-            sp = t.name.split(":::")
-            del(vcs.elements["texttable"][sp[0]])
-            del(vcs.elements["textorientation"][sp[1]])
-            del(vcs.elements["textcombined"][t.name])
-            self._context().canvas.plot(legd, donotstoredisplay=True)
-            del(vcs.elements["line"][legd.name])
+            vcs.primitives.plot(self._context().canvas, t)
+            vcs.primitives.plot(self._context().canvas, legd)
         z, t = self.getZandT()
         self._context().renderTemplate(
             tmpl,
             self._data1,
             self._gm, t, z)
         return {}
+
+    def _plotDensity(self, X, Y, mode, tmpl, wc):
+        """Draws the points binned at screen resolution, colored with the
+        levels and colors a default boxfill would use, and its colorbar."""
+        values = None
+        if mode != "count":
+            if self._plot_kargs.get("density_values", None) is None:
+                raise ValueError("density '%s' needs the values to aggregate, "
+                                 "please pass them via the density_values keyword" % mode)
+            values = numpy.ma.ravel(numpy.ma.asarray(self._plot_kargs["density_values"]))
+            if len(values) != len(X):
+                raise ValueError("density_values must have one value per point")
+        X, Y, values = densityPoints(X, Y, values)
+
+        vp = [tmpl.data.x1, tmpl.data.x2, tmpl.data.y1, tmpl.data.y2]
+        [renWinWidth, renWinHeight] = self._context().renWin.GetSize()
+        geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
+                            int(round(vp[2] * renWinHeight)),
+                            int(round((vp[1] - vp[0]) * renWinWidth)),
+                            int(round((vp[3] - vp[2]) * renWinHeight)))
+        grid = densityGrid(X, Y, values, mode, wc, (max(1, geom[2]), max(1, geom[3])))
+        if grid.count() == 0:
+            return
+        poly, cellValues = densityPolyData(grid, wc)
+
+        # Same levels and consecutive colors as a linear boxfill
+        boxfill = vcs.elements["boxfill"]["default"]
+        mn, mx = cellValues.min(), cellValues.max()
+        if numpy.allclose(mn, mx):
+            mx = mn + 1.
+        levels = numpy.asarray(boxfill.getlevels(mn, mx)).tolist()
+        colors = list(range(boxfill.color_1, boxfill.color_2 + 1))
+        while len(colors) < len(levels) - 1:
+            colors.append(colors[-1])
+        colors = colors[:len(levels) - 1]
+        cmap = self.getColorMap()
+        rgba = numpy.array([self.getColorIndexOrRGBA(cmap, c) for c in colors]) * 2.55
+        index = numpy.clip(numpy.searchsorted(levels, cellValues, side="right") - 1, 0, len(colors) - 1)
+        mappedColors = VN.numpy_to_vtk(rgba[index], deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+        mappedColors.SetName("Colors")
+
+        area = self._context().newContextArea()
+        rect = vtk.vtkRectd(wc[0], wc[2], wc[1] - wc[0], wc[3] - wc[2])
+        vcs2vtk.configureContextArea(area, rect, geom)
+        item = vtk.vtkPolyDataItem()
+        item.SetPolyData(poly)
+        item.SetScalarMode(vtk.VTK_SCALAR_MODE_USE_CELL_DATA)
+        item.SetMappedColors(mappedColors)
+        area.GetDrawAreaItem().AddItem(item)
+
+        self._context().renderColorBar(tmpl, levels, colors,
+                                       boxfill.getlegendlabels(levels), cmap)
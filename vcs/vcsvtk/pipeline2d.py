@@ -8,6 +8,16 @@ import vtk
 import warnings
 
 
+def copyGenGrid(genGridDict):
+    """Copy of a vcs2vtk.genGrid result, with its own vtk grid for the
+    pipeline to modify"""
+    copied = dict(genGridDict)
+    grid = genGridDict["vtk_backend_grid"]
+    copied["vtk_backend_grid"] = grid.NewInstance()
+    copied["vtk_backend_grid"].DeepCopy(grid)
+    return copied
+
+
 class IPipeline2D(Pipeline):
 
     """Interface class for Pipeline2D.
@@ -346,14 +356,38 @@ class Pipeline2D(IPipeline2D):
             dualGrid = (hasCellData != self._needsCellData)
         else:
             dualGrid = False
-        genGridDict = vcs2vtk.genGrid(self._data1, self._data2, self._gm,
-                                      grid=self._vtkDataSet,
-                                      geo=self._vtkGeoTransform, genVectors=self._needsVectors,
-                                      dualGrid=dualGrid)
+        # replots after a resize reuse the grid: it does not depend on the window size.
+        # Contours are recomputed: their filters must read this plot's copy of the grid,
+        # whose scalars update_input (animations) rewrites in place.
+        cache = self._plot_kargs.get("vtk_backend_grid_cache")
+        key = self._gridCacheKey(dualGrid)
+        if cache is not None and cache.get("key") == key:
+            genGridDict = copyGenGrid(cache["grid"])
+        else:
+            genGridDict = vcs2vtk.genGrid(self._data1, self._data2, self._gm,
+                                          grid=self._vtkDataSet,
+                                          geo=self._vtkGeoTransform, genVectors=self._needsVectors,
+                                          dualGrid=dualGrid)
+            if cache is not None and self._vtkDataSet is None:
+                cache["key"] = key
+                cache["grid"] = copyGenGrid(genGridDict)
         self._data1 = genGridDict["data"]
         self._data2 = genGridDict["data2"]
         self._updateFromGenGridDict(genGridDict)
 
+    def _gridCacheKey(self, dualGrid):
+        """What genGrid depends on, besides the data (the cache is dropped
+        when the arrays of the display change)"""
+        gm = self._gm
+        projection = vcs.elements["projection"][gm.projection]
+        wrap = getattr(gm, "wrap", None)
+        return (self._originalData1.shape, getattr(self._originalData2, "shape", None), gm.g_name,
+                projection.type, tuple(projection.parameters),
+                None if wrap is None else tuple(wrap),
+                gm.datawc_x1, gm.datawc_x2, gm.datawc_y1, gm.datawc_y2,
+                self._plot_kargs.get("frame", 0), self._plot_kargs.get("xaxisconvert"),
+                self._plot_kargs.get("yaxisconvert"), self._needsVectors, dualGrid)
+
     def _createPolyDataFilter(self):
         """This is only used when we use the grid stored in the file for all plots."""
         self._vtkPolyDataFilter = vtk.vtkDataSetSurfaceFilter()
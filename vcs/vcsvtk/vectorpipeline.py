@@ -95,9 +95,7 @@ class VectorPipeline(Pipeline2D):
         polydata = self._vtkDataSetFittedToViewport
 
         # view and interactive area
-        view = self._context().contextView
-        area = vtk.vtkInteractiveArea()
-        view.GetScene().AddItem(area)
+        area = self._context().newContextArea(interactive=True)
 
         drawAreaBounds = vcs2vtk.computeDrawAreaBounds(self._vtkDataSetBoundsNoMask,
                                                        self._context_flipX, self._context_flipY)
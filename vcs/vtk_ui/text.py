@@ -174,14 +174,33 @@ def text_actor(string, fgcolor, size, font):
     return actor
 
 
+# Bounding boxes of the strings measured so far, labels are measured over and
+# over (ticks, legends, editors); only what changes the box is in the key
+_text_boxes = {}
+_text_boxes_max = 4096
+
+
+def _text_box_key(text, text_prop, dpi, at_angle):
+    return (text, text_prop.GetFontFamily(), text_prop.GetFontFile(), text_prop.GetFontSize(),
+            text_prop.GetBold(), text_prop.GetItalic(), text_prop.GetShadow(),
+            text_prop.GetJustification(), text_prop.GetVerticalJustification(),
+            text_prop.GetLineSpacing(), at_angle, dpi)
+
+
 def text_box(text, text_prop, dpi, at_angle):
-    ren = vtkTextRenderer()
-    bounds = [0, 0, 0, 0]
-    p = vtkTextProperty()
-    p.ShallowCopy(text_prop)
-    p.SetOrientation(at_angle)
-    ren.GetBoundingBox(p, text, bounds, dpi)
-    return bounds
+    key = _text_box_key(text, text_prop, dpi, at_angle)
+    bounds = _text_boxes.get(key)
+    if bounds is None:
+        ren = vtkTextRenderer()
+        bounds = [0, 0, 0, 0]
+        p = vtkTextProperty()
+        p.ShallowCopy(text_prop)
+        p.SetOrientation(at_angle)
+        ren.GetBoundingBox(p, text, bounds, dpi)
+        if len(_text_boxes) >= _text_boxes_max:
+            _text_boxes.clear()
+        bounds = _text_boxes[key] = tuple(bounds)
+    return list(bounds)
 
 
 def text_dimensions(text, text_prop, dpi, at_angle=0):